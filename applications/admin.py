@@ -1,5 +1,8 @@
+from django.conf import settings
 from django.contrib import admin
-from .models import Application, ApplicationLog, PendingApplication, AcceptedApplication, RejectedApplication
+from .models import (
+    Application, ApplicationLog, ApplicationLogArchive, NotificationOutbox, PendingApplication, AcceptedApplication, RejectedApplication,
+)
 
 class ApplicationLogInline(admin.TabularInline):
     model = ApplicationLog
@@ -8,12 +11,18 @@ class ApplicationLogInline(admin.TabularInline):
 
 @admin.register(Application)
 class ApplicationAdmin(admin.ModelAdmin):
-    list_display = ['application_id', 'student', 'university', 'program', 'status', 'lead_quality', 'applied_on', 'download_pdf_link']
+    list_display = ['application_id', 'student', 'university', 'program', 'status', 'lead_quality', 'applied_on', 'last_event', 'download_pdf_link']
     list_filter = ['status', 'lead_quality', 'application_type', 'applied_on']
     search_fields = ['application_id', 'student__username', 'student__email', 'university__name', 'program__name']
+    # Every column rendered in the list, including Program.__str__ (university.short_name)
+    list_select_related = ['student', 'university', 'program__university']
     inlines = [ApplicationLogInline]
-    readonly_fields = ['application_id', 'applied_on', 'created_at', 'updated_at']
-    actions = ['clear_custom_message', 'clear_remarks', 'clear_both_messages', 'reset_lead_quality']
+    readonly_fields = ['application_id', 'applied_on', 'created_at', 'updated_at', 'last_event', 'last_event_at', 'log_count']
+    actions = [
+        'clear_custom_message', 'clear_remarks', 'clear_both_messages', 'reset_lead_quality',
+        'mark_pending', 'mark_under_review', 'mark_accepted', 'mark_rejected',
+        'export_csv', 'export_ndjson', 'export_parquet',
+    ]
     
     fieldsets = (
         ('Application Information', {
@@ -27,14 +36,50 @@ class ApplicationAdmin(admin.ModelAdmin):
             'fields': ('remarks', 'consent_given', 'terms_accepted')
         }),
         ('Timestamps', {
-            'fields': ('applied_on', 'created_at', 'updated_at'),
+            'fields': ('applied_on', 'created_at', 'updated_at', 'last_event', 'last_event_at', 'log_count'),
             'classes': ('collapse',)
         }),
     )
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('student', 'university', 'program')
-    
+
+    @property
+    def show_full_result_count(self):
+        # "N results (M total)" costs a second COUNT over the whole table
+        return not settings.ADMIN_HIGH_VOLUME
+
+    @property
+    def search_help_text(self):
+        if settings.ADMIN_HIGH_VOLUME:
+            return 'Exact application ID, student email or username.'
+        return None
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        if settings.ADMIN_HIGH_VOLUME:
+            from core.paginators import EstimatedCountPaginator
+            return EstimatedCountPaginator(queryset, per_page, orphans, allow_empty_first_page)
+        return super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+
+    def get_search_results(self, request, queryset, search_term):
+        """In high-volume mode, only exact lookups that have an index"""
+        if not settings.ADMIN_HIGH_VOLUME:
+            return super().get_search_results(request, queryset, search_term)
+        term = search_term.strip().lstrip('#')
+        if not term:
+            return queryset, False
+        if term.isdigit():
+            return queryset.filter(application_id=term.zfill(6)), False
+        if '@' in term:
+            from django.db.models.functions import Lower
+            # Matches the partial students_student_email_ci_unique index
+            return (
+                queryset.alias(student_email=Lower('student__email'))
+                .filter(student_email=term.lower())
+                .exclude(student__email='')
+            ), False
+        return queryset.filter(student__username=term), False
+
     def download_pdf_link(self, obj):
         from django.utils.html import format_html
         from django.urls import reverse
@@ -42,55 +87,117 @@ class ApplicationAdmin(admin.ModelAdmin):
         return format_html('<a href="{}" target="_blank" class="button">Download PDF</a>', url)
     download_pdf_link.short_description = 'PDF'
     
+    def update_selected(self, queryset, **values):
+        """queryset.update() for an action; it sends no signals, so the owners' cached dashboards are dropped here"""
+        from functools import partial
+
+        from django.db import transaction
+
+        from core.cache import STUDENT, invalidate_group
+
+        with transaction.atomic():
+            student_ids = set(queryset.values_list('student_id', flat=True))
+            updated = queryset.update(**values)
+            for student_id in student_ids:
+                transaction.on_commit(partial(invalidate_group, STUDENT, student_id))
+        return updated
+
     # Custom Admin Actions
     def clear_custom_message(self, request, queryset):
         """Clear custom status message from selected applications"""
-        updated = queryset.update(custom_status_message=None)
+        updated = self.update_selected(queryset, custom_status_message=None)
         self.message_user(request, f'{updated} application(s) had their custom status message cleared.')
     clear_custom_message.short_description = "Clear custom status message"
     
     def clear_remarks(self, request, queryset):
         """Clear remarks from selected applications"""
-        updated = queryset.update(remarks='')
+        updated = self.update_selected(queryset, remarks='')
         self.message_user(request, f'{updated} application(s) had their remarks cleared.')
     clear_remarks.short_description = "Clear remarks"
     
     def clear_both_messages(self, request, queryset):
         """Clear both custom status message and remarks"""
-        updated = queryset.update(custom_status_message=None, remarks='')
+        updated = self.update_selected(queryset, custom_status_message=None, remarks='')
         self.message_user(request, f'{updated} application(s) had both custom message and remarks cleared.')
     clear_both_messages.short_description = "Clear custom message & remarks"
     
     def reset_lead_quality(self, request, queryset):
         """Reset lead quality to default (low)"""
-        updated = queryset.update(lead_quality='low')
+        updated = self.update_selected(queryset, lead_quality='low')
         self.message_user(request, f'{updated} application(s) had their lead quality reset to Low.')
     reset_lead_quality.short_description = "Reset lead quality to Low"
+
+    def transition(self, request, queryset, status):
+        """Move the selected applications to status with one bulk update"""
+        from .services import transition_status
+
+        changed = transition_status(queryset, status)
+        label = dict(Application._meta.get_field('status').choices)[status]
+        self.message_user(request, f'{changed} application(s) moved to {label}.')
+
+    def mark_pending(self, request, queryset):
+        self.transition(request, queryset, 'pending')
+    mark_pending.short_description = "Move to Pending Review"
+
+    def mark_under_review(self, request, queryset):
+        self.transition(request, queryset, 'under_review')
+    mark_under_review.short_description = "Move to Under Review"
+
+    def mark_accepted(self, request, queryset):
+        self.transition(request, queryset, 'accepted')
+    mark_accepted.short_description = "Move to Accepted"
+
+    def mark_rejected(self, request, queryset):
+        self.transition(request, queryset, 'rejected')
+    mark_rejected.short_description = "Move to Rejected"
+
+    def get_actions(self, request):
+        from .exports import parquet_available
+
+        actions = super().get_actions(request)
+        if not parquet_available():
+            actions.pop('export_parquet', None)
+        return actions
+
+    def export_response(self, queryset, fmt):
+        """Stream the selected applications as an attachment"""
+        from django.http import StreamingHttpResponse
+        from .exports import CONTENT_TYPES, export_filename, iter_export
+
+        response = StreamingHttpResponse(iter_export(queryset, fmt), content_type=CONTENT_TYPES[fmt])
+        response['Content-Disposition'] = f'attachment; filename="{export_filename(fmt)}"'
+        return response
+
+    def export_csv(self, request, queryset):
+        """Download the selected applications as CSV"""
+        return self.export_response(queryset, 'csv')
+    export_csv.short_description = "Export selected applications as CSV"
+
+    def export_ndjson(self, request, queryset):
+        """Download the selected applications as newline-delimited JSON"""
+        return self.export_response(queryset, 'ndjson')
+    export_ndjson.short_description = "Export selected applications as NDJSON"
+
+    def export_parquet(self, request, queryset):
+        """Download the selected applications as Parquet (needs pyarrow)"""
+        return self.export_response(queryset, 'parquet')
+    export_parquet.short_description = "Export selected applications as Parquet"
     
     def save_model(self, request, obj, form, change):
-        # Track status changes
+        super().save_model(request, obj, form, change)
+        # Log status changes; the form's initial data holds the old status
         if change and 'status' in form.changed_data:
-            old_status = Application.objects.get(pk=obj.pk).status
-            new_status = obj.status
-            
-            # Save the application first
-            super().save_model(request, obj, form, change)
-            
-            # Create log entry for status change
-            status_messages = {
-                'pending': 'Application is pending review',
-                'under_review': 'Application is now under review by the TrikonED team',
-                'accepted': 'Congratulations! Your application has been accepted',
-                'rejected': 'Unfortunately, your application was not successful at this time',
-            }
-            
-            ApplicationLog.objects.create(
-                application=obj,
-                event=f'Status Changed: {old_status.title()} → {new_status.title()}',
-                details=status_messages.get(new_status, f'Application status updated to {new_status}')
-            )
-        else:
-            super().save_model(request, obj, form, change)
+            from .services import enqueue_notifications, record_events, status_change_log
+            logs = record_events([status_change_log(obj, form.initial['status'], obj.status)])
+            # Delivered by the send_notifications worker, not during the save
+            enqueue_notifications(logs)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Log entries edited in the inline bypass record_event()
+        if any(formset.has_changed() for formset in formsets):
+            from .services import refresh_log_summary
+            refresh_log_summary([form.instance.pk])
 
 @admin.register(PendingApplication)
 class PendingApplicationAdmin(ApplicationAdmin):
@@ -111,3 +218,42 @@ class RejectedApplicationAdmin(ApplicationAdmin):
 class ApplicationLogAdmin(admin.ModelAdmin):
     list_display = ['application', 'event', 'timestamp']
     readonly_fields = ['timestamp']
+
+    # Keep Application.last_event / log_count in step with edits made here
+    def save_model(self, request, obj, form, change):
+        from .services import refresh_log_summary
+        super().save_model(request, obj, form, change)
+        refresh_log_summary([obj.application_id])
+
+    def delete_model(self, request, obj):
+        from .services import refresh_log_summary
+        super().delete_model(request, obj)
+        refresh_log_summary([obj.application_id])
+
+    def delete_queryset(self, request, queryset):
+        from .services import refresh_log_summary
+        application_ids = list(queryset.values_list('application_id', flat=True).distinct())
+        super().delete_queryset(request, queryset)
+        refresh_log_summary(application_ids)
+
+
+@admin.register(ApplicationLogArchive)
+class ApplicationLogArchiveAdmin(admin.ModelAdmin):
+    list_display = ['application', 'entry_count', 'first_timestamp', 'last_timestamp', 'archived_at']
+    list_select_related = ['application__student', 'application__university']
+    fields = readonly_fields = ['application', 'entry_count', 'first_timestamp', 'last_timestamp', 'archived_at']
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ['recipient', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status']
+    search_fields = ['=recipient', '=application__application_id']
+    list_select_related = ['application']
+    readonly_fields = [field.name for field in NotificationOutbox._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
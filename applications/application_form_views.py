@@ -10,13 +10,15 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import redirect, get_object_or_404
 from django.contrib import messages
 from django.urls import reverse_lazy
-from .models import Application, ApplicationLog
+from .models import Application
+from .services import record_event
 from .forms import ApplicationStep1Form, ApplicationStep2Form, ApplicationStep3Form
-from students.models import StudentDocument, StudentTestScore
+from students.models import StudentTestScore
+from students.uploads import DocumentUploadMixin, save_student_documents
 from programs.models import Program
 
 
-class ApplicationFormView(LoginRequiredMixin, TemplateView):
+class ApplicationFormView(DocumentUploadMixin, LoginRequiredMixin, TemplateView):
     """Multi-step application form"""
     template_name = 'applications/application_form.html'
     
@@ -209,38 +211,20 @@ class ApplicationFormView(LoginRequiredMixin, TemplateView):
         elif current_step == 2:
             form = ApplicationStep2Form(request.POST, request.FILES)
             if form.is_valid():
-                # Save documents
-                student = request.user
-                
-                if form.cleaned_data.get('passport'):
-                    # Delete old passport
-                    StudentDocument.objects.filter(student=student, doc_type='passport').delete()
-                    StudentDocument.objects.create(
-                        student=student,
-                        doc_type='passport',
-                        file_url=form.cleaned_data['passport'],
-                        file_name=form.cleaned_data['passport'].name
-                    )
-                
-                if form.cleaned_data.get('transcript'):
-                    # Delete old transcript
-                    StudentDocument.objects.filter(student=student, doc_type='transcript').delete()
-                    StudentDocument.objects.create(
-                        student=student,
-                        doc_type='transcript',
-                        file_url=form.cleaned_data['transcript'],
-                        file_name=form.cleaned_data['transcript'].name
-                    )
-                
-                # Handle multiple other documents
-                files = request.FILES.getlist('other_documents')
-                for f in files:
-                    StudentDocument.objects.create(
-                        student=student,
-                        doc_type='other',
-                        file_url=f,
-                        file_name=f.name
-                    )
+                if self.add_upload_errors(form):
+                    context = self.get_context_data()
+                    context['form'] = form
+                    return self.render_to_response(context)
+
+                # Save documents (passport/transcript replace, others append)
+                save_student_documents(
+                    request.user,
+                    replacements={
+                        'passport': form.cleaned_data.get('passport'),
+                        'transcript': form.cleaned_data.get('transcript'),
+                    },
+                    others=request.FILES.getlist('other_documents'),
+                )
                 
                 # Check if Step 3 is needed
                 step1_data = self.get_apply_data(1)
@@ -335,9 +319,9 @@ class ApplicationFormView(LoginRequiredMixin, TemplateView):
         application.save()
         
         # Create log entry
-        ApplicationLog.objects.create(
-            application=application,
-            event='Application Submitted',
+        record_event(
+            application,
+            'Application Submitted',
             details=f'Application submitted for {program.name} at {university.name}'
         )
         
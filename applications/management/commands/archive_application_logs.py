@@ -0,0 +1,120 @@
+"""
+Django management command to archive old log entries of closed applications.
+
+For accepted and rejected applications, log entries older than --months are
+moved into ApplicationLogArchive (one compressed row per application and
+run), except the newest --keep entries, which stay in ApplicationLog so a
+short timeline never has to read the archive. log_count already includes
+archived entries, so the application summaries don't change. Each batch of applications
+is archived in its own transaction. Timelines read through
+applications.timeline.get_timeline() still show every entry.
+
+Usage:
+    python manage.py archive_application_logs --months 12
+    python manage.py archive_application_logs --months 6 --keep 5 --batch-size 1000
+    python manage.py archive_application_logs --months 12 --dry-run
+"""
+import datetime
+from itertools import groupby
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from applications.models import Application, ApplicationLog, ApplicationLogArchive
+from applications.timeline import KEEP_RECENT_ENTRIES, pack_entries
+
+CLOSED_STATUSES = ['accepted', 'rejected']
+DELETE_CHUNK_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Move log entries of closed applications older than N months into compressed archive rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=12, help='Archive entries older than this (default: 12)')
+        parser.add_argument(
+            '--keep',
+            type=int,
+            default=KEEP_RECENT_ENTRIES,
+            help=f'Newest entries per application left in place (default: {KEEP_RECENT_ENTRIES})',
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Applications per transaction (default: 500)')
+        parser.add_argument('--dry-run', action='store_true', help='Count what would be archived without changing anything')
+
+    def handle(self, *args, **options):
+        if options['months'] < 1:
+            raise CommandError('--months must be at least 1')
+        if options['keep'] < KEEP_RECENT_ENTRIES:
+            raise CommandError(f'--keep must be at least {KEEP_RECENT_ENTRIES} (short timelines skip the archive)')
+        # Months are counted as 30 days
+        cutoff = timezone.now() - datetime.timedelta(days=30 * options['months'])
+
+        candidates = (
+            Application.objects.filter(status__in=CLOSED_STATUSES)
+            .filter(Exists(ApplicationLog.objects.filter(application=OuterRef('pk'), timestamp__lt=cutoff)))
+            .order_by('pk')
+            .values_list('pk', flat=True)
+        )
+        applications = archived = 0
+        last_pk = None
+        while True:
+            page = candidates.filter(pk__gt=last_pk) if last_pk else candidates
+            batch = list(page[:options['batch_size']])
+            if not batch:
+                break
+            last_pk = batch[-1]
+            moved = self.archive_batch(batch, cutoff, options['keep'], options['dry_run'])
+            applications += sum(1 for count in moved if count)
+            archived += sum(moved)
+
+        prefix = 'Dry run: would archive' if options['dry_run'] else 'Archived'
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix} {archived} log entr{"y" if archived == 1 else "ies"} of {applications} application(s).'
+        ))
+
+    def archive_batch(self, application_ids, cutoff, keep, dry_run):
+        """Archive one batch; returns the number of entries moved per application"""
+        with transaction.atomic():
+            logs = (
+                ApplicationLog.objects.filter(application_id__in=application_ids)
+                .order_by('application_id', '-timestamp')
+                .select_for_update()
+                .values('id', 'application_id', 'timestamp', 'event', 'details')
+            )
+            archives, moved_ids, moved = [], [], []
+            for application_id, entries in groupby(logs, key=lambda log: log['application_id']):
+                old = [log for log in list(entries)[keep:] if log['timestamp'] < cutoff]
+                moved.append(len(old))
+                if not old:
+                    continue
+                old.reverse()
+                archives.append(ApplicationLogArchive(
+                    application_id=application_id,
+                    entries=pack_entries(old),
+                    entry_count=len(old),
+                    first_timestamp=old[0]['timestamp'],
+                    last_timestamp=old[-1]['timestamp'],
+                ))
+                moved_ids.extend(log['id'] for log in old)
+            if not dry_run and archives:
+                ApplicationLogArchive.objects.bulk_create(archives)
+                for start in range(0, len(moved_ids), DELETE_CHUNK_SIZE):
+                    # Plain DELETE: the dashboard's newest entries are untouched, so the
+                    # per-row cache invalidation signals of .delete() would be wasted
+                    self.delete_logs(moved_ids[start:start + DELETE_CHUNK_SIZE])
+        return moved
+
+    def delete_logs(self, ids):
+        """DELETE ... WHERE id IN (...) without the deletion collector or signals"""
+        connection = connections[router.db_for_write(ApplicationLog)]
+        quote = connection.ops.quote_name
+        pk = ApplicationLog._meta.pk
+        params = [pk.get_db_prep_value(value, connection) for value in ids]
+        placeholders = ', '.join(['%s'] * len(params))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {quote(ApplicationLog._meta.db_table)} WHERE {quote(pk.column)} IN ({placeholders})',
+                params,
+            )
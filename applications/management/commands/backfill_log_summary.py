@@ -0,0 +1,27 @@
+"""
+Django management command to recompute the log summary of every application.
+
+Fills Application.last_event, last_event_at and log_count from ApplicationLog
+(and archived entry counts) with one set-based UPDATE ... FROM. The
+migration that added the fields runs it once; run it again whenever log
+rows were written without applications.services.record_event().
+
+Usage:
+    python manage.py backfill_log_summary
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from applications.services import backfill_log_summary
+
+
+class Command(BaseCommand):
+    help = 'Recompute last_event, last_event_at and log_count of every application from its log'
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        updated = backfill_log_summary()
+        self.stdout.write(self.style.SUCCESS(
+            f'Updated {updated} application(s) in {time.monotonic() - started:.1f}s.'
+        ))
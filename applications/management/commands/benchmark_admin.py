@@ -0,0 +1,80 @@
+"""
+Django management command to benchmark the application admin changelists.
+
+Requests the changelist (plain, filtered by status, a deep page, the pending
+proxy and searches by application ID and student email) in-process as a
+staff user, with ADMIN_HIGH_VOLUME off and on, and reports queries and
+latency per page. Run it against a database seeded with seed_catalog, e.g.
+with --applications 1000000; estimated counts only apply on PostgreSQL.
+
+Usage:
+    python manage.py benchmark_admin
+    python manage.py benchmark_admin --repeat 10 --mode high-volume
+    python manage.py benchmark_admin --username admin
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.benchmarking import percentile
+
+MODES = {'default': False, 'high-volume': True}
+
+
+class Command(BaseCommand):
+    help = 'Measure queries and latency of the application admin changelists with and without high-volume mode'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Requests per page and mode (default: 5)')
+        parser.add_argument('--mode', choices=sorted(MODES), action='append', help='Mode to run (repeatable, default: both)')
+        parser.add_argument('--username', help='Staff user to request as (default: the first superuser)')
+
+    def handle(self, *args, **options):
+        from applications.models import Application
+        from students.models import Student
+
+        users = Student.objects.filter(is_staff=True, is_active=True)
+        user = (users.filter(username=options['username']) if options['username'] else
+                users.filter(is_superuser=True).order_by('date_joined')).first()
+        if user is None:
+            raise CommandError('No staff user to request as. Create one or pass --username.')
+        sample = Application.objects.exclude(student__email='').values_list('application_id', 'student__email').first()
+        if sample is None:
+            raise CommandError('No applications to list. Run "manage.py seed_catalog" first.')
+
+        changelist = reverse('admin:applications_application_changelist')
+        pages = {
+            'changelist': changelist,
+            'status_filter': f'{changelist}?status__exact=pending',
+            'deep_page': f'{changelist}?p=50',
+            'pending_proxy': reverse('admin:applications_pendingapplication_changelist'),
+            'search_id': f'{changelist}?q={sample[0]}',
+            'search_email': f'{changelist}?q={sample[1]}',
+        }
+
+        self.stdout.write(f"{Application.objects.count():,} applications, {options['repeat']} request(s) per page")
+        self.stdout.write(f"{'page':<15} {'mode':<12} {'queries':>8} {'p50 ms':>8} {'max ms':>8} {'status':>7}")
+        hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+        for mode in options['mode'] or list(MODES):
+            with override_settings(ADMIN_HIGH_VOLUME=MODES[mode], ALLOWED_HOSTS=hosts, SECURE_SSL_REDIRECT=False):
+                client = Client()
+                client.force_login(user)
+                for name, path in pages.items():
+                    latencies, queries, status = [], 0, None
+                    for _ in range(options['repeat']):
+                        with CaptureQueriesContext(connection) as captured:
+                            started = time.perf_counter()
+                            response = client.get(path)
+                            latencies.append((time.perf_counter() - started) * 1000)
+                        queries, status = len(captured), response.status_code
+                    latencies.sort()
+                    self.stdout.write(
+                        f"{name:<15} {mode:<12} {queries:>8} {percentile(latencies, 0.50):>8.1f} "
+                        f"{latencies[-1]:>8.1f} {status:>7}"
+                    )
+        self.stdout.write(self.style.SUCCESS('Done.'))
@@ -0,0 +1,84 @@
+"""
+Django management command to export applications.
+
+Streams applications with their student, program, status, lead quality and
+latest log entry as CSV, newline-delimited JSON or Parquet (needs pyarrow),
+chunk by chunk, so memory stays flat for any number of rows.
+
+Usage:
+    python manage.py export_applications --output applications.csv
+    python manage.py export_applications --format ndjson --status pending --status under_review > open.ndjson
+    python manage.py export_applications --format parquet --since 2025-01-01 --output 2025.parquet
+"""
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from applications.exports import DEFAULT_CHUNK_SIZE, FORMATS, iter_export
+from applications.models import Application
+
+EXTENSIONS = {'csv': 'csv', 'ndjson': 'ndjson', 'jsonl': 'ndjson', 'parquet': 'parquet'}
+
+
+class Command(BaseCommand):
+    help = 'Stream applications as CSV, NDJSON or Parquet to a file or standard output'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=FORMATS, help='Output format (default: from --output, else csv)')
+        parser.add_argument('--output', metavar='PATH', help='File to write (default: standard output)')
+        parser.add_argument(
+            '--status',
+            action='append',
+            default=[],
+            help='Only applications with this status (repeatable)',
+        )
+        parser.add_argument('--since', metavar='YYYY-MM-DD', help='Only applications applied on or after this date')
+        parser.add_argument('--until', metavar='YYYY-MM-DD', help='Only applications applied on or before this date')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Rows fetched and written per chunk (default: {DEFAULT_CHUNK_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        output = options['output']
+        fmt = options['format']
+        if fmt is None:
+            extension = output.rsplit('.', 1)[-1].lower() if output else ''
+            fmt = EXTENSIONS.get(extension, 'csv')
+
+        queryset = Application.objects.all()
+        if options['status']:
+            queryset = queryset.filter(status__in=options['status'])
+        for option, lookup in (('since', 'applied_on__gte'), ('until', 'applied_on__lte')):
+            if options[option]:
+                try:
+                    value = parse_date(options[option])
+                except ValueError:
+                    # Well formed but impossible, e.g. 2025-02-30
+                    value = None
+                if value is None:
+                    raise CommandError(f'--{option} must be a date (YYYY-MM-DD)')
+                queryset = queryset.filter(**{lookup: value})
+
+        try:
+            chunks = iter_export(queryset, fmt, chunk_size=options['chunk_size'])
+        except ValueError as error:
+            raise CommandError(error)
+
+        written = 0
+        stream = open(output, 'wb') if output else sys.stdout.buffer
+        try:
+            for chunk in chunks:
+                stream.write(chunk)
+                written += len(chunk)
+        finally:
+            if output:
+                stream.close()
+            else:
+                stream.flush()
+
+        if output:
+            self.stdout.write(self.style.SUCCESS(f'Exported applications as {fmt} to {output} ({written:,} bytes).'))
@@ -0,0 +1,58 @@
+"""
+Django management command to deliver queued student notifications.
+
+Drains the notification outbox in batches, each sent over a single
+connection of the configured EMAIL_BACKEND. Failed messages are retried with
+exponential backoff; see applications.notifications.
+
+Usage:
+    python manage.py send_notifications
+    python manage.py send_notifications --loop --interval 10
+    python manage.py send_notifications --batch-size 500 --max-attempts 8
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from applications.notifications import BATCH_SIZE, MAX_ATTEMPTS, deliver_due
+
+
+class Command(BaseCommand):
+    help = 'Send due notification emails from the outbox in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f'Messages per connection (default: {BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=MAX_ATTEMPTS,
+            help=f'Attempts before a message is marked failed (default: {MAX_ATTEMPTS})',
+        )
+        parser.add_argument('--loop', action='store_true', help='Keep polling the outbox instead of exiting when it is empty')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds between polls with --loop (default: 5)')
+
+    def handle(self, *args, **options):
+        totals = [0, 0, 0]
+        try:
+            while True:
+                # Drain everything that is due, one batch per connection
+                while True:
+                    sent, failed, superseded = deliver_due(options['batch_size'], options['max_attempts'])
+                    for index, count in enumerate((sent, failed, superseded)):
+                        totals[index] += count
+                    if sent or failed or superseded:
+                        self.stdout.write(f'Sent {sent}, failed {failed}, superseded {superseded}.')
+                    if sent + failed < options['batch_size']:
+                        break
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        style = self.style.WARNING if totals[1] else self.style.SUCCESS
+        self.stdout.write(style(f'Done: {totals[0]} sent, {totals[1]} failed, {totals[2]} superseded.'))
@@ -0,0 +1,62 @@
+"""
+Django management command to move applications to another status in bulk.
+
+Selects applications by application ID and/or current status and moves them
+with applications.services.transition_status(): one UPDATE and one
+bulk_create of "Status Changed" log entries per batch, in one transaction.
+
+Usage:
+    python manage.py transition_applications --to under_review --from pending
+    python manage.py transition_applications --to accepted 000123 000124 000125
+    python manage.py transition_applications --to rejected --ids-file rejected.txt --details "Intake closed"
+    python manage.py transition_applications --to under_review --from pending --dry-run
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from applications.models import Application
+from applications.services import STATUSES, transition_status
+
+
+class Command(BaseCommand):
+    help = 'Move the selected applications to a new status and log each change'
+
+    def add_arguments(self, parser):
+        parser.add_argument('application_ids', nargs='*', metavar='APPLICATION_ID', help='Applications to move')
+        parser.add_argument('--to', required=True, choices=STATUSES, help='New status')
+        parser.add_argument(
+            '--from',
+            dest='from_status',
+            action='append',
+            choices=STATUSES,
+            help='Only applications currently in this status (repeatable)',
+        )
+        parser.add_argument('--ids-file', metavar='PATH', help='File with one application ID per line')
+        parser.add_argument('--details', help='Log entry details (default: the standard message for the status)')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many applications would move')
+
+    def handle(self, *args, **options):
+        ids = list(options['application_ids'])
+        if options['ids_file']:
+            try:
+                with open(options['ids_file']) as handle:
+                    ids.extend(line.strip() for line in handle if line.strip())
+            except OSError as error:
+                raise CommandError(f"Cannot read {options['ids_file']}: {error}")
+        if not ids and not options['from_status']:
+            raise CommandError('Select applications by ID, --ids-file and/or --from.')
+
+        queryset = Application.objects.all()
+        if ids:
+            queryset = queryset.filter(application_id__in=ids)
+            missing = len(set(ids)) - queryset.count()
+            if missing:
+                self.stdout.write(self.style.WARNING(f'{missing} application ID(s) not found.'))
+        if options['from_status']:
+            queryset = queryset.filter(status__in=options['from_status'])
+
+        if options['dry_run']:
+            count = queryset.exclude(status=options['to']).count()
+            self.stdout.write(f"Dry run: {count} application(s) would move to {options['to']}.")
+            return
+        changed = transition_status(queryset, options['to'], details=options['details'])
+        self.stdout.write(self.style.SUCCESS(f"Moved {changed} application(s) to {options['to']}."))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.8 on 2026-10-19 13:37
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_application_custom_status_message_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(models.OrderBy(django.db.models.functions.text.Length('application_id'), descending=True), models.OrderBy(models.F('application_id'), descending=True), name='applications_id_sequence_idx'),
+        ),
+    ]
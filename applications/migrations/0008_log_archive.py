@@ -0,0 +1,42 @@
+# Generated by Django 4.2.8 on 2026-10-19 14:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0007_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationLogArchive',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('entries', models.BinaryField()),
+                ('entry_count', models.PositiveIntegerField()),
+                ('first_timestamp', models.DateTimeField()),
+                ('last_timestamp', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-last_timestamp'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='applicationlog',
+            index=models.Index(fields=['application', 'timestamp'], name='applications_log_timeline_idx'),
+        ),
+        migrations.AddField(
+            model_name='applicationlogarchive',
+            name='application',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='log_archives', to='applications.application'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationlogarchive',
+            index=models.Index(fields=['application', '-last_timestamp'], name='applications_log_archive_idx'),
+        ),
+    ]
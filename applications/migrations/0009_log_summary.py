@@ -0,0 +1,36 @@
+# Generated by Django 4.2.8 on 2026-10-19 14:01
+
+from django.db import migrations, models
+
+
+def backfill_log_summary(apps, schema_editor):
+    # Plain SQL over the three tables, so the current service is safe to call here
+    from applications.services import backfill_log_summary
+
+    backfill_log_summary(using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0008_log_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='last_event',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='last_event_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='log_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Log entries, archived ones included'),
+        ),
+        migrations.RunPython(backfill_log_summary, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,9 @@ Applications App Models
 """
 import uuid
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Length
+from django.utils import timezone
 
 
 class Application(models.Model):
@@ -45,17 +48,35 @@ class Application(models.Model):
         null=True,
         help_text="Custom message from admin (e.g., rejection reason, additional notes). If empty, default status message will be shown."
     )
+    # Summary of the log, kept in step by applications.services.record_event()
+    last_event = models.CharField(max_length=255, blank=True, editable=False)
+    last_event_at = models.DateTimeField(null=True, blank=True, editable=False)
+    log_count = models.PositiveIntegerField(default=0, editable=False, help_text="Log entries, archived ones included")
     
     class Meta:
         ordering = ['-applied_on']
+        indexes = [
+            # Serves the highest-application_id lookup in save()
+            models.Index(Length('application_id').desc(), F('application_id').desc(), name='applications_id_sequence_idx'),
+            # Admin changelists: ordering plus the pk tiebreaker, optionally per status
+            models.Index(fields=['-applied_on', '-id'], name='applications_recent_idx'),
+            models.Index(fields=['status', '-applied_on', '-id'], name='applications_status_recent_idx'),
+        ]
+    
+    @classmethod
+    def next_application_number(cls):
+        """Number for the next application_id (formatted as six or more digits)"""
+        # Longest first: once ids outgrow six digits, '1000000' sorts before '999999'
+        last_app = cls.objects.filter(application_id__isnull=False).order_by(
+            Length('application_id').desc(), '-application_id'
+        ).first()
+        if last_app and last_app.application_id.isdigit():
+            return int(last_app.application_id) + 1
+        return 1
     
     def save(self, *args, **kwargs):
         if not self.application_id:
-            last_app = Application.objects.filter(application_id__isnull=False).order_by('-application_id').first()
-            if last_app and last_app.application_id.isdigit():
-                self.application_id = f"{int(last_app.application_id) + 1:06d}"
-            else:
-                self.application_id = '000001'
+            self.application_id = f"{Application.next_application_number():06d}"
         super().save(*args, **kwargs)
     
     def get_status_message(self):
@@ -87,11 +108,81 @@ class ApplicationLog(models.Model):
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            # Per-application timelines and "latest entry" lookups
+            models.Index(fields=['application', 'timestamp'], name='applications_log_timeline_idx'),
+        ]
     
     def __str__(self):
         return f"{self.application.id} - {self.event}"
 
 
+class ApplicationLogArchive(models.Model):
+    """Older ApplicationLog entries of a closed application, moved out of the hot table.
+
+    Each row holds one archive_application_logs run's entries for one
+    application as zlib-compressed JSON; applications.timeline merges them
+    back into the timeline.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='log_archives')
+    entries = models.BinaryField()
+    entry_count = models.PositiveIntegerField()
+    first_timestamp = models.DateTimeField()
+    last_timestamp = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-last_timestamp']
+        indexes = [
+            models.Index(fields=['application', '-last_timestamp'], name='applications_log_archive_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.entry_count} archived log entries"
+
+
+class NotificationOutbox(models.Model):
+    """Email to a student, written in the same transaction as the change it reports.
+
+    Rows are delivered by the send_notifications worker (see
+    applications.notifications), so saving an application never waits on SMTP.
+    """
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    SUPERSEDED = 'superseded'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='notifications')
+    # One row per source event (e.g. the ApplicationLog entry), so enqueueing twice is harmless
+    dedupe_key = models.CharField(max_length=255, unique=True)
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=20, choices=[
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+        (SUPERSEDED, 'Superseded'),
+    ], default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # The worker's "due" query
+            models.Index(fields=['status', 'next_attempt_at'], name='applications_outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient}: {self.subject} ({self.status})"
+
+
 class PendingApplication(Application):
     class Meta:
         proxy = True
@@ -0,0 +1,157 @@
+"""
+Student email notifications through a transactional outbox.
+
+Status changes enqueue a NotificationOutbox row in the same transaction that
+writes the ApplicationLog entry (status_change_notification() builds it;
+callers save or bulk_create it). The send_notifications worker then calls
+deliver_due():
+
+* a pending row is superseded when a newer one exists for the same
+  application, so a student moved twice before the worker runs gets one
+  email about where the application ended up;
+* due rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several
+  workers can run side by side, and leased by moving next_attempt_at
+  LEASE_SECONDS ahead; the claim commits before any mail goes out, so no
+  row lock or transaction is held across SMTP, and the rows of a worker
+  that dies mid-batch come due again when the lease runs out;
+* the batch goes out over one connection from get_connection();
+* a failed message is retried with exponential backoff and marked failed
+  after max_attempts.
+
+Any EMAIL_BACKEND works, including the console and locmem backends.
+"""
+import datetime
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Application, NotificationOutbox
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+BACKOFF_SECONDS = 60
+BACKOFF_MAX_SECONDS = 6 * 60 * 60
+# How long a claimed batch is hidden from other workers while it is sent
+LEASE_SECONDS = 10 * 60
+STATUS_LABELS = dict(Application._meta.get_field('status').choices)
+
+
+def status_change_notification(log, application):
+    """Unsaved outbox row telling the student about the status change in log.
+
+    application should come with student, program and university loaded;
+    returns None when the student has no email address.
+    """
+    student = application.student
+    if not student.email:
+        return None
+    label = STATUS_LABELS.get(application.status, application.status)
+    context = {
+        'student': student,
+        'application': application,
+        'status': label,
+        'message': application.get_status_message(),
+    }
+    return NotificationOutbox(
+        application=application,
+        dedupe_key=f'status-change:{log.pk}',
+        recipient=student.email,
+        subject=f'Your TrikonED application #{application.application_id} is now {label}',
+        body=render_to_string('applications/emails/status_changed.txt', context),
+    )
+
+
+def retry_delay(attempts):
+    """Seconds to wait after the given number of failed attempts"""
+    return min(BACKOFF_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+
+
+def supersede_stale():
+    """Mark pending rows superseded by a newer pending row for the same application"""
+    newer = NotificationOutbox.objects.filter(
+        application=OuterRef('application'),
+        status=NotificationOutbox.PENDING,
+        created_at__gt=OuterRef('created_at'),
+    )
+    return (
+        NotificationOutbox.objects.filter(status=NotificationOutbox.PENDING)
+        .filter(Exists(newer))
+        .update(status=NotificationOutbox.SUPERSEDED)
+    )
+
+
+def claim_due(batch_size=BATCH_SIZE, lease_seconds=LEASE_SECONDS):
+    """Lease up to batch_size due notifications to the caller and return them"""
+    with transaction.atomic():
+        due = list(
+            NotificationOutbox.objects.filter(status=NotificationOutbox.PENDING, next_attempt_at__lte=timezone.now())
+            .select_for_update(skip_locked=True)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        if due:
+            NotificationOutbox.objects.filter(pk__in=[notification.pk for notification in due]).update(
+                next_attempt_at=timezone.now() + datetime.timedelta(seconds=lease_seconds),
+            )
+    return due
+
+
+def deliver_due(batch_size=BATCH_SIZE, max_attempts=MAX_ATTEMPTS, connection=None, lease_seconds=LEASE_SECONDS):
+    """Send up to batch_size due notifications; returns (sent, failed, superseded)"""
+    superseded = supersede_stale()
+    sent = failed = 0
+    due = claim_due(batch_size, lease_seconds)
+    if not due:
+        return sent, failed, superseded
+
+    connection = connection or get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        # Nothing can go out; every row waits for the next attempt
+        opened, connection_error = False, error
+    else:
+        opened, connection_error = True, None
+    try:
+        for notification in due:
+            error = connection_error
+            if opened:
+                message = EmailMessage(
+                    notification.subject, notification.body,
+                    settings.DEFAULT_FROM_EMAIL, [notification.recipient],
+                    connection=connection,
+                )
+                try:
+                    connection.send_messages([message])
+                except Exception as send_error:
+                    error = send_error
+            now = timezone.now()
+            notification.attempts += 1
+            if error is None:
+                notification.status = NotificationOutbox.SENT
+                notification.sent_at = now
+                notification.last_error = ''
+                sent += 1
+            else:
+                notification.last_error = f'{type(error).__name__}: {error}'
+                if notification.attempts >= max_attempts:
+                    notification.status = NotificationOutbox.FAILED
+                    logger.error('Giving up on notification %s: %s', notification.pk, notification.last_error)
+                else:
+                    notification.next_attempt_at = now + datetime.timedelta(seconds=retry_delay(notification.attempts))
+                failed += 1
+    finally:
+        if opened:
+            connection.close()
+        # Record whatever was attempted, also when the loop was interrupted
+        with transaction.atomic():
+            NotificationOutbox.objects.bulk_update(
+                due, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'],
+            )
+    return sent, failed, superseded
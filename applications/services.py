@@ -0,0 +1,220 @@
+"""
+Application events and status transitions.
+
+Log entries are written through record_event() / record_events(), which
+keep Application.last_event, last_event_at and log_count in step in the same
+transaction, so lists can show the latest event and the number of entries
+without reading the log. backfill_log_summary() recomputes all three from
+the log with one set-based UPDATE ... FROM.
+
+transition_status() is the bulk path used by the admin actions and the
+transition_applications command: the affected rows are read (and locked)
+once for their old status, moved with one UPDATE per batch and logged with
+one bulk_create per batch, so moving 500 applications costs a handful of
+queries instead of 500 saves. Each change also queues a student email in
+the notification outbox (see applications.notifications). Single edits in
+the admin use status_change_log() and enqueue_notifications() so both paths
+write the same rows.
+"""
+from collections import Counter, defaultdict
+from functools import partial
+
+from django.db import connections, router, transaction
+from django.db.models import Case, Count, DateTimeField, Exists, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Application, ApplicationLog, ApplicationLogArchive, NotificationOutbox
+
+STATUS_MESSAGES = {
+    'pending': 'Application is pending review',
+    'under_review': 'Application is now under review by the TrikonED team',
+    'accepted': 'Congratulations! Your application has been accepted',
+    'rejected': 'Unfortunately, your application was not successful at this time',
+}
+STATUSES = [value for value, _ in Application._meta.get_field('status').choices]
+BATCH_SIZE = 1000
+
+
+def record_events(logs):
+    """Save unsaved ApplicationLog entries and update their applications' summaries.
+
+    One bulk_create, plus a single UPDATE whose CASE branches group the
+    applications by latest event (stamped with the group's newest entry) and
+    by number of new entries, so a batch of status changes stays two queries
+    however many old statuses it mixes. The summary only moves forward in
+    time, so a concurrent writer with a newer entry is never overwritten.
+    Returns the saved entries.
+    """
+    if not logs:
+        return []
+    with transaction.atomic():
+        logs = ApplicationLog.objects.bulk_create(logs)
+        counts = Counter(log.application_id for log in logs)
+        latest = {}
+        for log in logs:
+            current = latest.get(log.application_id)
+            if current is None or log.timestamp >= current.timestamp:
+                latest[log.application_id] = log
+        by_event = defaultdict(list)
+        for log in latest.values():
+            by_event[log.event].append(log)
+        by_count = defaultdict(list)
+        for application_id, count in counts.items():
+            by_count[count].append(application_id)
+
+        latest_when = []
+        for event, group in by_event.items():
+            at = max(log.timestamp for log in group)
+            newer = Q(pk__in=[log.application_id for log in group]) & (
+                Q(last_event_at__isnull=True) | Q(last_event_at__lte=at)
+            )
+            latest_when.append((newer, event, at))
+        Application.objects.filter(pk__in=list(counts)).update(
+            log_count=F('log_count') + Case(
+                *[When(pk__in=ids, then=Value(count)) for count, ids in by_count.items()], default=Value(0),
+            ),
+            last_event=Case(
+                *[When(newer, then=Value(event)) for newer, event, _ in latest_when], default=F('last_event'),
+            ),
+            last_event_at=Case(
+                *[When(newer, then=Value(at, output_field=DateTimeField())) for newer, _, at in latest_when],
+                default=F('last_event_at'),
+            ),
+        )
+    return logs
+
+
+def record_event(application, event, details=''):
+    """Write one log entry for application and update its summary; returns the entry"""
+    log, = record_events([ApplicationLog(application=application, event=event, details=details)])
+    # Same guard as the UPDATE: a newer entry already in the summary stays
+    if application.last_event_at is None or application.last_event_at <= log.timestamp:
+        application.last_event, application.last_event_at = log.event, log.timestamp
+    application.log_count += 1
+    return log
+
+
+def refresh_log_summary(application_ids):
+    """Recompute the summaries of a few applications, e.g. after log entries were edited"""
+    latest = ApplicationLog.objects.filter(application=OuterRef('pk')).order_by('-timestamp', '-id')
+    hot_count = (
+        ApplicationLog.objects.filter(application=OuterRef('pk'))
+        .order_by().values('application').annotate(total=Count('pk')).values('total')
+    )
+    archived_count = (
+        ApplicationLogArchive.objects.filter(application=OuterRef('pk'))
+        .order_by().values('application').annotate(total=Sum('entry_count')).values('total')
+    )
+    return Application.objects.filter(pk__in=application_ids).update(
+        last_event=Coalesce(Subquery(latest.values('event')[:1]), Value('')),
+        last_event_at=Subquery(latest.values('timestamp')[:1]),
+        log_count=Coalesce(Subquery(hot_count), 0) + Coalesce(Subquery(archived_count), 0),
+    )
+
+
+def backfill_log_summary(using=None):
+    """Recompute every application's summary; returns the number of rows updated"""
+    alias = using or router.db_for_write(Application)
+    connection = connections[alias]
+    quote = connection.ops.quote_name
+    applications = quote(Application._meta.db_table)
+    logs = quote(ApplicationLog._meta.db_table)
+    archives = quote(ApplicationLogArchive._meta.db_table)
+    # PostgreSQL and SQLite (3.33+) both support UPDATE ... FROM
+    sql = f"""
+        UPDATE {applications}
+        SET last_event = latest.event,
+            last_event_at = latest.{quote('timestamp')},
+            log_count = latest.hot_count + COALESCE((
+                SELECT SUM(archive.entry_count) FROM {archives} archive
+                WHERE archive.application_id = latest.application_id
+            ), 0)
+        FROM (
+            SELECT application_id, event, {quote('timestamp')}, hot_count FROM (
+                SELECT application_id, event, {quote('timestamp')},
+                       COUNT(*) OVER (PARTITION BY application_id) AS hot_count,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY application_id ORDER BY {quote('timestamp')} DESC, id DESC
+                       ) AS position
+                FROM {logs}
+            ) ranked
+            WHERE position = 1
+        ) latest
+        WHERE {applications}.id = latest.application_id
+    """
+    with transaction.atomic(using=alias):
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            updated = cursor.rowcount
+        # Applications whose log is now empty are not in the FROM list
+        updated += (
+            Application.objects.using(alias).exclude(log_count=0, last_event='', last_event_at__isnull=True)
+            .exclude(Exists(ApplicationLog.objects.filter(application=OuterRef('pk'))))
+            .update(last_event='', last_event_at=None, log_count=0)
+        )
+    return updated
+
+
+def status_change_log(application, old_status, new_status, details=None):
+    """Unsaved ApplicationLog for a status change"""
+    return ApplicationLog(
+        application=application,
+        event=f'Status Changed: {old_status.title()} → {new_status.title()}',
+        details=details or STATUS_MESSAGES.get(new_status, f'Application status updated to {new_status}'),
+    )
+
+
+def enqueue_notifications(logs):
+    """Queue the student emails for saved status-change logs (same transaction)"""
+    from .notifications import status_change_notification
+
+    notifications = [status_change_notification(log, log.application) for log in logs]
+    NotificationOutbox.objects.bulk_create(
+        [notification for notification in notifications if notification is not None],
+        ignore_conflicts=True,
+    )
+
+
+def transition_status(queryset, new_status, details=None, batch_size=BATCH_SIZE):
+    """Move the applications in queryset to new_status and log each change.
+
+    Applications already in new_status are left alone. Returns the number of
+    applications changed.
+    """
+    from core.cache import ACTIVITY, STUDENT, invalidate_group
+
+    if new_status not in STATUSES:
+        raise ValueError(f'Unknown status {new_status!r}; expected one of {", ".join(STATUSES)}')
+    changed = 0
+    students = set()
+    with transaction.atomic():
+        # Pre-read under a row lock so the logged old status is the one replaced;
+        # the pk subquery drops any DISTINCT or joins, which FOR UPDATE rejects
+        rows = list(
+            Application.objects.filter(pk__in=queryset.values('pk'))
+            .exclude(status=new_status)
+            .select_for_update()
+            .order_by('pk')
+            .values_list('pk', 'status', 'student_id')
+        )
+        now = timezone.now()
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            pks = [pk for pk, _, _ in batch]
+            Application.objects.filter(pk__in=pks).update(status=new_status, updated_at=now)
+            applications = Application.objects.filter(pk__in=pks).select_related('student', 'program', 'university')
+            applications = {application.pk: application for application in applications}
+            logs = record_events([
+                status_change_log(applications[pk], old_status, new_status, details)
+                for pk, old_status, _ in batch
+            ])
+            enqueue_notifications(logs)
+            students.update(student_id for _, _, student_id in batch)
+            changed += len(batch)
+        # update() and bulk_create() send no signals
+        for student_id in students:
+            transaction.on_commit(partial(invalidate_group, STUDENT, student_id))
+        if changed:
+            transaction.on_commit(partial(invalidate_group, ACTIVITY))
+    return changed
@@ -0,0 +1,78 @@
+from unittest import mock
+
+from django.contrib.admin import site
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+
+from applications.models import Application
+from core.paginators import EstimatedCountPaginator, estimate_count
+from core.tests.fixtures import CachedFixtureTestCase, FixtureTestCase
+from students.dashboard import get_dashboard_data
+
+
+@override_settings(ADMIN_HIGH_VOLUME=True)
+class HighVolumeAdminTests(FixtureTestCase):
+    def setUp(self):
+        self.client.force_login(self.fixture.staff)
+
+    def search(self, term):
+        response = self.client.get(reverse('admin:applications_application_changelist'), {'q': term})
+        self.assertEqual(response.status_code, 200)
+        return sorted(application.pk for application in response.context['cl'].result_list)
+
+    def test_search_by_application_id(self):
+        application = self.fixture.applications[1]
+        self.assertEqual(self.search(application.application_id), [application.pk])
+        self.assertEqual(self.search('#' + application.application_id.lstrip('0')), [application.pk])
+
+    def test_search_by_email_and_username(self):
+        everything = sorted(application.pk for application in self.fixture.applications)
+        self.assertEqual(self.search('STUDENT@fixture.test'), everything)
+        self.assertEqual(self.search('fixture.student'), everything)
+        # No substring matching in this mode
+        self.assertEqual(self.search('University'), [])
+
+    def test_changelist_skips_the_full_count(self):
+        response = self.client.get(reverse('admin:applications_pendingapplication_changelist'))
+        self.assertFalse(response.context['cl'].show_full_result_count)
+        self.assertEqual(response.context['cl'].result_count, 1)
+
+    def test_paginator_counts_exactly_without_an_estimate(self):
+        queryset = Application.objects.filter(status='pending')
+        self.assertIsNone(estimate_count(queryset))  # not PostgreSQL
+        self.assertEqual(EstimatedCountPaginator(queryset, 10).count, 1)
+
+    @mock.patch('core.paginators.estimate_count', return_value=50000)
+    def test_high_estimate_serves_the_last_real_page(self, estimate):
+        paginator = EstimatedCountPaginator(Application.objects.order_by('application_id'), 3)
+        self.assertEqual(paginator.count, 50000)
+        page = paginator.page(40)
+        self.assertEqual((page.number, len(page.object_list)), (2, 1))
+        self.assertEqual((paginator.count, paginator.num_pages), (4, 2))
+
+        response = self.client.get(reverse('admin:applications_application_changelist'), {'p': 500})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['cl'].result_list), 4)
+
+    @mock.patch('core.paginators.estimate_count', return_value=2)
+    def test_low_estimate_counts_exactly_past_its_end(self, estimate):
+        paginator = EstimatedCountPaginator(Application.objects.order_by('application_id'), 1)
+        paginator.exact_threshold = 1
+        self.assertEqual(paginator.num_pages, 2)
+        self.assertEqual(paginator.page(3).object_list[0], self.fixture.applications[2])
+        self.assertEqual(paginator.count, 4)
+
+
+class BulkActionCacheTests(CachedFixtureTestCase):
+    def test_update_actions_refresh_the_dashboard(self):
+        Application.objects.filter(student=self.fixture.student).update(lead_quality='high')
+        student = self.fixture.student
+        self.assertEqual({a.lead_quality for a in get_dashboard_data(student)['applications']}, {'high'})
+
+        model_admin = site._registry[Application]
+        request = RequestFactory().post('/')
+        request.user = self.fixture.staff
+        model_admin.message_user = lambda *args, **kwargs: None
+        with self.captureOnCommitCallbacks(execute=True):
+            model_admin.reset_lead_quality(request, Application.objects.filter(student=student))
+        self.assertEqual({a.lead_quality for a in get_dashboard_data(student)['applications']}, {'low'})
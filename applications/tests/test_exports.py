@@ -0,0 +1,104 @@
+import csv
+import datetime
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from django.utils import timezone
+
+from applications.exports import EXPORT_COLUMNS, iter_export, parquet_available
+from applications.models import Application, ApplicationLog
+from applications.services import backfill_log_summary
+from core.tests.fixtures import FixtureTestCase
+
+
+def read_csv(data):
+    return list(csv.DictReader(io.StringIO(data.decode('utf-8-sig'))))
+
+
+class ApplicationExportTests(FixtureTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Make the latest log entry unambiguous
+        latest = timezone.now() + datetime.timedelta(days=1)
+        ApplicationLog.objects.filter(event='Decision made').update(timestamp=latest)
+        backfill_log_summary()
+
+    def export(self, fmt, queryset=None, chunk_size=2):
+        queryset = Application.objects.all() if queryset is None else queryset
+        return b''.join(iter_export(queryset, fmt, chunk_size=chunk_size))
+
+    def test_csv_has_a_row_per_application_with_the_latest_log(self):
+        rows = read_csv(self.export('csv'))
+        self.assertEqual(list(rows[0]), list(EXPORT_COLUMNS))
+        self.assertEqual(
+            [row['application_id'] for row in rows],
+            sorted((a.application_id for a in self.fixture.applications), key=lambda value: (len(value), value)),
+        )
+        pending = next(row for row in rows if row['status'] == 'pending')
+        self.assertEqual(pending['student_username'], 'fixture.student')
+        self.assertEqual(pending['program_level'], "Master's")
+        self.assertEqual(pending['latest_event'], 'Decision made')
+
+    def test_csv_neutralises_spreadsheet_formulas(self):
+        Application.objects.filter(pk=self.fixture.applications[0].pk).update(lead_quality='=HYPERLINK("x")')
+        rows = read_csv(self.export('csv'))
+        self.assertIn('\'=HYPERLINK("x")', [row['lead_quality'] for row in rows])
+
+    def test_ndjson_writes_one_object_per_line(self):
+        lines = self.export('ndjson', Application.objects.filter(status='accepted')).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        record = json.loads(lines[0])
+        self.assertEqual(record['status'], 'accepted')
+        self.assertEqual(record['university'], self.fixture.applications[2].university.name)
+        self.assertEqual(datetime.datetime.fromisoformat(record['latest_event_at']).date(),
+                         (timezone.now() + datetime.timedelta(days=1)).date())
+
+    @unittest.skipUnless(parquet_available(), 'pyarrow is not installed')
+    def test_parquet_round_trips(self):
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(io.BytesIO(self.export('parquet')))
+        self.assertEqual(table.num_rows, len(self.fixture.applications))
+        self.assertEqual(table.column_names, list(EXPORT_COLUMNS))
+
+    def test_parquet_without_pyarrow_is_refused(self):
+        if parquet_available():
+            self.skipTest('pyarrow is installed')
+        with self.assertRaises(ValueError):
+            iter_export(Application.objects.all(), 'parquet')
+
+    def test_command_filters_and_writes_a_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'open.csv')
+            call_command('export_applications', '--output', path, '--status', 'pending', '--status', 'draft',
+                         stdout=io.StringIO())
+            with open(path, 'rb') as handle:
+                rows = read_csv(handle.read())
+        self.assertEqual(sorted(row['status'] for row in rows), ['draft', 'pending'])
+
+    def test_command_rejects_bad_dates(self):
+        for value in ('yesterday', '2025-02-30'):
+            with self.subTest(value=value), self.assertRaisesMessage(CommandError, '--since must be a date'):
+                call_command('export_applications', '--since', value, stdout=io.StringIO())
+
+    def test_admin_action_streams_the_selection(self):
+        self.client.force_login(self.fixture.staff)
+        selected = self.fixture.applications[:2]
+        response = self.client.post(reverse('admin:applications_application_changelist'), {
+            'action': 'export_ndjson',
+            '_selected_action': [str(application.pk) for application in selected],
+        })
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment;', response['Content-Disposition'])
+        records = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(
+            sorted(record['application_id'] for record in records),
+            sorted(application.application_id for application in selected),
+        )
@@ -0,0 +1,82 @@
+import datetime
+import io
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from applications.models import Application, ApplicationLog
+from applications.services import record_event, record_events, transition_status
+from core.tests.fixtures import FixtureTestCase
+
+
+def summary(application):
+    application.refresh_from_db(fields=['last_event', 'last_event_at', 'log_count'])
+    return application.last_event, application.log_count
+
+
+class LogSummaryTests(FixtureTestCase):
+    def test_record_event_updates_the_summary(self):
+        application = self.fixture.applications[0]
+        self.assertEqual(summary(application), ('Decision made', 3))
+        log = record_event(application, 'Interview booked', details='Tuesday')
+        self.assertEqual((application.last_event, application.log_count), ('Interview booked', 4))
+        self.assertEqual(summary(application), ('Interview booked', 4))
+        self.assertEqual(application.last_event_at, log.timestamp)
+
+    def test_record_event_keeps_a_newer_summary(self):
+        application = self.fixture.applications[0]
+        later = timezone.now() + datetime.timedelta(hours=1)
+        Application.objects.filter(pk=application.pk).update(last_event='Rescheduled', last_event_at=later)
+        application.refresh_from_db()
+        record_event(application, 'Interview booked')
+        self.assertEqual((application.last_event, application.last_event_at), ('Rescheduled', later))
+        self.assertEqual(summary(application), ('Rescheduled', 4))
+
+    def test_mixed_batch_is_one_update(self):
+        draft, pending = self.fixture.applications[:2]
+        logs = [
+            ApplicationLog(application=draft, event='Called'),
+            ApplicationLog(application=draft, event='Emailed'),
+            ApplicationLog(application=pending, event='Interview booked'),
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            record_events(logs)
+        self.assertEqual(sum(query['sql'].startswith('UPDATE') for query in queries), 1)
+        self.assertEqual(summary(draft), ('Emailed', 5))
+        self.assertEqual(summary(pending), ('Interview booked', 4))
+
+    def test_older_entries_do_not_replace_the_latest(self):
+        application = self.fixture.applications[0]
+        latest_at = Application.objects.get(pk=application.pk).last_event_at
+        late = ApplicationLog(application=application, event='Backdated')
+        record_events([late])
+        ApplicationLog.objects.filter(pk=late.pk).update(timestamp=latest_at.replace(year=2000))
+        # A concurrent writer saw an older entry: the summary keeps the newest one
+        Application.objects.filter(pk=application.pk).update(last_event='Decision made', last_event_at=latest_at)
+        self.assertEqual(summary(application), ('Decision made', 4))
+
+    def test_transitions_update_the_summary_in_bulk(self):
+        transition_status(Application.objects.all(), 'under_review')
+        pending = self.fixture.applications[1]
+        self.assertEqual(summary(pending), ('Status Changed: Pending → Under_Review', 4))
+
+    def test_backfill_recomputes_every_application(self):
+        Application.objects.update(last_event='', last_event_at=None, log_count=0)
+        ApplicationLog.objects.filter(application=self.fixture.applications[3]).delete()
+        Application.objects.filter(pk=self.fixture.applications[3].pk).update(last_event='Stale', log_count=9)
+        out = io.StringIO()
+        call_command('backfill_log_summary', stdout=out)
+        self.assertIn('Updated 4 application(s)', out.getvalue())
+        self.assertEqual(summary(self.fixture.applications[0]), ('Decision made', 3))
+        self.assertEqual(summary(self.fixture.applications[3]), ('', 0))
+
+    def test_admin_log_edits_refresh_the_summary(self):
+        self.client.force_login(self.fixture.staff)
+        application = self.fixture.applications[0]
+        latest = application.logs.order_by('-timestamp').first()
+        response = self.client.post(reverse('admin:applications_applicationlog_delete', args=[latest.pk]), {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(summary(application), ('Documents reviewed', 2))
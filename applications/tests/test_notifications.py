@@ -0,0 +1,128 @@
+import contextlib
+import datetime
+import io
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from applications.models import Application, NotificationOutbox
+from applications.notifications import claim_due, deliver_due
+from applications.services import enqueue_notifications, transition_status
+from core.tests.fixtures import FixtureTestCase
+
+
+class FlakyBackend(EmailBackend):
+    """locmem backend that counts connections and rejects some recipients"""
+
+    opened = 0
+    reject = set()
+    on_send = None
+
+    def open(self):
+        type(self).opened += 1
+        return True
+
+    def send_messages(self, messages):
+        if type(self).on_send:
+            type(self).on_send()
+        for message in messages:
+            if set(message.to) & self.reject:
+                raise ConnectionError('recipient refused')
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='applications.tests.test_notifications.FlakyBackend')
+class NotificationOutboxTests(FixtureTestCase):
+    def setUp(self):
+        FlakyBackend.opened = 0
+        FlakyBackend.reject = set()
+        FlakyBackend.on_send = None
+
+    def test_status_changes_are_queued_not_sent(self):
+        transition_status(Application.objects.filter(status__in=['draft', 'pending']), 'under_review')
+        self.assertEqual(mail.outbox, [])
+        queued = NotificationOutbox.objects.order_by('application__application_id')
+        self.assertEqual(queued.count(), 2)
+        self.assertEqual({notification.recipient for notification in queued}, {'student@fixture.test'})
+        self.assertIn('Under Review', queued[0].subject)
+        self.assertIn(self.fixture.applications[0].program.name, queued[0].body)
+
+    def test_enqueueing_the_same_log_twice_is_ignored(self):
+        transition_status(Application.objects.filter(status='draft'), 'pending')
+        log = self.fixture.applications[0].logs.get(event__startswith='Status Changed')
+        enqueue_notifications([log])
+        self.assertEqual(NotificationOutbox.objects.count(), 1)
+
+    def test_batch_goes_out_over_one_connection(self):
+        transition_status(Application.objects.all(), 'under_review')
+        sent, failed, superseded = deliver_due()
+        self.assertEqual((sent, failed, superseded), (4, 0, 0))
+        self.assertEqual(FlakyBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertFalse(NotificationOutbox.objects.exclude(status=NotificationOutbox.SENT).exists())
+        # Nothing left to send
+        self.assertEqual(deliver_due(), (0, 0, 0))
+
+    def test_only_the_latest_change_per_application_is_sent(self):
+        queryset = Application.objects.filter(pk=self.fixture.applications[0].pk)
+        transition_status(queryset, 'pending')
+        NotificationOutbox.objects.update(created_at=timezone.now() - datetime.timedelta(minutes=1))
+        transition_status(queryset, 'accepted')
+        self.assertEqual(deliver_due(), (1, 0, 1))
+        self.assertIn('Accepted', mail.outbox[0].subject)
+
+    def test_failures_back_off_and_give_up(self):
+        FlakyBackend.reject = {'student@fixture.test'}
+        transition_status(Application.objects.filter(status='draft'), 'pending')
+        self.assertEqual(deliver_due(max_attempts=2), (0, 1, 0))
+        notification = NotificationOutbox.objects.get()
+        self.assertEqual(notification.status, NotificationOutbox.PENDING)
+        self.assertGreater(notification.next_attempt_at, timezone.now())
+        self.assertIn('recipient refused', notification.last_error)
+        # Not due yet
+        self.assertEqual(deliver_due(max_attempts=2), (0, 0, 0))
+
+        NotificationOutbox.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(deliver_due(max_attempts=2), (0, 1, 0))
+        self.assertEqual(NotificationOutbox.objects.get().status, NotificationOutbox.FAILED)
+
+    def test_claimed_rows_are_leased_while_sending(self):
+        transition_status(Application.objects.filter(status='draft'), 'pending')
+        # Another worker polling mid-send finds nothing due
+        claimed_meanwhile = []
+        FlakyBackend.on_send = lambda: claimed_meanwhile.extend(claim_due())
+        self.assertEqual(deliver_due(), (1, 0, 0))
+        self.assertEqual(claimed_meanwhile, [])
+
+    def test_rows_of_a_dead_worker_come_due_after_the_lease(self):
+        transition_status(Application.objects.filter(status='draft'), 'pending')
+        self.assertEqual(len(claim_due(lease_seconds=60)), 1)  # the worker dies here
+        self.assertEqual(deliver_due(), (0, 0, 0))
+        NotificationOutbox.objects.update(next_attempt_at=timezone.now() - datetime.timedelta(seconds=1))
+        self.assertEqual(deliver_due(), (1, 0, 0))
+
+    def test_admin_save_queues_a_notification(self):
+        self.client.force_login(self.fixture.staff)
+        application = self.fixture.applications[1]
+        response = self.client.post(reverse('admin:applications_application_change', args=[application.pk]), {
+            'student': application.student_id, 'university': application.university_id,
+            'program': application.program_id, 'application_type': application.application_type,
+            'status': 'accepted', 'lead_quality': 'low', 'custom_status_message': 'Welcome aboard!', 'remarks': '',
+            'logs-TOTAL_FORMS': 0, 'logs-INITIAL_FORMS': 0, 'logs-MIN_NUM_FORMS': 0, 'logs-MAX_NUM_FORMS': 1000,
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(mail.outbox, [])
+        self.assertIn('Welcome aboard!', NotificationOutbox.objects.get().body)
+
+    @override_settings(EMAIL_BACKEND='django.core.mail.backends.console.EmailBackend')
+    def test_worker_command_with_the_console_backend(self):
+        transition_status(Application.objects.filter(status='draft'), 'pending')
+        printed, out = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            call_command('send_notifications', stdout=out)
+        self.assertIn('To: student@fixture.test', printed.getvalue())
+        self.assertIn('Done: 1 sent, 0 failed, 0 superseded.', out.getvalue())
@@ -0,0 +1,76 @@
+import io
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from applications.models import Application, ApplicationLog
+from applications.services import transition_status
+from core.tests.fixtures import FixtureTestCase
+
+
+class StatusTransitionTests(FixtureTestCase):
+    def status_logs(self):
+        return list(
+            ApplicationLog.objects.filter(event__startswith='Status Changed')
+            .order_by('application__application_id').values_list('application_id', 'event')
+        )
+
+    def test_moves_and_logs_with_the_old_status(self):
+        draft, pending, accepted, _ = self.fixture.applications
+        changed = transition_status(Application.objects.exclude(status='rejected'), 'accepted')
+        self.assertEqual(changed, 2)
+        self.assertEqual(Application.objects.filter(status='accepted').count(), 3)
+        self.assertEqual(self.status_logs(), [
+            (draft.pk, 'Status Changed: Draft → Accepted'),
+            (pending.pk, 'Status Changed: Pending → Accepted'),
+        ])
+
+    def test_query_count_does_not_grow_with_the_selection(self):
+        with CaptureQueriesContext(connection) as one:
+            transition_status(Application.objects.filter(status='draft'), 'under_review', batch_size=10)
+        with CaptureQueriesContext(connection) as many:
+            transition_status(Application.objects.all(), 'pending', batch_size=10)
+        self.assertEqual(len(one), len(many))
+
+    def test_unknown_status_is_refused(self):
+        with self.assertRaises(ValueError):
+            transition_status(Application.objects.all(), 'archived')
+
+    def test_admin_action(self):
+        self.client.force_login(self.fixture.staff)
+        selected = self.fixture.applications[:2]
+        response = self.client.post(reverse('admin:applications_application_changelist'), {
+            'action': 'mark_under_review',
+            '_selected_action': [str(application.pk) for application in selected],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Application.objects.filter(status='under_review').count(), 2)
+        self.assertEqual(len(self.status_logs()), 2)
+
+    def test_admin_change_logs_the_initial_status(self):
+        self.client.force_login(self.fixture.staff)
+        application = self.fixture.applications[1]
+        url = reverse('admin:applications_application_change', args=[application.pk])
+        data = {
+            'student': application.student_id, 'university': application.university_id,
+            'program': application.program_id, 'application_type': application.application_type,
+            'status': 'rejected', 'lead_quality': 'low', 'custom_status_message': '', 'remarks': '',
+            'logs-TOTAL_FORMS': 0, 'logs-INITIAL_FORMS': 0, 'logs-MIN_NUM_FORMS': 0, 'logs-MAX_NUM_FORMS': 1000,
+        }
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.status_logs(), [(application.pk, 'Status Changed: Pending → Rejected')])
+
+    def test_command(self):
+        draft, pending = self.fixture.applications[:2]
+        out = io.StringIO()
+        call_command('transition_applications', draft.application_id, pending.application_id,
+                     '--to', 'under_review', '--from', 'pending', stdout=out)
+        self.assertIn('Moved 1 application(s)', out.getvalue())
+        self.assertEqual(self.status_logs(), [(pending.pk, 'Status Changed: Pending → Under_Review')])
+
+        call_command('transition_applications', '--to', 'accepted', '--from', 'draft', '--dry-run', stdout=out)
+        self.assertIn('Dry run: 1 application(s)', out.getvalue())
+        self.assertEqual(Application.objects.filter(status='draft').count(), 1)
@@ -0,0 +1,66 @@
+import datetime
+import io
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from applications.models import ApplicationLog, ApplicationLogArchive
+from applications.timeline import get_timeline
+from core.tests.fixtures import FixtureTestCase
+
+
+class LogArchiveTests(FixtureTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        _, cls.pending, cls.accepted, _ = cls.fixture.applications
+        long_ago = timezone.now() - datetime.timedelta(days=800)
+        # Old history for one closed and one open application
+        for application in (cls.accepted, cls.pending):
+            for day in range(5):
+                log = ApplicationLog.objects.create(application=application, event=f'Old event {day}', details='Archived?')
+                ApplicationLog.objects.filter(pk=log.pk).update(timestamp=long_ago + datetime.timedelta(days=day))
+
+    def archive(self, *args):
+        out = io.StringIO()
+        call_command('archive_application_logs', '--months', '12', *args, stdout=out)
+        return out.getvalue()
+
+    def test_moves_old_entries_of_closed_applications_only(self):
+        self.assertIn('Archived 5 log entries of 1 application(s).', self.archive())
+        self.assertEqual(self.accepted.logs.count(), 3)
+        self.assertEqual(self.pending.logs.count(), 8)
+        archive = ApplicationLogArchive.objects.get()
+        self.assertEqual((archive.application_id, archive.entry_count), (self.accepted.pk, 5))
+        # Nothing left to do on a second run
+        self.assertIn('Archived 0 log entries', self.archive())
+
+    def test_keeps_the_newest_entries_even_when_old(self):
+        ApplicationLog.objects.filter(application=self.accepted).exclude(event__startswith='Old').delete()
+        self.archive('--keep', '4')
+        self.assertEqual(
+            sorted(self.accepted.logs.values_list('event', flat=True)),
+            ['Old event 1', 'Old event 2', 'Old event 3', 'Old event 4'],
+        )
+
+    def test_dry_run(self):
+        self.assertIn('Dry run: would archive 5 log entries', self.archive('--dry-run'))
+        self.assertFalse(ApplicationLogArchive.objects.exists())
+
+    def test_timeline_merges_hot_and_archived_entries(self):
+        before = [(log.event, log.timestamp) for log in get_timeline(self.accepted)]
+        self.archive()
+        timeline = get_timeline(self.accepted)
+        self.assertEqual([(log.event, log.timestamp) for log in timeline], before)
+        self.assertEqual([log.archived for log in timeline], [False] * 3 + [True] * 5)
+        self.assertEqual([log.event for log in get_timeline(self.accepted, limit=4)], [e for e, _ in before[:4]])
+
+    def test_detail_page_and_pdf_show_archived_entries(self):
+        self.archive()
+        self.client.force_login(self.fixture.student)
+        response = self.client.get(reverse('applications:detail', args=[self.accepted.application_id]))
+        self.assertContains(response, 'Old event 0')
+        self.client.force_login(self.fixture.staff)
+        response = self.client.get(reverse('applications:pdf', args=[self.accepted.application_id]))
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,76 @@
+"""
+Application timelines across hot and archived log entries.
+
+archive_application_logs moves old entries of closed applications from
+ApplicationLog into compressed ApplicationLogArchive rows, always leaving the
+newest entries in place. get_timeline() reads both and returns ApplicationLog
+instances (archived ones unsaved, with archived=True), newest first, so
+templates and the PDF don't care where an entry lives.
+"""
+import datetime
+import json
+import zlib
+
+from .models import ApplicationLog, ApplicationLogArchive
+
+# archive_application_logs leaves at least this many newest entries per
+# application in place, so get_timeline() with a limit up to this never
+# has to decompress an archive row
+KEEP_RECENT_ENTRIES = 3
+
+
+def pack_entries(logs):
+    """Compress ApplicationLog .values() dicts (oldest first) for an archive row"""
+    entries = [
+        {
+            'id': str(log['id']),
+            'timestamp': log['timestamp'].isoformat(),
+            'event': log['event'],
+            'details': log['details'],
+        }
+        for log in logs
+    ]
+    return zlib.compress(json.dumps(entries, ensure_ascii=False).encode('utf-8'), 9)
+
+
+def unpack_entries(archive, application=None):
+    """Unsaved ApplicationLog instances for the entries in an archive row"""
+    entries = json.loads(zlib.decompress(bytes(archive.entries)).decode('utf-8'))
+    logs = []
+    for entry in entries:
+        log = ApplicationLog(
+            id=entry['id'],
+            application_id=archive.application_id,
+            timestamp=datetime.datetime.fromisoformat(entry['timestamp']),
+            event=entry['event'],
+            details=entry['details'],
+        )
+        if application is not None:
+            log.application = application
+        log.archived = True
+        logs.append(log)
+    return logs
+
+
+def get_timeline(application, limit=None):
+    """Log entries of application, newest first, hot and archived.
+
+    With a limit, archive rows are only decompressed when the hot entries
+    don't fill it, newest archive first.
+    """
+    hot = ApplicationLog.objects.filter(application=application).order_by('-timestamp')
+    timeline = list(hot[:limit] if limit else hot)
+    for log in timeline:
+        log.archived = False
+    if limit and len(timeline) >= limit:
+        return timeline
+
+    archived = []
+    archives = ApplicationLogArchive.objects.filter(application=application).order_by('-last_timestamp')
+    for archive in archives.iterator() if limit else archives:
+        archived.extend(unpack_entries(archive, application))
+        if limit and len(timeline) + len(archived) >= limit:
+            break
+    timeline.extend(archived)
+    timeline.sort(key=lambda log: log.timestamp, reverse=True)
+    return timeline[:limit] if limit else timeline
@@ -276,7 +276,8 @@ def generate_application_pdf(application):
     
     # Application Timeline (for all leads)
     elements.append(Paragraph("APPLICATION TIMELINE", heading_style))
-    logs = application.logs.all().order_by('timestamp')
+    from .timeline import get_timeline
+    logs = list(reversed(get_timeline(application)))
     if logs:
         timeline_data = [['Date & Time', 'Event', 'Details']]
         for log in logs:
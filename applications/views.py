@@ -1,7 +1,8 @@
 from django.views.generic import CreateView, DetailView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
-from .models import Application, ApplicationLog
+from .models import Application
+from .services import record_event
 
 from django.shortcuts import redirect, get_object_or_404
 from django.contrib import messages
@@ -33,7 +34,8 @@ class ApplicationCreateView(LoginRequiredMixin, CreateView):
         return initial
     
     def dispatch(self, request, *args, **kwargs):
-        if not request.user.documents.exists():
+        # Anonymous users fall through to LoginRequiredMixin's redirect
+        if request.user.is_authenticated and not request.user.documents.exists():
             messages.error(request, "You must upload at least one document (e.g., Passport, Transcript) before applying.")
             return redirect('students:upload_document')
         return super().dispatch(request, *args, **kwargs)
@@ -45,9 +47,9 @@ class ApplicationCreateView(LoginRequiredMixin, CreateView):
         application.save()
         
         # Create initial log entry
-        ApplicationLog.objects.create(
-            application=application,
-            event='Application Submitted',
+        record_event(
+            application,
+            'Application Submitted',
             details=f'Application submitted on TrikonED for the {application.program.name} ({application.university.name}) '
         )
         
@@ -65,7 +67,15 @@ class ApplicationDetailView(LoginRequiredMixin, DetailView):
     slug_url_kwarg = 'application_id'
     
     def get_queryset(self):
-        return Application.objects.filter(student=self.request.user).prefetch_related('logs')
+        return Application.objects.filter(student=self.request.user)
+
+    def get_context_data(self, **kwargs):
+        from .timeline import get_timeline
+
+        context = super().get_context_data(**kwargs)
+        # Hot and archived log entries, newest first
+        context['timeline'] = get_timeline(self.object)
+        return context
 
 class ApplicationCancelView(LoginRequiredMixin, DeleteView):
     model = Application
@@ -2,9 +2,13 @@
 Django settings for TrikonED project.
 """
 
+import hashlib
 import os
+import tempfile
+from importlib.util import find_spec
 from pathlib import Path
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 # Initialize environment variables
 env = environ.Env(
@@ -35,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
     
     # Third-party apps
     'crispy_forms',
@@ -50,7 +55,10 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.ReplicaStickinessMiddleware',
+    'core.middleware.StaticFilesMiddleware',  # WhiteNoise, async-capable
+    # After WhiteNoise: files it serves never reach a view and are not measured
+    'core.middleware.RequestInstrumentationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -61,6 +69,11 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'config.urls'
 
+# Serve the catalog (landing, university and program pages) from async views.
+# Only worth it under ASGI (uvicorn); under WSGI every async view is run
+# through async_to_sync.
+CATALOG_ASYNC_VIEWS = env.bool('CATALOG_ASYNC_VIEWS', default=False)
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -87,6 +100,58 @@ DATABASES = {
     'default': env.db('DATABASE_URL', default='sqlite:///db.sqlite3')
 }
 
+# Connection profile. DB_CONN_MAX_AGE > 0 keeps connections open across
+# requests (seconds, "None" for unlimited); health checks drop dead ones before
+# reuse. Persistent connections suit gunicorn's sync workers; under uvicorn each
+# request runs in its own thread, so leave it at 0 there or use pgbouncer.
+DATABASES['default']['CONN_MAX_AGE'] = env('DB_CONN_MAX_AGE', cast=lambda v: None if v == 'None' else int(v), default=0)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = env.bool('DB_CONN_HEALTH_CHECKS', default=True)
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    # pgbouncer in transaction mode can't keep named cursors between queries
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = env.bool('DB_PGBOUNCER', default=False)
+    # Abort runaway queries (ms, 0 = off). pgbouncer drops unknown startup
+    # parameters unless ignore_startup_parameters lists "options"; set the
+    # timeout on the database role there instead.
+    DB_STATEMENT_TIMEOUT = env.int('DB_STATEMENT_TIMEOUT', default=0)
+    if DB_STATEMENT_TIMEOUT:
+        DATABASES['default'].setdefault('OPTIONS', {})['options'] = f'-c statement_timeout={DB_STATEMENT_TIMEOUT}'
+
+# Read replicas for catalog reads (see core.db_routers), e.g.
+# DATABASE_REPLICA_URLS=postgresql://reader@replica1/trikoned,postgresql://reader@replica2/trikoned
+# Locally, two SQLite files work: copy db.sqlite3 and point a replica URL at the copy.
+DATABASE_REPLICAS = []
+for _index, _url in enumerate(env.list('DATABASE_REPLICA_URLS', default=[]), start=1):
+    _alias = f'replica{_index}'
+    DATABASES[_alias] = {
+        **DATABASES['default'],
+        **environ.Env.db_url_config(_url),
+        # Tests run against the primary only
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(_alias)
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ['core.db_routers.PrimaryReplicaRouter']
+# Seconds a visitor keeps reading from the primary after a write
+REPLICA_STICKY_SECONDS = env.int('REPLICA_STICKY_SECONDS', default=5)
+REPLICA_PIN_COOKIE = 'db_primary'
+# Seconds a replica that failed to connect is skipped
+REPLICA_RETRY_SECONDS = env.int('REPLICA_RETRY_SECONDS', default=30)
+
+
+# Caches (see core.cache). "default" is shared between processes: a file-based
+# cache by default, or e.g. CACHE_URL=rediscache://127.0.0.1:6379/1. "local" is
+# a small per-process LRU in front of it; CACHE_LOCAL_TIMEOUT bounds how long a
+# process may serve a value after another process invalidated it.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='filecache://' + os.path.join(tempfile.gettempdir(), 'trikoned-cache')),
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'trikoned-local',
+        'OPTIONS': {'MAX_ENTRIES': env.int('CACHE_LOCAL_MAX_ENTRIES', default=1000)},
+    },
+}
+CACHES['default'].setdefault('KEY_PREFIX', 'trikoned')
+CACHE_LOCAL_TIMEOUT = env.int('CACHE_LOCAL_TIMEOUT', default=5)
 
 # Custom User Model
 AUTH_USER_MODEL = 'students.Student'
@@ -109,6 +174,35 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing (see core.hashers). PASSWORD_HASHER picks the hasher for new
+# hashes: pbkdf2 (the default), argon2 (needs argon2-cffi), scrypt (needs
+# OpenSSL scrypt), or auto for the strongest available. argon2 and scrypt cost
+# memory per login (argon2: PASSWORD_ARGON2_MEMORY_COST KiB per hash), so opt
+# in only after sizing the workers. Stored hashes made with other parameters or
+# hashers are upgraded on the next successful login.
+# Run `python manage.py benchmark_password_hasher` to tune the costs.
+_AVAILABLE_HASHERS = {
+    'argon2': 'core.hashers.TunedArgon2PasswordHasher' if find_spec('argon2') else None,
+    'scrypt': 'core.hashers.TunedScryptPasswordHasher' if hasattr(hashlib, 'scrypt') else None,
+    'pbkdf2': 'core.hashers.TunedPBKDF2PasswordHasher',
+}
+PASSWORD_HASHER = env('PASSWORD_HASHER', default='pbkdf2')
+if PASSWORD_HASHER == 'auto':
+    PASSWORD_HASHER = next(name for name, path in _AVAILABLE_HASHERS.items() if path)
+if not _AVAILABLE_HASHERS.get(PASSWORD_HASHER):
+    raise ImproperlyConfigured(f'PASSWORD_HASHER "{PASSWORD_HASHER}" is unknown or unavailable.')
+PASSWORD_HASHERS = [_AVAILABLE_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _AVAILABLE_HASHERS.items() if path and name != PASSWORD_HASHER
+]
+PASSWORD_PBKDF2_ITERATIONS = env.int('PASSWORD_PBKDF2_ITERATIONS', default=600000)
+PASSWORD_SCRYPT_WORK_FACTOR = env.int('PASSWORD_SCRYPT_WORK_FACTOR', default=2 ** 14)
+PASSWORD_SCRYPT_BLOCK_SIZE = env.int('PASSWORD_SCRYPT_BLOCK_SIZE', default=8)
+PASSWORD_SCRYPT_PARALLELISM = env.int('PASSWORD_SCRYPT_PARALLELISM', default=1)
+PASSWORD_ARGON2_TIME_COST = env.int('PASSWORD_ARGON2_TIME_COST', default=2)
+PASSWORD_ARGON2_MEMORY_COST = env.int('PASSWORD_ARGON2_MEMORY_COST', default=102400)  # KiB
+PASSWORD_ARGON2_PARALLELISM = env.int('PASSWORD_ARGON2_PARALLELISM', default=8)
+
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'Asia/Dubai'
@@ -122,11 +216,49 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Sitemaps and robots.txt (see core.sitemaps), written by generate_sitemaps and
+# served from the site root by WhiteNoise, which indexes them at startup
+SITEMAP_ROOT = Path(env('SITEMAP_ROOT', default=str(BASE_DIR / 'public')))
+SITEMAP_BASE_URL = env('SITEMAP_BASE_URL', default='https://trikoned.ae')
+# Also list university and program pages; leave off while they require a login
+SITEMAP_DETAIL_PAGES = env.bool('SITEMAP_DETAIL_PAGES', default=False)
+WHITENOISE_ROOT = SITEMAP_ROOT
+
 
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Student document uploads (enforced while streaming, see students.uploads)
+DOCUMENT_UPLOAD_MAX_SIZE = env.int('DOCUMENT_UPLOAD_MAX_SIZE', default=10 * 1024 * 1024)
+DOCUMENT_UPLOAD_ALLOWED_EXTENSIONS = ['.pdf', '.jpg', '.jpeg', '.png']
+
+# Image derivatives (see core.thumbnails); stored under MEDIA_ROOT/THUMBNAIL_DIR
+THUMBNAIL_DIR = 'thumbnails'
+THUMBNAIL_FORMAT = env('THUMBNAIL_FORMAT', default='WEBP')
+THUMBNAIL_QUALITY = env.int('THUMBNAIL_QUALITY', default=80)
+
+# In-process background jobs (see core.background)
+BACKGROUND_WORKERS = env.int('BACKGROUND_WORKERS', default=2)
+BACKGROUND_TASKS_EAGER = env.bool('BACKGROUND_TASKS_EAGER', default=False)
+
+# High-volume admin for the applications tables: planner-estimated counts
+# (see core.paginators), no full result count and index-only search
+ADMIN_HIGH_VOLUME = env.bool('ADMIN_HIGH_VOLUME', default=False)
+
+
+# Request instrumentation (see core.instrumentation). Budgets are per URL name,
+# with '*' as the default; requests exceeding one are logged as warnings.
+# Server-Timing headers reveal internals, so they are on only in DEBUG by default.
+INSTRUMENTATION_ENABLED = env.bool('INSTRUMENTATION_ENABLED', default=True)
+INSTRUMENTATION_SERVER_TIMING = env.bool('INSTRUMENTATION_SERVER_TIMING', default=DEBUG)
+INSTRUMENTATION_BUDGETS = {
+    '*': {'queries': 30, 'db_ms': 200, 'total_ms': 1000},
+    'admin:index': {'queries': 60},
+}
+INSTRUMENTATION_DIR = os.path.join(tempfile.gettempdir(), 'trikoned-metrics')
+# Seconds between histogram snapshots written by each process
+INSTRUMENTATION_FLUSH_INTERVAL = env.int('INSTRUMENTATION_FLUSH_INTERVAL', default=30)
 
 # Email Configuration
 EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
@@ -139,10 +271,24 @@ CRISPY_TEMPLATE_PACK = "tailwind"
 
 
 # Authentication
+# EmailOrUsernameModelBackend already handles usernames; a second ModelBackend
+# would only repeat the lookup and password hash on every failed login
 AUTHENTICATION_BACKENDS = [
     'core.backends.EmailOrUsernameModelBackend',
-    'django.contrib.auth.backends.ModelBackend',
 ]
+
+# Login throttling (see core.throttling). Failed attempts are counted per IP and
+# per (identifier, IP) in LOGIN_THROTTLE_CACHE over a sliding LOGIN_THROTTLE_WINDOW.
+# Point LOGIN_THROTTLE_CACHE at Redis or Memcached in production: the default
+# file cache's incr() is not atomic, so concurrent failures can go uncounted.
+LOGIN_THROTTLE_ENABLED = env.bool('LOGIN_THROTTLE_ENABLED', default=True)
+LOGIN_THROTTLE_CACHE = env('LOGIN_THROTTLE_CACHE', default='default')
+LOGIN_THROTTLE_WINDOW = env.int('LOGIN_THROTTLE_WINDOW', default=300)
+LOGIN_THROTTLE_IP_LIMIT = env.int('LOGIN_THROTTLE_IP_LIMIT', default=30)
+LOGIN_THROTTLE_IDENTIFIER_LIMIT = env.int('LOGIN_THROTTLE_IDENTIFIER_LIMIT', default=5)
+# Number of reverse proxies in front of the app whose X-Forwarded-For is trusted
+LOGIN_THROTTLE_TRUSTED_PROXIES = env.int('LOGIN_THROTTLE_TRUSTED_PROXIES', default=0)
+
 LOGIN_URL = 'students:login'
 LOGIN_REDIRECT_URL = 'students:dashboard'
 LOGOUT_REDIRECT_URL = 'core:landing'
@@ -154,7 +300,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Security Settings (Production)
 if not DEBUG:
-    SECURE_SSL_REDIRECT = True
+    SECURE_SSL_REDIRECT = env.bool('SECURE_SSL_REDIRECT', default=True)
     SESSION_COOKIE_SECURE = True
     CSRF_COOKIE_SECURE = True
     SECURE_BROWSER_XSS_FILTER = True
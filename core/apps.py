@@ -5,3 +5,9 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
     verbose_name = 'Core'
+
+    def ready(self):
+        from core import checks  # noqa: F401
+        from core.cache import connect_invalidation_signals
+
+        connect_invalidation_signals()
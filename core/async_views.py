@@ -0,0 +1,57 @@
+"""
+Helpers for async (ASGI-native) views.
+
+Django 4.2 has no request.auser() and its Paginator and LoginRequiredMixin
+are synchronous, so these fill the gaps for the async catalog views. Any
+query still left lazy in the context is safe: Django renders a
+TemplateResponse returned by an async view in a worker thread.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.core.paginator import InvalidPage, Paginator
+from django.http import Http404
+
+
+async def aget_user(request):
+    """Resolve request.user (session and user lookup) off the event loop"""
+    def resolve():
+        # Touch an attribute so the lazy object loads inside the thread
+        request.user.is_authenticated
+        return request.user
+
+    return await sync_to_async(resolve)()
+
+
+class AsyncLoginRequiredMixin:
+    """Async counterpart of LoginRequiredMixin (login URL from settings)"""
+
+    async def dispatch(self, request, *args, **kwargs):
+        user = await aget_user(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await super().dispatch(request, *args, **kwargs)
+
+
+async def apaginate(request, queryset, per_page):
+    """Async equivalent of MultipleObjectMixin.paginate_queryset.
+
+    Returns a context dict with paginator, page_obj, is_paginated and
+    object_list (a list, already fetched).
+    """
+    paginator = Paginator(queryset, per_page)
+    # Paginator.count is a cached_property; fill it with an async count
+    paginator.count = await queryset.acount()
+    page_number = request.GET.get('page') or 1
+    try:
+        if page_number == 'last':
+            page_number = paginator.num_pages
+        page = paginator.page(page_number)
+    except (InvalidPage, ValueError) as exc:
+        raise Http404(f'Invalid page ({page_number}): {exc}')
+    page.object_list = [obj async for obj in page.object_list]
+    return {
+        'paginator': paginator,
+        'page_obj': page,
+        'is_paginated': page.has_other_pages(),
+        'object_list': page.object_list,
+    }
@@ -1,16 +1,79 @@
-from django.contrib.auth.backends import ModelBackend
+from collections import Counter
+
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.crypto import get_random_string
+
+# Stored hashes sampled to pick the algorithm unknown identifiers are checked with
+DUMMY_SAMPLE_SIZE = 50
+
+_dummy_password = None
+
+
+def get_dummy_password():
+    """A fixed encoded password made with the algorithm most stored hashes use.
+
+    Checking it costs what checking a real user's password costs, so a miss
+    takes as long as a wrong password even while stored hashes still use an
+    older hasher than the default. Built once per process from a small sample.
+    """
+    global _dummy_password
+    if _dummy_password is None:
+        stored = get_user_model()._default_manager.order_by('pk').values_list('password', flat=True)
+        algorithms = Counter()
+        for encoded in stored[:DUMMY_SAMPLE_SIZE]:
+            try:
+                algorithms[identify_hasher(encoded).algorithm] += 1
+            except ValueError:
+                # Unusable passwords and retired hashers
+                continue
+        hasher = get_hasher(algorithms.most_common(1)[0][0]) if algorithms else get_hasher()
+        _dummy_password = make_password(get_random_string(32), hasher=hasher)
+    return _dummy_password
+
+
+@receiver(setting_changed)
+def reset_dummy_password(*, setting, **kwargs):
+    global _dummy_password
+    if setting.startswith('PASSWORD_'):
+        _dummy_password = None
+
 
 class EmailOrUsernameModelBackend(ModelBackend):
-    def authenticate(self, request, username=None, password=None, **kwargs):
+    """Authenticate with either a username or an email address.
+
+    Each identifier is resolved with a single indexed lookup: emails through
+    the unique lower(email) index, usernames through the username index.
+    """
+
+    def get_user_by_identifier(self, identifier):
         UserModel = get_user_model()
+        if '@' in identifier:
+            try:
+                return UserModel._default_manager.filter_by_email(identifier).get()
+            except UserModel.DoesNotExist:
+                pass
         try:
-            # Check if the username is an email or a username
-            user = UserModel.objects.get(Q(username=username) | Q(email=username))
+            return UserModel._default_manager.get(username=identifier)
         except UserModel.DoesNotExist:
             return None
-        else:
-            if user.check_password(password) and self.user_can_authenticate(user):
-                return user
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        user = self.get_user_by_identifier(username)
+        if user is None:
+            # Verify against a stored-like hash so unknown identifiers take
+            # as long as wrong passwords
+            check_password(password, get_dummy_password())
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
         return None
@@ -0,0 +1,54 @@
+"""
+Background execution helpers.
+
+A small in-process thread pool for work that must not block the request
+(e.g. deleting replaced files from storage). Jobs are best-effort: they run
+after the response is produced and are lost if the process exits.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the shared background executor, creating it on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'BACKGROUND_WORKERS', 2),
+                    thread_name_prefix='trikoned-bg',
+                )
+    return _executor
+
+
+def _run_logged(func, args, kwargs):
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background job %s failed", getattr(func, '__name__', func))
+        raise
+    finally:
+        # Worker threads own their DB connections; don't leak them between jobs
+        if not getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+            connections.close_all()
+
+
+def run_in_background(func, *args, **kwargs):
+    """Schedule func(*args, **kwargs) on the background pool.
+
+    When BACKGROUND_TASKS_EAGER is set (useful in tests and management
+    commands) the job runs synchronously instead.
+    """
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        return _run_logged(func, args, kwargs)
+    return get_executor().submit(_run_logged, func, args, kwargs)
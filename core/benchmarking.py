@@ -0,0 +1,291 @@
+"""
+HTTP benchmark harness.
+
+Starts the project under a real application server (gunicorn or uvicorn) in
+a subprocess and drives it with a fixed number of client threads using only
+the standard library, so results reflect the production stack rather than
+the test client. drive_load() replays a fixed list of URLs; drive_scenarios()
+runs virtual users with sessions through a weighted mix of scenarios.
+"""
+import http.cookies
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import accumulate
+
+from django.conf import settings
+
+SERVER_COMMANDS = {
+    'gunicorn': lambda port, workers: [
+        sys.executable, '-m', 'gunicorn', 'config.wsgi:application',
+        '--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--log-level', 'warning',
+    ],
+    'uvicorn': lambda port, workers: [
+        sys.executable, '-m', 'uvicorn', 'config.asgi:application',
+        '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers), '--log-level', 'warning',
+    ],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(base_url, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Server exited with code {process.returncode} during startup')
+        try:
+            urllib.request.urlopen(base_url, timeout=1).close()
+            return
+        except urllib.error.HTTPError:
+            # Any HTTP response means the server is accepting requests
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'Server at {base_url} did not start within {timeout}s')
+
+
+@contextmanager
+def run_server(server='gunicorn', workers=2, env=None):
+    """Run the project under server in a subprocess and yield its base URL"""
+    port = free_port()
+    process_env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')}
+    process_env.update(env or {})
+    process = subprocess.Popen(
+        SERVER_COMMANDS[server](port, workers),
+        cwd=settings.BASE_DIR,
+        env=process_env,
+        stdout=subprocess.DEVNULL,
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        wait_until_ready(base_url, process)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def drive_load(urls, concurrency=8, duration=10.0, warmup=1.0, headers=None):
+    """Request urls round-robin from concurrency threads for duration seconds.
+
+    Returns a dict with requests, errors, rps and latency percentiles (ms).
+    Requests issued during the warm-up period are not counted.
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    started = time.monotonic()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    def worker(offset):
+        index = offset
+        local_latencies, local_errors = [], 0
+        while True:
+            now = time.monotonic()
+            if now >= stop_at:
+                break
+            request = urllib.request.Request(urls[index % len(urls)], headers=headers or {})
+            index += 1
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+                ok = True
+            except (urllib.error.URLError, OSError):
+                ok = False
+            finished = time.monotonic()
+            if now >= measure_from:
+                if ok:
+                    local_latencies.append((finished - now) * 1000)
+                else:
+                    local_errors += 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return summarize_latencies(latencies, errors[0], duration)
+
+
+def summarize_latencies(latencies, errors, duration):
+    """requests, errors, rps and latency percentiles (ms) of one set of samples"""
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / duration,
+        'mean_ms': statistics.fmean(latencies) if latencies else 0.0,
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99),
+    }
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        # Surface the 3xx itself so callers can time and check it
+        return None
+
+
+class HttpSession:
+    """A minimal browser: keeps cookies and sends the CSRF token with posts.
+
+    Cookies are kept by name only and sent back even when marked Secure, since
+    the benchmark server speaks plain HTTP. Redirects are not followed.
+    """
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.cookies = {}
+        self.opener = urllib.request.build_opener(_NoRedirect)
+
+    def request(self, path, data=None):
+        """GET path, or POST data as a form; returns (status, body)"""
+        headers = {}
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+        body = None
+        if data is not None:
+            token = self.cookies.get(settings.CSRF_COOKIE_NAME, '')
+            body = urllib.parse.urlencode({**data, 'csrfmiddlewaretoken': token}, doseq=True).encode()
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        request = urllib.request.Request(self.base_url + path, data=body, headers=headers)
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                status, content, response_headers = response.status, response.read(), response.headers
+        except urllib.error.HTTPError as error:
+            status, content, response_headers = error.code, error.read(), error.headers
+        for header in response_headers.get_all('Set-Cookie') or []:
+            for name, morsel in http.cookies.SimpleCookie(header).items():
+                if morsel['max-age'] == '0':
+                    self.cookies.pop(name, None)
+                else:
+                    self.cookies[name] = morsel.value
+        return status, content
+
+
+class VirtualUser:
+    """One simulated visitor; scenarios issue their requests through request()"""
+
+    def __init__(self, index, base_url, rng, measure_from, stop_at):
+        self.index = index
+        self.base_url = base_url
+        self.rng = rng
+        self.session = HttpSession(base_url)
+        self.measure_from = measure_from
+        self.stop_at = stop_at
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def new_session(self):
+        return HttpSession(self.base_url)
+
+    def request(self, endpoint, path, data=None, expect=(200,), session=None):
+        """Time one request under the endpoint label; returns (ok, body).
+
+        Only requests started inside the measurement window are recorded. A
+        status outside expect (or a connection error) counts as an error.
+        """
+        started = time.monotonic()
+        try:
+            status, body = (session or self.session).request(path, data)
+        except OSError:
+            status, body = None, b''
+        finished = time.monotonic()
+        ok = status in expect
+        if self.measure_from <= started < self.stop_at:
+            if ok:
+                self.latencies[endpoint].append((finished - started) * 1000)
+            else:
+                self.errors[endpoint] += 1
+        return ok, body
+
+
+def drive_scenarios(base_url, scenarios, concurrency=8, duration=10.0, warmup=1.0, seed=1, setup=None):
+    """Run virtual users through a weighted mix of scenarios for duration seconds.
+
+    scenarios maps a name to (weight, function); each virtual user calls
+    setup(user) once and then repeatedly runs function(user) for a scenario
+    picked by weight, with a random generator seeded from seed and its index.
+    Returns {'endpoints': {label: summary}, 'total': summary, 'scenarios':
+    {name: runs}}, where summaries come from summarize_latencies().
+    """
+    names = [name for name, (weight, _) in scenarios.items() if weight > 0]
+    cum_weights = list(accumulate(scenarios[name][0] for name in names))
+    started = time.monotonic()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+    users = [
+        VirtualUser(index, base_url, random.Random(f'{seed}:{index}'), measure_from, stop_at)
+        for index in range(concurrency)
+    ]
+    runs = defaultdict(int)
+    lock = threading.Lock()
+
+    def worker(user):
+        local_runs = defaultdict(int)
+        if setup is not None:
+            setup(user)
+        while time.monotonic() < stop_at:
+            name = user.rng.choices(names, cum_weights=cum_weights)[0]
+            if time.monotonic() >= measure_from:
+                local_runs[name] += 1
+            scenarios[name][1](user)
+        with lock:
+            for name, count in local_runs.items():
+                runs[name] += count
+
+    threads = [threading.Thread(target=worker, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies, errors = defaultdict(list), defaultdict(int)
+    for user in users:
+        for endpoint, samples in user.latencies.items():
+            latencies[endpoint].extend(samples)
+        for endpoint, count in user.errors.items():
+            errors[endpoint] += count
+    endpoints = sorted(set(latencies) | set(errors))
+    return {
+        'endpoints': {
+            endpoint: summarize_latencies(latencies[endpoint], errors[endpoint], duration)
+            for endpoint in endpoints
+        },
+        'total': summarize_latencies(
+            [sample for samples in latencies.values() for sample in samples], sum(errors.values()), duration,
+        ),
+        'scenarios': dict(sorted(runs.items())),
+    }
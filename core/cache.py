@@ -0,0 +1,198 @@
+"""
+Two-tier cache helpers.
+
+Values live in the shared cache (CACHES['default'], file-based or Redis) and
+are copied into a small in-process LRU (CACHES['local']) for at most
+CACHE_LOCAL_TIMEOUT seconds, so hot keys skip the network round trip.
+
+Keys are namespaced and carry the version of an invalidation group:
+
+* ``catalog``   universities and programs,
+* ``reference`` countries, emirates and curricula,
+* ``student``   data owned by one student (scoped by the student's id),
+* ``activity``  site-wide student and application counts (landing page).
+
+Saving or deleting a model in a group bumps that group's version after the
+transaction commits (see connect_invalidation_signals), which orphans every
+key built with the old version. Other processes see the new version within
+CACHE_LOCAL_TIMEOUT seconds.
+
+Stampedes on hot keys are avoided with probabilistic early expiration
+(XFetch): each reader may recompute a value shortly before it expires, with
+a probability that rises as expiry nears and with how long it took to build.
+"""
+import hashlib
+import math
+import random
+import time
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+SHARED_CACHE = 'default'
+LOCAL_CACHE = 'local'
+
+CATALOG = 'catalog'
+REFERENCE = 'reference'
+STUDENT = 'student'
+ACTIVITY = 'activity'
+
+# App label -> group whose version is bumped when one of its models changes
+APP_GROUPS = {
+    'universities': CATALOG,
+    'programs': CATALOG,
+    'core': REFERENCE,
+}
+# Student-owned models -> how to find the owning student's id
+STUDENT_SCOPED_MODELS = {
+    'students.Student': lambda instance: instance.pk,
+    'students.StudentDocument': lambda instance: instance.student_id,
+    'students.StudentTestScore': lambda instance: instance.student_id,
+    'applications.Application': lambda instance: instance.student_id,
+    'applications.ApplicationLog': lambda instance: _log_student_id(instance),
+}
+# Models counted by the activity group -> whether every save matters (an
+# application's status moves the success rate), not just added rows
+ACTIVITY_MODELS = {
+    'students.Student': False,
+    'applications.Application': True,
+}
+# Scoped group versions only need to outlive the values built with them
+SCOPED_VERSION_TIMEOUT = 30 * 24 * 3600
+MAX_KEY_LENGTH = 200
+MISSING = object()
+
+
+def _group_key(group, scope=None):
+    return f'cache-group:{group}' if scope is None else f'cache-group:{group}:{scope}'
+
+
+def _new_version():
+    return format(time.time_ns(), 'x')
+
+
+def get_group_version(group, scope=None):
+    """Current version token of an invalidation group"""
+    key = _group_key(group, scope)
+    local = caches[LOCAL_CACHE]
+    version = local.get(key)
+    if version is None:
+        shared = caches[SHARED_CACHE]
+        version = shared.get(key)
+        if version is None:
+            timeout = None if scope is None else SCOPED_VERSION_TIMEOUT
+            shared.add(key, _new_version(), timeout)
+            version = shared.get(key) or _new_version()
+        local.set(key, version, settings.CACHE_LOCAL_TIMEOUT)
+    return version
+
+
+def invalidate_group(group, scope=None):
+    """Orphan every cached value built under the group's current version"""
+    key = _group_key(group, scope)
+    version = _new_version()
+    caches[SHARED_CACHE].set(key, version, None if scope is None else SCOPED_VERSION_TIMEOUT)
+    caches[LOCAL_CACHE].set(key, version, settings.CACHE_LOCAL_TIMEOUT)
+
+
+def make_key(namespace, *parts, group=None, scope=None):
+    """Build a namespaced key, versioned by group when one is given"""
+    key = ':'.join([namespace, *(str(part) for part in parts)])
+    if group is not None:
+        key = f'{key}@{group}.{get_group_version(group, scope)}'
+    if len(key) > MAX_KEY_LENGTH or any(char.isspace() for char in key):
+        key = f'{namespace}:{hashlib.md5(key.encode()).hexdigest()}'
+    return key
+
+
+def _expires_early(entry, beta):
+    _, delta, expires_at = entry
+    # XFetch: -log(U) is exponentially distributed, so most readers wait for
+    # expiry but one is likely to refresh about delta * beta seconds early
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+def _lookup(key, beta):
+    """Return the cached value, or MISSING when it should be (re)built"""
+    local = caches[LOCAL_CACHE]
+    entry = local.get(key)
+    if entry is None:
+        entry = caches[SHARED_CACHE].get(key)
+        if entry is not None:
+            remaining = entry[2] - time.time()
+            if remaining > 0:
+                local.set(key, entry, min(remaining, settings.CACHE_LOCAL_TIMEOUT))
+
+    if entry is None or _expires_early(entry, beta):
+        return MISSING
+    return entry[0]
+
+
+def _store(key, value, build_time, timeout):
+    entry = (value, build_time, time.time() + timeout)
+    caches[SHARED_CACHE].set(key, entry, timeout)
+    caches[LOCAL_CACHE].set(key, entry, min(timeout, settings.CACHE_LOCAL_TIMEOUT))
+
+
+def get_or_set(key, compute, timeout=300, beta=1.0):
+    """Return the cached value for key, calling compute() to (re)build it"""
+    value = _lookup(key, beta)
+    if value is MISSING:
+        started = time.monotonic()
+        value = compute()
+        _store(key, value, time.monotonic() - started, timeout)
+    return value
+
+
+def cached(namespace, *parts, compute, timeout=300, group=None, scope=None, beta=1.0):
+    """Shortcut for get_or_set(make_key(...), compute, ...)"""
+    key = make_key(namespace, *parts, group=group, scope=scope)
+    return get_or_set(key, compute, timeout=timeout, beta=beta)
+
+
+async def acached(namespace, *parts, compute, timeout=300, group=None, scope=None, beta=1.0):
+    """Async cached(); compute is a coroutine function"""
+    key = await sync_to_async(make_key)(namespace, *parts, group=group, scope=scope)
+    value = await sync_to_async(_lookup)(key, beta)
+    if value is MISSING:
+        started = time.monotonic()
+        value = await compute()
+        await sync_to_async(_store)(key, value, time.monotonic() - started, timeout)
+    return value
+
+
+def _log_student_id(log):
+    """Owning student of a log entry, without loading the whole application"""
+    if type(log).application.is_cached(log):
+        return log.application.student_id
+    from applications.models import Application
+    return Application.objects.filter(pk=log.application_id).values_list('student_id', flat=True).first()
+
+
+def _invalidate_for_instance(sender, instance, created=True, **kwargs):
+    label = sender._meta.label
+    if label in ACTIVITY_MODELS and (created or ACTIVITY_MODELS[label]):
+        transaction.on_commit(partial(invalidate_group, ACTIVITY))
+    if label in STUDENT_SCOPED_MODELS:
+        student_id = STUDENT_SCOPED_MODELS[label](instance)
+        if student_id is not None:
+            transaction.on_commit(partial(invalidate_group, STUDENT, student_id))
+    group = APP_GROUPS.get(sender._meta.app_label)
+    if group is not None:
+        transaction.on_commit(partial(invalidate_group, group))
+
+
+def connect_invalidation_signals():
+    """Bump group versions whenever a grouped model is saved or deleted"""
+    from django.apps import apps
+
+    for model in apps.get_models():
+        label = model._meta.label
+        if model._meta.app_label in APP_GROUPS or label in STUDENT_SCOPED_MODELS or label in ACTIVITY_MODELS:
+            uid = f'core.cache:{model._meta.label}'
+            post_save.connect(_invalidate_for_instance, sender=model, dispatch_uid=uid)
+            post_delete.connect(_invalidate_for_instance, sender=model, dispatch_uid=uid)
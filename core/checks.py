@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.security, deploy=True)
+def check_login_throttle_cache(app_configs, **kwargs):
+    """The login throttle needs atomic counters shared by every worker"""
+    from core.throttling import get_throttle_cache, has_atomic_counters
+
+    if not getattr(settings, 'LOGIN_THROTTLE_ENABLED', True) or has_atomic_counters(get_throttle_cache()):
+        return []
+    return [Warning(
+        'LOGIN_THROTTLE_CACHE uses a cache without atomic incr(); concurrent login failures can go uncounted.',
+        hint='Point LOGIN_THROTTLE_CACHE (or CACHE_URL) at Redis or Memcached.',
+        id='core.W001',
+    )]
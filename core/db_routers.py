@@ -0,0 +1,111 @@
+"""
+Primary/replica database routing.
+
+Catalog models (core, universities, programs) are read from the replicas in
+settings.DATABASE_REPLICAS; everything else, and every write, uses the
+primary. Reads go to the primary instead when:
+
+* the request is pinned (unsafe method, or the visitor wrote something in the
+  last REPLICA_STICKY_SECONDS, see core.middleware.ReplicaStickinessMiddleware),
+* the code runs inside ``use_primary()`` or an atomic block on the primary,
+* no replica is reachable. A replica that fails to connect is skipped for
+  REPLICA_RETRY_SECONDS.
+"""
+import contextvars
+import logging
+import random
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA_APP_LABELS = {'core', 'universities', 'programs'}
+
+# Per request (or per use_primary block) routing state
+_routing_state = contextvars.ContextVar('db_routing_state', default=None)
+# Replica alias -> monotonic time until which it is considered down
+_replica_down_until = {}
+
+
+class RoutingState:
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+def begin_request(pinned=False):
+    """Start tracking a request; returns a token for end_request()"""
+    return _routing_state.set(RoutingState(pinned))
+
+
+def end_request(token):
+    """Stop tracking a request; returns True if it wrote to the primary"""
+    state = _routing_state.get()
+    _routing_state.reset(token)
+    return bool(state and state.wrote)
+
+
+@contextmanager
+def use_primary():
+    """Read everything from the primary inside this block"""
+    state = _routing_state.get()
+    token = _routing_state.set(RoutingState(pinned=True))
+    try:
+        yield
+    finally:
+        wrote = _routing_state.get().wrote
+        _routing_state.reset(token)
+        if state is not None and wrote:
+            state.wrote = True
+
+
+def replica_is_available(alias):
+    if _replica_down_until.get(alias, 0) > time.monotonic():
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError:
+        logger.warning("Replica %s is unavailable, reading from the primary", alias, exc_info=True)
+        _replica_down_until[alias] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+        return False
+    _replica_down_until.pop(alias, None)
+    return True
+
+
+def choose_replica():
+    """Return a reachable replica alias, or the primary if there is none"""
+    replicas = list(settings.DATABASE_REPLICAS)
+    random.shuffle(replicas)
+    for alias in replicas:
+        if replica_is_available(alias):
+            return alias
+    return DEFAULT_DB_ALIAS
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in REPLICA_APP_LABELS:
+            return DEFAULT_DB_ALIAS
+        state = _routing_state.get()
+        if state is not None and state.pinned:
+            return DEFAULT_DB_ALIAS
+        # Read-your-writes inside a transaction on the primary
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return choose_replica()
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,63 @@
+"""
+Password hashers with settings-driven cost parameters.
+
+Each hasher keeps Django's algorithm name, so hashes made by the stock hashers
+still verify. Cost parameters are read from settings on every use. A stored
+hash whose parameters differ from the current settings (or that used a hasher
+other than the first in PASSWORD_HASHERS) is re-encoded by check_password()
+on the next successful login, so changing the cost needs no migration.
+
+Use the benchmark_password_hasher command to pick values for a machine.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+# Lets scrypt verify hashes made with a higher cost than the current settings
+SCRYPT_MAXMEM_FLOOR = 256 * 1024 * 1024
+
+
+class TunedPBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class TunedScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_SCRYPT_BLOCK_SIZE
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT_PARALLELISM
+
+    @property
+    def maxmem(self):
+        # scrypt needs 128 * n * r * p bytes; OpenSSL's default cap is 32 MiB
+        return max(
+            2 * scrypt_memory(self.work_factor, self.block_size, self.parallelism),
+            SCRYPT_MAXMEM_FLOOR,
+        )
+
+
+class TunedArgon2PasswordHasher(hashers.Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
+
+def scrypt_memory(work_factor, block_size, parallelism):
+    """Bytes of memory one scrypt hash uses"""
+    return 128 * work_factor * block_size * parallelism
@@ -0,0 +1,198 @@
+"""
+Per-request instrumentation.
+
+RequestInstrumentationMiddleware (core.middleware) measures every request:
+query count and DB time through connection.execute_wrapper, plus view,
+template render and total time. Results go into per-URL-name histograms kept
+in process memory. Each process periodically writes a snapshot to
+INSTRUMENTATION_DIR, and the request_metrics command merges the snapshots
+into percentiles.
+
+Histograms use fixed exponential buckets (each 25% wider than the last), so
+percentiles are approximate but memory stays constant per URL name.
+"""
+import atexit
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Bucket upper bounds from 0.1 to ~100,000 (ms, or queries)
+BUCKET_BOUNDS = [round(0.1 * 1.25 ** i, 3) for i in range(63)]
+METRICS = ('total_ms', 'view_ms', 'render_ms', 'db_ms', 'queries')
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(BUCKET_BOUNDS[index], self.max) if index < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self):
+        return {'counts': self.counts, 'count': self.count, 'total': self.total, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        if len(data['counts']) == len(histogram.counts):
+            histogram.counts = list(data['counts'])
+            histogram.count = data['count']
+            histogram.total = data['total']
+            histogram.max = data['max']
+        return histogram
+
+
+class RouteStats:
+    """Histograms for one URL name plus its budget violation count"""
+
+    def __init__(self):
+        self.histograms = {metric: Histogram() for metric in METRICS}
+        self.over_budget = 0
+
+    def merge(self, other):
+        for metric in METRICS:
+            self.histograms[metric].merge(other.histograms[metric])
+        self.over_budget += other.over_budget
+
+    def to_dict(self):
+        return {
+            'histograms': {metric: h.to_dict() for metric, h in self.histograms.items()},
+            'over_budget': self.over_budget,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        for metric in METRICS:
+            if metric in data['histograms']:
+                stats.histograms[metric] = Histogram.from_dict(data['histograms'][metric])
+        stats.over_budget = data.get('over_budget', 0)
+        return stats
+
+
+_routes = {}
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+_flushed_once = False
+
+
+def get_budget(url_name):
+    budgets = getattr(settings, 'INSTRUMENTATION_BUDGETS', {})
+    return {**budgets.get('*', {}), **budgets.get(url_name, {})}
+
+
+def check_budget(url_name, sample):
+    """Return the metrics in sample that exceed the URL name's budget"""
+    budget = get_budget(url_name)
+    return {metric: (sample[metric], limit) for metric, limit in budget.items() if sample.get(metric, 0) > limit}
+
+
+def record(url_name, sample, over_budget=False):
+    """Add one request's measurements (a dict keyed by METRICS)"""
+    with _lock:
+        stats = _routes.get(url_name)
+        if stats is None:
+            stats = _routes[url_name] = RouteStats()
+        for metric in METRICS:
+            stats.histograms[metric].add(sample.get(metric, 0))
+        if over_budget:
+            stats.over_budget += 1
+        due = time.monotonic() - _last_flush >= settings.INSTRUMENTATION_FLUSH_INTERVAL
+    if due:
+        flush()
+
+
+def snapshot_path(pid=None):
+    return os.path.join(settings.INSTRUMENTATION_DIR, f'{pid or os.getpid()}.json')
+
+
+def flush():
+    """Write this process's cumulative histograms to its snapshot file"""
+    global _last_flush, _flushed_once
+    path = snapshot_path()
+    with _lock:
+        # The request_metrics --reset option deletes snapshot files; start over
+        if _flushed_once and not os.path.exists(path):
+            _routes.clear()
+        data = {name: stats.to_dict() for name, stats in _routes.items()}
+        _last_flush = time.monotonic()
+        _flushed_once = True
+    try:
+        os.makedirs(settings.INSTRUMENTATION_DIR, exist_ok=True)
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w') as handle:
+            json.dump({'pid': os.getpid(), 'written_at': time.time(), 'routes': data}, handle)
+        os.replace(temp_path, path)
+    except OSError:
+        logger.warning("Could not write request metrics to %s", path, exc_info=True)
+
+
+def load_snapshots(directory=None):
+    """Merge every process snapshot in directory into {url_name: RouteStats}"""
+    directory = directory or settings.INSTRUMENTATION_DIR
+    merged = {}
+    if not os.path.isdir(directory):
+        return merged
+    for entry in os.scandir(directory):
+        if not entry.name.endswith('.json'):
+            continue
+        try:
+            with open(entry.path) as handle:
+                routes = json.load(handle)['routes']
+        except (OSError, ValueError, KeyError):
+            continue
+        for name, data in routes.items():
+            merged.setdefault(name, RouteStats()).merge(RouteStats.from_dict(data))
+    return merged
+
+
+def reset_snapshots(directory=None):
+    directory = directory or settings.INSTRUMENTATION_DIR
+    removed = 0
+    if os.path.isdir(directory):
+        for entry in os.scandir(directory):
+            if entry.name.endswith('.json'):
+                os.remove(entry.path)
+                removed += 1
+    return removed
+
+
+@atexit.register
+def _flush_at_exit():
+    if _routes and settings.configured:
+        flush()
@@ -0,0 +1,75 @@
+"""
+Django management command to benchmark the catalog pages under a real server.
+
+For each profile the project is started under gunicorn (or uvicorn)
+with that profile's environment and the landing, university and program list
+pages are requested from concurrent client threads. The "default" profile
+opens a connection per request; "persistent" reuses connections with health
+checks; "async" serves the pages from the async catalog views (compare it
+with "default" under uvicorn).
+
+Usage:
+    python manage.py benchmark_catalog
+    python manage.py benchmark_catalog --server uvicorn --concurrency 32 --duration 20
+    python manage.py benchmark_catalog --server uvicorn --profile default --profile async
+    python manage.py benchmark_catalog --env DEBUG=False --env ALLOWED_HOSTS=127.0.0.1
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from core.benchmarking import SERVER_COMMANDS, drive_load, run_server
+
+PROFILES = {
+    'default': {'DB_CONN_MAX_AGE': '0', 'CATALOG_ASYNC_VIEWS': 'False'},
+    'persistent': {'DB_CONN_MAX_AGE': '600', 'DB_CONN_HEALTH_CHECKS': 'True', 'CATALOG_ASYNC_VIEWS': 'False'},
+    'async': {'DB_CONN_MAX_AGE': '0', 'CATALOG_ASYNC_VIEWS': 'True'},
+}
+
+
+class Command(BaseCommand):
+    help = 'Measure catalog requests per second across DB connection and sync/async view profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', choices=sorted(SERVER_COMMANDS), default='gunicorn')
+        parser.add_argument('--workers', type=int, default=2, help='Server worker processes (default: 2)')
+        parser.add_argument('--concurrency', type=int, default=8, help='Client threads (default: 8)')
+        parser.add_argument('--duration', type=float, default=10, help='Measured seconds per profile (default: 10)')
+        parser.add_argument(
+            '--profile',
+            choices=sorted(PROFILES),
+            action='append',
+            help='Profile to run (repeatable, default: all)',
+        )
+        parser.add_argument(
+            '--env',
+            action='append',
+            default=[],
+            metavar='KEY=VALUE',
+            help='Extra environment for the server process (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            extra_env = dict(item.split('=', 1) for item in options['env'])
+        except ValueError:
+            raise CommandError('--env values must look like KEY=VALUE')
+
+        paths = [reverse('core:landing'), reverse('universities:list'), reverse('programs:list')]
+        self.stdout.write(
+            f"{options['server']} x{options['workers']}, {options['concurrency']} client thread(s), "
+            f"{options['duration']:.0f}s per profile: {', '.join(paths)}"
+        )
+        self.stdout.write(f"{'profile':>12} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for name in options['profile'] or list(PROFILES):
+            env = {**PROFILES[name], **extra_env}
+            with run_server(options['server'], options['workers'], env) as base_url:
+                result = drive_load(
+                    [base_url + path for path in paths],
+                    concurrency=options['concurrency'],
+                    duration=options['duration'],
+                )
+            self.stdout.write(
+                f"{name:>12} {result['rps']:>8.1f} {result['p50_ms']:>8.1f} "
+                f"{result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['errors']:>7}"
+            )
+        self.stdout.write(self.style.SUCCESS('Done.'))
@@ -0,0 +1,119 @@
+"""
+Django management command to benchmark login lookups as the student table grows.
+
+Synthetic students are bulk-inserted in steps and, at each size, the command
+times the identifier lookup on its own (email hit, username hit, miss) and a
+full authenticate() call (email hit, miss). Flat numbers across sizes show the
+lookups are index-served.
+
+Usage:
+    python manage.py benchmark_login --sizes 10000,100000,1000000
+    python manage.py benchmark_login --cleanup
+"""
+import statistics
+import time
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.backends import EmailOrUsernameModelBackend
+from students.models import Student
+
+BENCH_PREFIX = 'bench.login'
+BENCH_PASSWORD = 'bench-password-123'
+
+
+class Command(BaseCommand):
+    help = 'Measure login lookup and authenticate() latency at increasing student counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='1000,10000,100000',
+            help='Comma-separated numbers of synthetic students to measure at (default: 1000,10000,100000)',
+        )
+        parser.add_argument(
+            '--samples',
+            type=int,
+            default=20,
+            help='Timed calls per scenario (default: 20)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per bulk_create when growing the table (default: 5000)',
+        )
+        parser.add_argument(
+            '--cleanup',
+            action='store_true',
+            help='Delete the synthetic students and exit',
+        )
+
+    def bench_students(self):
+        return Student.objects.filter(username__startswith=BENCH_PREFIX)
+
+    def grow_to(self, target, batch_size, password_hash):
+        current = self.bench_students().count()
+        while current < target:
+            size = min(batch_size, target - current)
+            with transaction.atomic():
+                Student.objects.bulk_create([
+                    Student(
+                        username=f'{BENCH_PREFIX}{i}',
+                        email=f'{BENCH_PREFIX}{i}@Example.test',
+                        first_name='Bench',
+                        last_name=str(i),
+                        password=password_hash,
+                    )
+                    for i in range(current, current + size)
+                ])
+            current += size
+        return current
+
+    def time_calls(self, func, samples):
+        timings = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):
+        if options['cleanup']:
+            deleted, _ = self.bench_students().delete()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} synthetic student row(s).'))
+            return
+
+        backend = EmailOrUsernameModelBackend()
+        password_hash = make_password(BENCH_PASSWORD)
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        samples = options['samples']
+
+        self.stdout.write(
+            f"{'students':>10} {'email lookup':>13} {'user lookup':>12} {'miss lookup':>12} "
+            f"{'auth email':>11} {'auth miss':>10}   (median ms)"
+        )
+        for size in sizes:
+            total = self.grow_to(size, options['batch_size'], password_hash)
+            probe = total // 2
+            email = f'{BENCH_PREFIX}{probe}@example.TEST'
+            username = f'{BENCH_PREFIX}{probe}'
+            missing = f'{BENCH_PREFIX}-missing@example.test'
+
+            row = [
+                self.time_calls(lambda: backend.get_user_by_identifier(email), samples),
+                self.time_calls(lambda: backend.get_user_by_identifier(username), samples),
+                self.time_calls(lambda: backend.get_user_by_identifier(missing), samples),
+                self.time_calls(lambda: authenticate(username=email, password=BENCH_PASSWORD), samples),
+                self.time_calls(lambda: authenticate(username=missing, password=BENCH_PASSWORD), samples),
+            ]
+            self.stdout.write(f'{total:>10} ' + ' '.join(f'{value:>12.2f}' for value in row))
+
+        self.stdout.write('\nQuery plan for the email lookup:')
+        self.stdout.write(Student.objects.filter_by_email(email).order_by().explain())
+        self.stdout.write(
+            self.style.WARNING('Synthetic students are kept for reuse; run with --cleanup to remove them.')
+        )
@@ -0,0 +1,148 @@
+"""
+Django management command to measure password hashing cost on this machine.
+
+Times the configured parameters of every available hasher, then searches for
+the cost that brings one hash closest to --target-ms and prints the matching
+environment variables. Run it on production hardware: every login (and every
+failed login) pays this cost once.
+
+Usage:
+    python manage.py benchmark_password_hasher
+    python manage.py benchmark_password_hasher --target-ms 150 --algorithm scrypt
+"""
+import hashlib
+import statistics
+import time
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.management.base import BaseCommand, CommandError
+
+from core.hashers import scrypt_memory
+
+BENCH_PASSWORD = 'correct horse battery staple'
+ALGORITHMS = ('argon2', 'scrypt', 'pbkdf2')
+
+
+def is_available(algorithm):
+    if algorithm == 'argon2':
+        return find_spec('argon2') is not None
+    if algorithm == 'scrypt':
+        return hasattr(hashlib, 'scrypt')
+    return algorithm == 'pbkdf2'
+
+
+class Command(BaseCommand):
+    help = 'Time password hashers and recommend cost parameters for a target latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target-ms',
+            type=float,
+            default=250,
+            help='Desired time for one hash in milliseconds (default: 250)',
+        )
+        parser.add_argument(
+            '--algorithm',
+            choices=ALGORITHMS,
+            action='append',
+            help='Hasher to benchmark (repeatable, default: all available)',
+        )
+        parser.add_argument(
+            '--samples',
+            type=int,
+            default=5,
+            help='Hashes timed per parameter set (default: 5)',
+        )
+
+    def time_hash(self, hasher, samples):
+        timings = []
+        for _ in range(samples):
+            salt = hasher.salt()
+            started = time.perf_counter()
+            hasher.encode(BENCH_PASSWORD, salt)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def bench_pbkdf2(self, target, samples):
+        hasher = hashers.PBKDF2PasswordHasher()
+        hasher.iterations = settings.PASSWORD_PBKDF2_ITERATIONS
+        current = self.time_hash(hasher, samples)
+        # PBKDF2 cost is linear in the iteration count
+        hasher.iterations = max(100000, int(round(hasher.iterations * target / current, -4)))
+        return current, self.time_hash(hasher, samples), {
+            'PASSWORD_PBKDF2_ITERATIONS': hasher.iterations,
+        }
+
+    def bench_scrypt(self, target, samples):
+        hasher = hashers.ScryptPasswordHasher()
+        hasher.block_size = settings.PASSWORD_SCRYPT_BLOCK_SIZE
+        hasher.parallelism = settings.PASSWORD_SCRYPT_PARALLELISM
+
+        def measure(work_factor):
+            hasher.work_factor = work_factor
+            hasher.maxmem = 2 * scrypt_memory(work_factor, hasher.block_size, hasher.parallelism)
+            return self.time_hash(hasher, samples)
+
+        current = measure(settings.PASSWORD_SCRYPT_WORK_FACTOR)
+        # The work factor must be a power of two; double it while under target
+        work_factor, elapsed = 2 ** 14, measure(2 ** 14)
+        while elapsed < target and work_factor < 2 ** 20:
+            next_elapsed = measure(work_factor * 2)
+            if abs(next_elapsed - target) > abs(elapsed - target):
+                break
+            work_factor, elapsed = work_factor * 2, next_elapsed
+        return current, elapsed, {'PASSWORD_SCRYPT_WORK_FACTOR': work_factor}
+
+    def bench_argon2(self, target, samples):
+        hasher = hashers.Argon2PasswordHasher()
+        hasher.memory_cost = settings.PASSWORD_ARGON2_MEMORY_COST
+        hasher.parallelism = settings.PASSWORD_ARGON2_PARALLELISM
+
+        def measure(time_cost):
+            hasher.time_cost = time_cost
+            return self.time_hash(hasher, samples)
+
+        current = measure(settings.PASSWORD_ARGON2_TIME_COST)
+        # Memory cost stays as configured; step the number of passes instead
+        time_cost, elapsed = 1, measure(1)
+        while elapsed < target and time_cost < 20:
+            next_elapsed = measure(time_cost + 1)
+            if abs(next_elapsed - target) > abs(elapsed - target):
+                break
+            time_cost, elapsed = time_cost + 1, next_elapsed
+        return current, elapsed, {'PASSWORD_ARGON2_TIME_COST': time_cost}
+
+    def handle(self, *args, **options):
+        target = options['target_ms']
+        samples = options['samples']
+        requested = options['algorithm'] or [a for a in ALGORITHMS if is_available(a)]
+        unavailable = [a for a in requested if not is_available(a)]
+        if unavailable:
+            raise CommandError(f'Not available on this machine: {", ".join(unavailable)}')
+
+        self.stdout.write(f'Target: {target:.0f} ms per hash, {samples} sample(s) each')
+        self.stdout.write(f'Configured hasher: {settings.PASSWORD_HASHER}\n')
+        # Strongest requested hasher first (ALGORITHMS is ordered that way)
+        recommendations = {'PASSWORD_HASHER': min(requested, key=ALGORITHMS.index)}
+        for algorithm in requested:
+            self.stdout.write(f'{algorithm}:')
+            current, tuned, params = getattr(self, f'bench_{algorithm}')(target, samples)
+            self.stdout.write(f'    current settings: {current:.1f} ms')
+            self.stdout.write(
+                f'    recommended: {", ".join(f"{k}={v}" for k, v in params.items())} ({tuned:.1f} ms)'
+            )
+            if algorithm == 'scrypt':
+                memory = scrypt_memory(
+                    params['PASSWORD_SCRYPT_WORK_FACTOR'],
+                    settings.PASSWORD_SCRYPT_BLOCK_SIZE,
+                    settings.PASSWORD_SCRYPT_PARALLELISM,
+                )
+                self.stdout.write(f'    memory per hash: {memory / (1024 * 1024):.0f} MiB')
+            recommendations.update(params)
+
+        self.stdout.write('\nAdd to .env (existing hashes are upgraded on next login):')
+        for key, value in recommendations.items():
+            self.stdout.write(f'    {key}={value}')
+        self.stdout.write(self.style.SUCCESS('Done.'))
@@ -0,0 +1,167 @@
+"""
+Django management command to remove media files no database row references.
+
+Replaced documents and deleted universities leave their files behind in
+MEDIA_ROOT. This walks the media tree with os.scandir (one directory at a time,
+never materialising the full listing) and compares every file against the
+names stored in all FileField/ImageField columns. Derivatives under
+THUMBNAIL_DIR are kept only while their source is referenced, so thumbnails
+and previews of deleted files are collected too.
+
+Usage:
+    python manage.py collect_orphaned_media --dry-run
+    python manage.py collect_orphaned_media --quarantine /var/trikoned/orphans
+    python manage.py collect_orphaned_media
+"""
+import os
+import shutil
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+
+from core.thumbnails import CONTENT_HASH_FIELDS, derivative_names
+
+
+def iter_media_files(root, excluded_dirs=()):
+    """Yield (relative_path, DirEntry) for every file below root, streaming"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if os.path.abspath(entry.path) not in excluded_dirs:
+                            stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield os.path.relpath(entry.path, root).replace(os.sep, '/'), entry
+        except FileNotFoundError:
+            continue
+
+
+def iter_file_fields():
+    """Yield (model, field) for every concrete FileField/ImageField"""
+    for model in apps.get_models():
+        if model._meta.proxy:
+            continue
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                yield model, field
+
+
+class Command(BaseCommand):
+    help = 'Delete or quarantine media files that are not referenced by any FileField/ImageField'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report orphaned files without touching them',
+        )
+        parser.add_argument(
+            '--quarantine',
+            metavar='DIR',
+            help='Move orphaned files into DIR (keeping their relative path) instead of deleting them',
+        )
+        parser.add_argument(
+            '--min-age-hours',
+            type=float,
+            default=24,
+            help='Ignore files modified more recently than this, so in-flight uploads are safe (default: 24)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Rows fetched per database round trip when loading references (default: 5000)',
+        )
+        parser.add_argument(
+            '--exclude',
+            action='append',
+            default=[],
+            metavar='DIR',
+            help='Media subdirectory to skip (repeatable)',
+        )
+        parser.add_argument(
+            '--progress-every',
+            type=int,
+            default=100000,
+            help='Print progress after this many scanned files (default: 100000)',
+        )
+
+    def load_referenced_names(self, chunk_size):
+        referenced = set()
+        for model, field in iter_file_fields():
+            hash_field = CONTENT_HASH_FIELDS.get((model._meta.label, field.name))
+            rows = (
+                model._base_manager.exclude(**{f'{field.name}__isnull': True})
+                .exclude(**{field.name: ''})
+                .values_list(field.name, hash_field or field.name)
+                .iterator(chunk_size=chunk_size)
+            )
+            before = len(referenced)
+            for name, content_hash in rows:
+                referenced.add(name.lstrip('/'))
+                # Derivatives of a referenced source are referenced too
+                fieldfile = field.attr_class(None, field, name)
+                referenced.update(derivative_names(fieldfile, content_hash if hash_field else None))
+            self.stdout.write(
+                f'  {model._meta.label}.{field.name}: {len(referenced) - before} reference(s)'
+            )
+        return referenced
+
+    def handle(self, *args, **options):
+        media_root = os.path.abspath(settings.MEDIA_ROOT)
+        if not os.path.isdir(media_root):
+            raise CommandError(f'MEDIA_ROOT {media_root} does not exist.')
+
+        dry_run = options['dry_run']
+        quarantine = os.path.abspath(options['quarantine']) if options['quarantine'] else None
+        excluded = {os.path.abspath(os.path.join(media_root, d)) for d in options['exclude']}
+        if quarantine:
+            excluded.add(quarantine)
+        cutoff = time.time() - options['min_age_hours'] * 3600
+
+        self.stdout.write('Loading referenced file names...')
+        referenced = self.load_referenced_names(options['chunk_size'])
+
+        scanned = orphaned = orphaned_bytes = 0
+        started = time.monotonic()
+        for relative_path, entry in iter_media_files(media_root, excluded):
+            scanned += 1
+            if scanned % options['progress_every'] == 0:
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f'  scanned {scanned} file(s), {orphaned} orphaned ({scanned / elapsed:.0f} files/s)'
+                )
+
+            if relative_path in referenced:
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_mtime > cutoff:
+                continue
+
+            orphaned += 1
+            orphaned_bytes += stat.st_size
+            if dry_run:
+                self.stdout.write(f'  - {relative_path} ({stat.st_size} bytes)')
+            elif quarantine:
+                destination = os.path.join(quarantine, relative_path)
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                shutil.move(entry.path, destination)
+            else:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+        action = 'Would remove' if dry_run else ('Quarantined' if quarantine else 'Removed')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{action} {orphaned} orphaned file(s) ({orphaned_bytes / (1024 * 1024):.1f} MB) '
+                f'out of {scanned} scanned.'
+            )
+        )
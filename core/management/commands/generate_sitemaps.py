@@ -0,0 +1,46 @@
+"""
+Django management command to write the static sitemaps and robots.txt.
+
+Writes gzip-compressed sitemap sections for the catalog pages (and, with
+SITEMAP_DETAIL_PAGES, universities and active programs), a sitemap index and
+robots.txt into SITEMAP_ROOT, which WhiteNoise serves from the site root. Slugs are streamed from the database,
+so memory stays flat however many URLs there are. Run it on deploy, before
+the web processes start (WhiteNoise only picks up files present at startup),
+and again whenever the catalog changes enough to matter.
+
+Usage:
+    python manage.py generate_sitemaps
+    python manage.py generate_sitemaps --base-url https://www.example.com --output-dir /srv/public
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.sitemaps import write_sitemaps
+
+
+class Command(BaseCommand):
+    help = 'Write gzip-compressed sitemaps, the sitemap index and robots.txt for WhiteNoise to serve'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', help='Scheme and host of the public site (default: SITEMAP_BASE_URL)')
+        parser.add_argument('--output-dir', help='Directory to write into (default: SITEMAP_ROOT)')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Rows fetched per database round trip (default: 2000)',
+        )
+
+    def handle(self, *args, **options):
+        base_url = options['base_url']
+        if base_url and not base_url.startswith(('http://', 'https://')):
+            raise CommandError('--base-url must start with http:// or https://')
+
+        started = time.monotonic()
+        counts = write_sitemaps(options['output_dir'], base_url, chunk_size=options['chunk_size'])
+        for name, count in counts.items():
+            self.stdout.write(f'  {name}: {count} URL(s)')
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote sitemaps for {sum(counts.values())} URL(s) in {time.monotonic() - started:.1f}s.'
+        ))
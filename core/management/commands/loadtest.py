@@ -0,0 +1,308 @@
+"""
+Django management command to load-test the whole stack over HTTP.
+
+Starts the project under gunicorn (or uvicorn) against the configured
+database, which should be seeded with seed_catalog first. Each virtual user
+logs in as a seeded student and then repeats a weighted mix of scenarios:
+the landing page, university and program lists, filtered university lists,
+detail pages, logins from new visitors and complete application wizard
+submissions. Latency percentiles and throughput per endpoint are written as
+JSON with sorted keys, so two runs can be compared with a plain diff.
+
+The wizard scenario creates applications; run against a scratch copy of the
+database.
+
+Usage:
+    python manage.py loadtest --output before.json
+    python manage.py loadtest --server uvicorn --concurrency 32 --duration 60 --output after.json
+    python manage.py loadtest --mix landing=3 --mix apply=0
+    python manage.py loadtest --env DEBUG=False --env ALLOWED_HOSTS=127.0.0.1
+"""
+import json
+from types import SimpleNamespace
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Exists, OuterRef
+from django.urls import reverse
+
+from core.benchmarking import SERVER_COMMANDS, drive_scenarios, run_server
+
+# Scenario name -> default weight
+DEFAULT_MIX = {
+    'landing': 15,
+    'university_list': 12,
+    'university_filter': 12,
+    'university_detail': 15,
+    'program_list': 10,
+    'program_detail': 18,
+    'login': 8,
+    'apply': 10,
+}
+# The benchmark server speaks plain HTTP
+DEFAULT_SERVER_ENV = {'SECURE_SSL_REDIRECT': 'False'}
+TARGET_LIMIT = 500
+UNIVERSITY_TYPES = ['public', 'private', 'federal']
+
+
+def load_targets(password):
+    """Slugs, ids and credentials the scenarios pick from, read before the server starts"""
+    from core.models import Country, Emirate
+    from programs.models import EnglishRequirement, Program
+    from students.models import Student
+    from universities.models import University
+
+    programs = []
+    for program in (
+        Program.objects.filter(is_active=True)
+        .select_related('university', 'type__level')
+        .annotate(needs_english=Exists(EnglishRequirement.objects.filter(program=OuterRef('pk'))))
+        .order_by('slug')[:TARGET_LIMIT]
+    ):
+        level = program.type.level.name.lower()
+        if 'bachelor' in level:
+            application_type = 'undergraduate'
+        elif 'master' in level or 'phd' in level:
+            application_type = 'postgraduate'
+        else:
+            application_type = 'diploma'
+        programs.append(SimpleNamespace(
+            id=str(program.id),
+            slug=program.slug,
+            university_id=str(program.university_id),
+            university_slug=program.university.slug,
+            application_type=application_type,
+            needs_english=program.needs_english,
+        ))
+
+    targets = SimpleNamespace(
+        password=password,
+        universities=list(
+            University.objects.exclude(slug__isnull=True).order_by('slug').values_list('slug', flat=True)[:TARGET_LIMIT]
+        ),
+        programs=[program for program in programs if program.slug and program.university_slug],
+        countries=list(Country.objects.order_by('name').values_list('name', flat=True)),
+        emirates=list(Emirate.objects.order_by('name').values_list('name', flat=True)),
+        # Students without a staff flag, so logins land on the student dashboard
+        usernames=list(
+            Student.objects.filter(is_staff=False, username__startswith='seed-')
+            .order_by('username').values_list('username', flat=True)[:TARGET_LIMIT * 2]
+        ),
+        paths=SimpleNamespace(
+            landing=reverse('core:landing'),
+            universities=reverse('universities:list'),
+            programs=reverse('programs:list'),
+            login=reverse('students:login'),
+            apply=reverse('applications:apply'),
+        ),
+    )
+    if not (targets.universities and targets.programs and targets.usernames):
+        raise CommandError('Nothing to load-test against. Run "manage.py seed_catalog" first.')
+    return targets
+
+
+def log_in(user, targets, username, session=None):
+    """Fetch the login form and post the credentials; True on a redirect to the dashboard"""
+    ok, _ = user.request('login_form', targets.paths.login, session=session)
+    if not ok:
+        return False
+    ok, _ = user.request(
+        'login', targets.paths.login,
+        data={'username': username, 'password': targets.password},
+        expect=(302,), session=session,
+    )
+    return ok
+
+
+def build_scenarios(targets, mix):
+    """Scenario name -> (weight, function(user)) for drive_scenarios()"""
+
+    def landing(user):
+        user.request('landing', targets.paths.landing)
+
+    def university_list(user):
+        user.request('university_list', targets.paths.universities)
+
+    def university_filter(user):
+        rng = user.rng
+        params = rng.choice([
+            {'emirate': rng.choice(targets.emirates)} if targets.emirates else {},
+            {'country': rng.choice(targets.countries)} if targets.countries else {},
+            {'type': rng.choice(UNIVERSITY_TYPES), 'partner': '1'},
+            {'letter': rng.choice('ABCDEFGHMRST')},
+            {'search': rng.choice(['University', 'Technical', 'Global', 'Dubai'])},
+        ])
+        user.request('university_filter', f'{targets.paths.universities}?{urlencode(params)}')
+
+    def university_detail(user):
+        slug = user.rng.choice(targets.universities)
+        user.request('university_detail', reverse('universities:detail', kwargs={'slug': slug}))
+
+    def program_list(user):
+        user.request('program_list', targets.paths.programs)
+
+    def program_detail(user):
+        program = user.rng.choice(targets.programs)
+        user.request('program_detail', reverse('programs:detail', kwargs={'slug': program.slug}))
+
+    def login(user):
+        # A new visitor signing in; the virtual user's own session is untouched
+        log_in(user, targets, user.rng.choice(targets.usernames), session=user.new_session())
+
+    def apply(user):
+        program = user.rng.choice(targets.programs)
+        path = targets.paths.apply
+        steps = [
+            ('apply_form', f'{path}?{urlencode({"program": program.slug, "university": program.university_slug})}',
+             None, (200,)),
+            ('apply_step1', path, {
+                'university': program.university_id,
+                'program': program.id,
+                'application_type': program.application_type,
+                'remarks': 'Load test application',
+                'phone': '+971 50 000 0000',
+                'gender': 'female',
+                'nationality': 'Emirati',
+                'date_of_birth': '2005-01-01',
+                'passport_number': f'LT{user.index:07d}',
+                'passport_expiry': '2035-01-01',
+                'address': 'Dubai',
+            }, (302,)),
+            ('apply_step2', path, {'consent_given': 'on'}, (302,)),
+        ]
+        if program.needs_english:
+            steps.append(('apply_step3', path, {'consent_given': 'on'}, (302,)))
+        for endpoint, step_path, data, expect in steps:
+            ok, _ = user.request(endpoint, step_path, data=data, expect=expect)
+            if not ok:
+                # Start over with a clean wizard state in a new session
+                setup(user)
+                return
+
+    def setup(user):
+        user.session = user.new_session()
+        log_in(user, targets, targets.usernames[user.index % len(targets.usernames)])
+
+    functions = {
+        'landing': landing,
+        'university_list': university_list,
+        'university_filter': university_filter,
+        'university_detail': university_detail,
+        'program_list': program_list,
+        'program_detail': program_detail,
+        'login': login,
+        'apply': apply,
+    }
+    return {name: (weight, functions[name]) for name, weight in mix.items()}, setup
+
+
+def round_floats(value):
+    if isinstance(value, float):
+        return round(value, 2)
+    if isinstance(value, dict):
+        return {key: round_floats(item) for key, item in value.items()}
+    return value
+
+
+class Command(BaseCommand):
+    help = 'Replay a weighted mix of page views, logins and application submissions and report latency as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', choices=sorted(SERVER_COMMANDS), default='gunicorn')
+        parser.add_argument('--workers', type=int, default=2, help='Server worker processes (default: 2)')
+        parser.add_argument('--concurrency', type=int, default=8, help='Virtual users (default: 8)')
+        parser.add_argument('--duration', type=float, default=30, help='Measured seconds (default: 30)')
+        parser.add_argument(
+            '--warmup',
+            type=float,
+            default=5,
+            help='Seconds of load before measuring starts; covers the initial logins (default: 5)',
+        )
+        parser.add_argument('--seed', type=int, default=1, help='Seed for the scenario choices (default: 1)')
+        parser.add_argument(
+            '--mix',
+            action='append',
+            default=[],
+            metavar='SCENARIO=WEIGHT',
+            help=f'Override a scenario weight, 0 disables it (repeatable; scenarios: {", ".join(DEFAULT_MIX)})',
+        )
+        parser.add_argument(
+            '--password',
+            default='seed-password',
+            help='Password of the seeded students (default: seed-password)',
+        )
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+        parser.add_argument(
+            '--env',
+            action='append',
+            default=[],
+            metavar='KEY=VALUE',
+            help='Extra environment for the server process (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            extra_env = dict(item.split('=', 1) for item in options['env'])
+            overrides = {name: float(weight) for name, weight in (item.split('=', 1) for item in options['mix'])}
+        except ValueError:
+            raise CommandError('--env and --mix values must look like KEY=VALUE (with a numeric weight for --mix)')
+        unknown = set(overrides) - set(DEFAULT_MIX)
+        if unknown:
+            raise CommandError(f'Unknown scenario(s): {", ".join(sorted(unknown))}')
+        mix = {**DEFAULT_MIX, **overrides}
+        if not any(weight > 0 for weight in mix.values()):
+            raise CommandError('Every scenario has weight 0.')
+
+        targets = load_targets(options['password'])
+        scenarios, setup = build_scenarios(targets, mix)
+        env = {**DEFAULT_SERVER_ENV, **extra_env}
+        # Progress goes to stderr so stdout stays valid JSON
+        self.stderr.write(
+            f"{options['server']} x{options['workers']}, {options['concurrency']} virtual user(s), "
+            f"{options['warmup']:.0f}s warm-up + {options['duration']:.0f}s measured"
+        )
+        with run_server(options['server'], options['workers'], env) as base_url:
+            result = drive_scenarios(
+                base_url,
+                scenarios,
+                concurrency=options['concurrency'],
+                duration=options['duration'],
+                warmup=options['warmup'],
+                seed=options['seed'],
+                setup=setup,
+            )
+
+        report = round_floats({
+            'config': {
+                'server': options['server'],
+                'workers': options['workers'],
+                'concurrency': options['concurrency'],
+                'duration': options['duration'],
+                'warmup': options['warmup'],
+                'seed': options['seed'],
+                'mix': mix,
+                'env': env,
+            },
+            **result,
+        })
+        self.write_table(report)
+        document = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(document + '\n')
+            self.stderr.write(self.style.SUCCESS(f"Report written to {options['output']}."))
+        else:
+            self.stdout.write(document)
+
+    def write_table(self, report):
+        self.stderr.write(
+            f"{'endpoint':<20} {'reqs':>7} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        )
+        rows = list(report['endpoints'].items()) + [('total', report['total'])]
+        for endpoint, stats in rows:
+            self.stderr.write(
+                f"{endpoint:<20} {stats['requests']:>7} {stats['errors']:>7} {stats['rps']:>8.1f} "
+                f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+            )
+        if report['total']['errors']:
+            self.stderr.write(self.style.WARNING(f"{report['total']['errors']} request(s) failed."))
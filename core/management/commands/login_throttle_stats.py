@@ -0,0 +1,42 @@
+"""
+Django management command to show the login throttle counters.
+
+Reads the monitoring counters kept by core.throttling in the throttle cache.
+With a per-process cache (the local-memory default) the numbers only cover
+the process the command runs in, so point LOGIN_THROTTLE_CACHE at a shared
+cache in production.
+
+Usage:
+    python manage.py login_throttle_stats
+    python manage.py login_throttle_stats --reset
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.throttling import get_throttle_stats, reset_throttle_stats
+
+
+class Command(BaseCommand):
+    help = 'Display (or reset) login throttling counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the counters after displaying them',
+        )
+
+    def handle(self, *args, **options):
+        stats = get_throttle_stats()
+        self.stdout.write(
+            f'Login throttle ({"enabled" if settings.LOGIN_THROTTLE_ENABLED else "disabled"}, '
+            f'cache "{settings.LOGIN_THROTTLE_CACHE}", {settings.LOGIN_THROTTLE_WINDOW}s window)'
+        )
+        for name, value in stats.items():
+            self.stdout.write(f'  {name:>10}: {value}')
+        if stats['checked']:
+            self.stdout.write(f'  {"blocked %":>10}: {stats["blocked"] / stats["checked"]:.1%}')
+
+        if options['reset']:
+            reset_throttle_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
@@ -0,0 +1,85 @@
+"""
+Django management command to show per-URL request metrics.
+
+Merges the histogram snapshots that RequestInstrumentationMiddleware writes
+for each process (every INSTRUMENTATION_FLUSH_INTERVAL seconds) and prints
+request counts, latency percentiles, query counts and budget violations per
+URL name.
+
+Usage:
+    python manage.py request_metrics
+    python manage.py request_metrics --sort queries --limit 10
+    python manage.py request_metrics --json > metrics.json
+    python manage.py request_metrics --reset
+"""
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.instrumentation import load_snapshots, reset_snapshots
+
+SORT_KEYS = {
+    'p95': lambda stats: stats.histograms['total_ms'].percentile(0.95),
+    'count': lambda stats: stats.histograms['total_ms'].count,
+    'queries': lambda stats: stats.histograms['queries'].percentile(0.95),
+    'db': lambda stats: stats.histograms['db_ms'].percentile(0.95),
+    'over-budget': lambda stats: stats.over_budget,
+}
+
+
+def summarize(stats):
+    summary = {'requests': stats.histograms['total_ms'].count, 'over_budget': stats.over_budget}
+    for metric, histogram in stats.histograms.items():
+        summary[metric] = {
+            'mean': round(histogram.mean, 2),
+            'p50': round(histogram.percentile(0.50), 2),
+            'p95': round(histogram.percentile(0.95), 2),
+            'p99': round(histogram.percentile(0.99), 2),
+            'max': round(histogram.max, 2),
+        }
+    return summary
+
+
+class Command(BaseCommand):
+    help = 'Show request latency and query-count percentiles per URL name'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sort', choices=sorted(SORT_KEYS), default='p95', help='Sort order (default: p95)')
+        parser.add_argument('--limit', type=int, default=0, help='Show only the first N URL names')
+        parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Delete the snapshots; running processes start new histograms on their next flush',
+        )
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            removed = reset_snapshots()
+            self.stdout.write(self.style.SUCCESS(f'Removed {removed} snapshot file(s).'))
+            return
+
+        routes = load_snapshots()
+        ordered = sorted(routes.items(), key=lambda item: SORT_KEYS[options['sort']](item[1]), reverse=True)
+        if options['limit']:
+            ordered = ordered[:options['limit']]
+
+        if options['json']:
+            self.stdout.write(json.dumps({name: summarize(stats) for name, stats in ordered}, indent=2))
+            return
+        if not ordered:
+            self.stdout.write(self.style.WARNING('No request metrics recorded yet.'))
+            return
+
+        self.stdout.write(
+            f"{'url name':<34} {'reqs':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'db p95':>8} {'q p50':>6} {'q p95':>6} {'q max':>6} {'over':>5}"
+        )
+        for name, stats in ordered:
+            total, db, queries = (stats.histograms[m] for m in ('total_ms', 'db_ms', 'queries'))
+            self.stdout.write(
+                f'{name[:34]:<34} {total.count:>7} {total.percentile(0.5):>8.1f} {total.percentile(0.95):>8.1f} '
+                f'{total.percentile(0.99):>8.1f} {db.percentile(0.95):>8.1f} {queries.percentile(0.5):>6.0f} '
+                f'{queries.percentile(0.95):>6.0f} {queries.max:>6.0f} {stats.over_budget:>5}'
+            )
+        self.stdout.write('Percentiles are bucket upper bounds (buckets grow by 25%).')
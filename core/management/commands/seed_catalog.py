@@ -0,0 +1,617 @@
+"""
+Django management command to generate a large synthetic data set.
+
+Creates countries, emirates, universities, programs with fees, intakes and
+English requirements, students with test scores and university visits, and
+applications with their status logs. Popularity is skewed the way real
+traffic is: a few universities and programs draw most applications, early
+students apply more often than recent ones, and most applications are still
+pending. Rows are inserted with bulk_create in batches, so a million
+applications take minutes rather than hours.
+
+The output depends only on --seed and --anchor-date (every id, name and date
+comes from the seeded generator), so two runs with the same arguments on
+empty databases produce identical rows. Generated universities and programs
+have slugs starting with "seed-" and students have usernames starting with
+"seed-"; run ``manage.py flush`` to start over.
+
+Usage:
+    python manage.py seed_catalog
+    python manage.py seed_catalog --students 200000 --applications 1000000
+    python manage.py seed_catalog --seed 7 --anchor-date 2025-01-01 --batch-size 10000
+"""
+import datetime
+import math
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from decimal import Decimal
+from itertools import accumulate, islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from core.cache import CATALOG, REFERENCE, invalidate_group
+
+SEED_PREFIX = 'seed-'
+
+COUNTRIES = [
+    ('United Arab Emirates', 'ARE', 'AED', []),
+    ('United Kingdom', 'GBR', 'GBP', ['London', 'Manchester', 'Edinburgh', 'Birmingham']),
+    ('Australia', 'AUS', 'AUD', ['Sydney', 'Melbourne', 'Brisbane', 'Perth']),
+    ('Canada', 'CAN', 'CAD', ['Toronto', 'Vancouver', 'Montreal']),
+    ('United States', 'USA', 'USD', ['Boston', 'Chicago', 'Austin', 'San Diego']),
+    ('Malaysia', 'MYS', 'MYR', ['Kuala Lumpur', 'Penang']),
+    ('Ireland', 'IRL', 'EUR', ['Dublin', 'Cork']),
+    ('New Zealand', 'NZL', 'NZD', ['Auckland', 'Wellington']),
+    ('Germany', 'DEU', 'EUR', ['Berlin', 'Munich']),
+    ('Netherlands', 'NLD', 'EUR', ['Amsterdam', 'Rotterdam']),
+    ('France', 'FRA', 'EUR', ['Paris', 'Lyon']),
+    ('Singapore', 'SGP', 'SGD', ['Singapore']),
+]
+EMIRATES = ['Dubai', 'Abu Dhabi', 'Sharjah', 'Ajman', 'Ras Al Khaimah', 'Fujairah', 'Umm Al Quwain']
+# Share of universities located in the UAE; the rest spread over the other countries
+UAE_SHARE = 0.6
+
+# Level name, application type, share of programs, tuition range per year
+LEVELS = [
+    ("Bachelor's", 'undergraduate', 50, (30000, 90000)),
+    ("Master's", 'postgraduate', 30, (45000, 120000)),
+    ('PhD', 'postgraduate', 8, (50000, 110000)),
+    ('Diploma', 'diploma', 12, (15000, 40000)),
+]
+PROGRAM_TYPES = {
+    "Bachelor's": [('BSc', 4), ('BA', 4), ('BEng', 4), ('BBA', 4)],
+    "Master's": [('MSc', 2), ('MA', 2), ('MBA', 2), ('MEng', 2)],
+    'PhD': [('PhD', 4)],
+    'Diploma': [('Diploma', 1), ('Higher Diploma', 2)],
+}
+SUBJECTS = [
+    'Computer Science', 'Business Administration', 'Mechanical Engineering', 'Civil Engineering',
+    'Electrical Engineering', 'Architecture', 'Accounting', 'Finance', 'Marketing', 'Psychology',
+    'Nursing', 'Pharmacy', 'Medicine', 'Law', 'Mass Communication', 'Interior Design', 'Data Science',
+    'Artificial Intelligence', 'Cyber Security', 'Hospitality Management', 'Aviation Management',
+    'Biotechnology', 'Environmental Science', 'International Relations', 'Education', 'Mathematics',
+    'Physics', 'Chemistry', 'Graphic Design', 'Supply Chain Management',
+]
+UNIVERSITY_KINDS = ['National', 'Global', 'Technical', 'American', 'British', 'Applied', 'Metropolitan', 'Modern']
+FIRST_NAMES = [
+    'Aisha', 'Omar', 'Fatima', 'Ahmed', 'Mariam', 'Yousef', 'Sara', 'Ali', 'Noor', 'Hassan', 'Priya',
+    'Arjun', 'Ananya', 'Rohan', 'Maria', 'James', 'Emily', 'Daniel', 'Chen', 'Mei', 'Ivan', 'Olga',
+]
+LAST_NAMES = [
+    'Al Mansoori', 'Khan', 'Hassan', 'Sharma', 'Patel', 'Smith', 'Garcia', 'Nair', 'Rahman', 'Ali',
+    'Fernandes', 'Kumar', 'Ibrahim', 'Wang', 'Petrov', 'Haddad', 'Menon', 'Brown',
+]
+# Nationality and its weight among students
+NATIONALITIES = [
+    ('Emirati', 20), ('Indian', 25), ('Pakistani', 12), ('Egyptian', 8), ('Filipino', 6), ('Jordanian', 5),
+    ('British', 4), ('Russian', 3), ('Chinese', 3), ('Nigerian', 4), ('Syrian', 5), ('Lebanese', 5),
+]
+# Status and weight; most applications are still waiting for a decision
+STATUSES = [('draft', 12), ('pending', 38), ('under_review', 20), ('accepted', 18), ('rejected', 12)]
+LEAD_QUALITIES = [('high', 20), ('medium', 35), ('low', 45)]
+# Status changes an application went through after being submitted as pending
+STATUS_STEPS = {
+    'pending': [],
+    'under_review': ['under_review'],
+    'accepted': ['under_review', 'accepted'],
+    'rejected': ['under_review', 'rejected'],
+}
+STATUS_MESSAGES = {
+    'pending': 'Application is pending review',
+    'under_review': 'Application is now under review by the TrikonED team',
+    'accepted': 'Congratulations! Your application has been accepted',
+    'rejected': 'Unfortunately, your application was not successful at this time',
+}
+# Test type, overall score range and step
+TEST_SCORES = [('IELTS', 4.5, 9.0, 0.5), ('TOEFL', 60, 120, 1), ('PTE', 40, 90, 1), ('Duolingo', 80, 160, 5)]
+# How far back students, applications and test dates reach
+HISTORY_DAYS = 3 * 365
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def zipf_cum_weights(count, exponent=1.1):
+    """Cumulative weights for random.choices: rank r is picked with weight 1/r^exponent"""
+    return list(accumulate(1 / (rank + 1) ** exponent for rank in range(count)))
+
+
+def weighted(pairs):
+    values, weights = zip(*pairs)
+    return list(values), list(accumulate(weights))
+
+
+def add_years(day, years):
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        # 29 February
+        return day.replace(year=day.year + years, day=28)
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Keep the auto_now/auto_now_add values set on instances passed to bulk_create"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Generate a large, deterministic synthetic catalog with students and applications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+        parser.add_argument(
+            '--anchor-date',
+            type=datetime.date.fromisoformat,
+            help='Date the history ends on, YYYY-MM-DD (default: today)',
+        )
+        parser.add_argument(
+            '--countries',
+            type=int,
+            default=len(COUNTRIES),
+            help=f'Countries, including the UAE (default: {len(COUNTRIES)})',
+        )
+        parser.add_argument('--universities', type=int, default=200, help='Universities (default: 200)')
+        parser.add_argument(
+            '--programs',
+            type=int,
+            default=20,
+            help='Average programs per university; large universities get more (default: 20)',
+        )
+        parser.add_argument('--students', type=int, default=20000, help='Students (default: 20000)')
+        parser.add_argument('--applications', type=int, default=100000, help='Applications (default: 100000)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT (default: 5000)')
+        parser.add_argument(
+            '--password',
+            default='seed-password',
+            help='Password of every generated student (default: seed-password)',
+        )
+
+    def handle(self, *args, **options):
+        from universities.models import University
+
+        if University.objects.filter(slug__startswith=SEED_PREFIX).exists():
+            raise CommandError('The database already holds seeded data. Run "manage.py flush" first.')
+        if options['countries'] < 1 or options['universities'] < 1 or options['programs'] < 1:
+            raise CommandError('--countries, --universities and --programs must be at least 1.')
+        if options['applications'] and options['students'] < 1:
+            raise CommandError('Applications need at least one student.')
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        anchor = options['anchor_date'] or timezone.localdate()
+        tz = timezone.get_current_timezone()
+        self.anchor = anchor
+        self.history_start = datetime.datetime.combine(
+            anchor - datetime.timedelta(days=HISTORY_DAYS), datetime.time(), tzinfo=tz,
+        )
+        self.history_end = datetime.datetime.combine(anchor, datetime.time(), tzinfo=tz)
+
+        started = time.monotonic()
+        countries, emirates = self.seed_places(options['countries'])
+        program_types = self.seed_program_types()
+        universities = self.seed_universities(options['universities'], countries, emirates)
+        programs = self.seed_programs(universities, program_types, options['programs'])
+        students = self.seed_students(options['students'], options['password'])
+        self.seed_test_scores(students)
+        self.seed_visits(students, universities)
+        self.seed_applications(options['applications'], students, programs)
+
+        # bulk_create sends no post_save signals, so bump the cache groups by hand
+        invalidate_group(CATALOG)
+        invalidate_group(REFERENCE)
+        self.stdout.write(self.style.SUCCESS(f'Seeded in {time.monotonic() - started:.1f}s.'))
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def moment(self, fraction):
+        """Datetime at fraction (0-1) of the way through the history"""
+        return self.history_start + (self.history_end - self.history_start) * fraction
+
+    def insert(self, model, objects, **kwargs):
+        """bulk_create objects (any iterable) in batches; returns the row count"""
+        started = time.monotonic()
+        count = 0
+        with explicit_timestamps(model):
+            for batch in chunked(objects, self.batch_size):
+                model.objects.bulk_create(batch, **kwargs)
+                count += len(batch)
+        self.report(model, count, started)
+        return count
+
+    def report(self, model, count, started):
+        elapsed = time.monotonic() - started
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(f'{str(model._meta.verbose_name_plural):<36} {count:>10,} rows {elapsed:>7.1f}s {rate:>10,.0f}/s')
+
+    def seed_places(self, count):
+        """Countries and emirates; existing rows with the same names are reused"""
+        from core.models import Country, Emirate
+
+        rows = list(COUNTRIES[:count])
+        for index in range(count - len(COUNTRIES)):
+            code = 'X' + chr(65 + index // 26 % 26) + chr(65 + index % 26)
+            rows.append((f'Country {code}', code, 'USD', [f'City {code}']))
+        self.insert(Country, (Country(id=self.uuid(), name=name, country_code=code) for name, code, _, _ in rows),
+                    ignore_conflicts=True)
+        by_name = dict(Country.objects.filter(name__in=[row[0] for row in rows]).values_list('name', 'pk'))
+        countries = [
+            {'id': by_name[name], 'code': code, 'currency': currency, 'cities': cities}
+            for name, code, currency, cities in rows
+        ]
+
+        uae = countries[0]['id']
+        self.insert(Emirate, (Emirate(id=self.uuid(), name=name, country_id=uae) for name in EMIRATES),
+                    ignore_conflicts=True)
+        emirates = list(
+            Emirate.objects.filter(country_id=uae, name__in=EMIRATES).order_by('name').values_list('name', 'pk')
+        )
+        return countries, emirates
+
+    def seed_program_types(self):
+        """Program levels and types; existing rows with the same names are reused"""
+        from programs.models import ProgramLevel, ProgramType
+
+        self.insert(ProgramLevel, (ProgramLevel(id=self.uuid(), name=level[0]) for level in LEVELS),
+                    ignore_conflicts=True)
+        levels = dict(ProgramLevel.objects.filter(name__in=[level[0] for level in LEVELS]).values_list('name', 'pk'))
+        self.insert(ProgramType, (
+            ProgramType(
+                id=self.uuid(), name=name, level_id=levels[level], duration=duration,
+                entry_requirements='See university admission requirements',
+            )
+            for level, types in PROGRAM_TYPES.items() for name, duration in types
+        ), ignore_conflicts=True)
+
+        program_types = {}
+        for pk, name, level_name in ProgramType.objects.filter(
+            level__name__in=list(PROGRAM_TYPES), name__in=[name for types in PROGRAM_TYPES.values() for name, _ in types],
+        ).values_list('pk', 'name', 'level__name').order_by('level__name', 'name'):
+            program_types.setdefault(level_name, []).append((pk, name))
+        return program_types
+
+    def seed_universities(self, count, countries, emirates):
+        from universities.models import ContactInfo, University
+
+        rng = self.rng
+        contacts, universities, rows = [], [], []
+        for index in range(count):
+            number = index + 1
+            if len(countries) == 1 or rng.random() < UAE_SHARE:
+                emirate_name, emirate_id = rng.choice(emirates)
+                country = countries[0]
+                city, location = emirate_name, {'location_emirate_id': emirate_id}
+            else:
+                country = rng.choice(countries[1:])
+                city = rng.choice(country['cities'])
+                location = {'country_id': country['id'], 'location_city': city}
+            name = f'{city} {rng.choice(UNIVERSITY_KINDS)} University {number}'
+            contact = ContactInfo(
+                id=self.uuid(),
+                email=f'admissions{number}@seed-university.example',
+                phone=f'+971 4 {number:07d}',
+                website=f'https://university{number}.example',
+            )
+            contacts.append(contact)
+            universities.append(University(
+                id=self.uuid(),
+                name=name,
+                short_name=f'SU{number}',
+                slug=f'{SEED_PREFIX}{slugify(name)}',
+                contact_info_id=contact.id,
+                is_partner=rng.random() < 0.3,
+                description=f'{name} is a {rng.choice(["young", "established", "research-led"])} university in {city}.',
+                established_year=rng.randint(1950, self.anchor.year),
+                accreditation='Accredited by the national higher education authority',
+                facilities='Library, laboratories, sports complex, student housing',
+                ranking=rng.randint(1, 1500) if rng.random() < 0.4 else None,
+                university_type=rng.choices(['private', 'public', 'federal'], weights=[70, 20, 10])[0],
+                **location,
+            ))
+            rows.append({'id': universities[-1].id, 'currency': country['currency']})
+        self.insert(ContactInfo, contacts)
+        self.insert(University, universities)
+        # Popularity rank is independent of creation order
+        rng.shuffle(rows)
+        return rows
+
+    def seed_programs(self, universities, program_types, average):
+        from programs.models import AcademicIntake, EnglishRequirement, Program, TuitionFee
+
+        rng = self.rng
+        levels = [(level, app_type, fee_range) for level, app_type, _, fee_range in LEVELS if level in program_types]
+        level_cum_weights = list(accumulate(weight for level, _, weight, _ in LEVELS if level in program_types))
+        combinations = len(SUBJECTS) * sum(len(types) for types in program_types.values())
+
+        programs, rows = [], []
+        for rank, university in enumerate(universities):
+            # Log-normal program counts: most universities are small, a few are very large
+            count = min(combinations, max(1, round(rng.lognormvariate(math.log(average), 0.6))))
+            names = set()
+            while len(names) < count:
+                level, app_type, fee_range = rng.choices(levels, cum_weights=level_cum_weights)[0]
+                type_id, type_name = rng.choice(program_types[level])
+                name = f'{type_name} {rng.choice(SUBJECTS)}'
+                if name in names:
+                    continue
+                names.add(name)
+                program = Program(
+                    id=self.uuid(),
+                    university_id=university['id'],
+                    type_id=type_id,
+                    name=name,
+                    slug=f'{SEED_PREFIX}{slugify(name)}-{university["id"].hex[:8]}',
+                    description=f'{name} program.',
+                    delivery_type=rng.choices(['on_campus', 'online', 'hybrid'], weights=[75, 10, 15])[0],
+                    department=name.split(' ', 1)[1],
+                    is_active=rng.random() < 0.95,
+                )
+                programs.append(program)
+                rows.append({
+                    'id': program.id,
+                    'university_id': university['id'],
+                    'application_type': app_type,
+                    'fee_range': fee_range,
+                    'currency': university['currency'],
+                    # Popular universities' programs are popular too
+                    'weight': 1 / (rank + 1) / len(names) ** 0.8,
+                })
+        self.insert(Program, programs)
+        del programs
+
+        self.insert(TuitionFee, self.iter_fees(rows))
+        self.insert(AcademicIntake, self.iter_intakes(rows))
+        self.insert(EnglishRequirement, self.iter_english_requirements(rows))
+        return rows
+
+    def iter_fees(self, programs):
+        from programs.models import TuitionFee
+
+        rng = self.rng
+        for program in programs:
+            low, high = program['fee_range']
+            amount = Decimal(rng.randrange(low, high, 500))
+            ranged = rng.random() < 0.2
+            yield TuitionFee(
+                id=self.uuid(),
+                program_id=program['id'],
+                amount=amount,
+                max_amount=amount + Decimal(rng.randrange(2000, 20000, 500)) if ranged else None,
+                currency=program['currency'],
+                per=rng.choices(['year', 'semester', 'credit', 'program'], weights=[70, 15, 5, 10])[0],
+            )
+
+    def iter_intakes(self, programs):
+        from programs.models import AcademicIntake
+
+        rng = self.rng
+        year = self.anchor.year
+        # The previous fall intake plus the next two or three
+        terms = [
+            ('Fall', datetime.date(year - 1, 9, 1)),
+            ('Spring', datetime.date(year, 1, 15)),
+            ('Fall', datetime.date(year, 9, 1)),
+            ('Spring', datetime.date(year + 1, 1, 15)),
+            ('Fall', datetime.date(year + 1, 9, 1)),
+        ]
+        for program in programs:
+            for term, start in terms:
+                if term == 'Spring' and rng.random() < 0.5:
+                    continue
+                yield AcademicIntake(
+                    id=self.uuid(),
+                    program_id=program['id'],
+                    name=f'{term} {start.year}',
+                    start_date=start,
+                    end_date=start + datetime.timedelta(days=270),
+                    application_deadline=start - datetime.timedelta(days=rng.choice([30, 45, 60, 90])),
+                )
+
+    def iter_english_requirements(self, programs):
+        from programs.models import EnglishRequirement
+
+        rng = self.rng
+        for program in programs:
+            postgraduate = program['application_type'] == 'postgraduate'
+            ielts = Decimal('6.5') if postgraduate else rng.choice([Decimal('5.5'), Decimal('6.0'), Decimal('6.5')])
+            yield EnglishRequirement(
+                id=self.uuid(), program_id=program['id'], test_type='IELTS', overall_score=ielts,
+                listening_score=ielts - Decimal('0.5'), reading_score=ielts - Decimal('0.5'),
+                speaking_score=ielts - Decimal('0.5'), writing_score=ielts - Decimal('0.5'),
+            )
+            if rng.random() < 0.5:
+                yield EnglishRequirement(
+                    id=self.uuid(), program_id=program['id'], test_type='TOEFL',
+                    overall_score=Decimal(90 if postgraduate else rng.choice([70, 79, 80])),
+                )
+
+    def seed_students(self, count, password):
+        """Students joined at a steady pace over the history; returns their ids in joining order"""
+        from students.models import Student
+
+        rng = self.rng
+        # Hashing is deliberately slow; every student shares one hash
+        password_hash = make_password(password, salt=f'seed{rng.getrandbits(64):x}')
+        nationalities, nationality_weights = weighted(NATIONALITIES)
+        ids = []
+
+        def iter_students():
+            for index in range(count):
+                first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                username = f'{SEED_PREFIX}{index + 1:07d}'
+                joined = self.moment((index + rng.random()) / count)
+                student = Student(
+                    id=self.uuid(),
+                    username=username,
+                    email=f'{username}@students.example',
+                    password=password_hash,
+                    first_name=first_name,
+                    last_name=last_name,
+                    gender=rng.choice(['male', 'female']),
+                    nationality=rng.choices(nationalities, cum_weights=nationality_weights)[0],
+                    date_of_birth=joined.date() - datetime.timedelta(days=rng.randint(17 * 365, 30 * 365)),
+                    phone=f'+971 5{rng.randint(0, 9)} {rng.randint(0, 9999999):07d}',
+                    email_verified=rng.random() < 0.7,
+                    date_joined=joined,
+                    last_login=joined if rng.random() < 0.8 else None,
+                )
+                ids.append(student.id)
+                yield student
+
+        self.insert(Student, iter_students())
+        return ids
+
+    def iter_test_scores(self, students):
+        from students.models import StudentTestScore
+
+        rng = self.rng
+        for student_id in students:
+            if rng.random() >= 0.6:
+                continue
+            for test_type, low, high, step in rng.sample(TEST_SCORES, rng.choice([1, 1, 1, 2])):
+                steps = int((high - low) / step)
+                # Scores cluster in the upper middle of the range
+                overall = Decimal(str(low + step * round(steps * rng.betavariate(5, 3))))
+                test_date = self.anchor - datetime.timedelta(days=rng.randint(0, HISTORY_DAYS))
+                created = datetime.datetime.combine(test_date, datetime.time(12), tzinfo=self.history_end.tzinfo)
+                section = overall if test_type == 'IELTS' else None
+                yield StudentTestScore(
+                    id=self.uuid(),
+                    student_id=student_id,
+                    test_type=test_type,
+                    test_date=test_date,
+                    validity_years=2,
+                    expiry_date=add_years(test_date, 2),
+                    overall_score=overall,
+                    listening_score=section,
+                    reading_score=section,
+                    speaking_score=section,
+                    writing_score=section,
+                    created_at=created,
+                    updated_at=created,
+                )
+
+    def seed_test_scores(self, students):
+        from students.models import StudentTestScore
+
+        self.insert(StudentTestScore, self.iter_test_scores(students))
+
+    def seed_visits(self, students, universities):
+        from students.models import StudentUniversityVisit
+
+        rng = self.rng
+        cum_weights = zipf_cum_weights(len(universities))
+
+        def iter_visits():
+            for index, student_id in enumerate(students):
+                wanted = min(len(universities), int(rng.expovariate(1 / 3)))
+                visited = set()
+                for university in rng.choices(universities, cum_weights=cum_weights, k=wanted * 2):
+                    if len(visited) == wanted:
+                        break
+                    if university['id'] in visited:
+                        continue
+                    visited.add(university['id'])
+                    first = self.moment((index + rng.random()) / len(students))
+                    latest = min(self.history_end, first + datetime.timedelta(days=rng.expovariate(1 / 20)))
+                    yield StudentUniversityVisit(
+                        id=self.uuid(),
+                        student_id=student_id,
+                        university_id=university['id'],
+                        first_visit_date=first,
+                        latest_visit_date=latest,
+                        visit_count=1 + int(rng.expovariate(1 / 2)),
+                    )
+
+        self.insert(StudentUniversityVisit, iter_visits())
+
+    def seed_applications(self, count, students, programs):
+        from applications.models import Application, ApplicationLog
+
+        rng = self.rng
+        program_cum_weights = list(accumulate(program['weight'] for program in programs))
+        statuses, status_weights = weighted(STATUSES)
+        qualities, quality_weights = weighted(LEAD_QUALITIES)
+        first_number = Application.next_application_number()
+        logs = []
+
+        def iter_applications():
+            # Applications arrive in id order; each picks a program by popularity and
+            # a student who had already joined, so early students apply more often
+            for index in range(count):
+                fraction = (index + rng.random()) / count
+                created = updated = self.moment(fraction)
+                program = rng.choices(programs, cum_weights=program_cum_weights)[0]
+                student_id = students[int(rng.random() * max(1, math.ceil(fraction * len(students))))]
+                status = rng.choices(statuses, cum_weights=status_weights)[0]
+                application_id = self.uuid()
+                history = []
+                if status != 'draft':
+                    history.append(ApplicationLog(
+                        id=self.uuid(), application_id=application_id, timestamp=created,
+                        event='Application Submitted', details='Application submitted online',
+                    ))
+                    previous = 'pending'
+                    for next_status in STATUS_STEPS[status]:
+                        updated = min(self.history_end, updated + datetime.timedelta(days=rng.expovariate(1 / 7)))
+                        history.append(ApplicationLog(
+                            id=self.uuid(), application_id=application_id, timestamp=updated,
+                            event=f'Status Changed: {previous.title()} → {next_status.title()}',
+                            details=STATUS_MESSAGES[next_status],
+                        ))
+                        previous = next_status
+                logs.extend(history)
+                yield Application(
+                    id=application_id,
+                    application_id=f'{first_number + index:06d}',
+                    student_id=student_id,
+                    university_id=program['university_id'],
+                    program_id=program['id'],
+                    application_type=program['application_type'],
+                    status=status,
+                    applied_on=timezone.localdate(created),
+                    consent_given=status != 'draft',
+                    terms_accepted=status != 'draft',
+                    lead_quality=rng.choices(qualities, cum_weights=quality_weights)[0],
+                    created_at=created,
+                    updated_at=updated,
+                    # The log summary record_event() would have kept
+                    last_event=history[-1].event if history else '',
+                    last_event_at=history[-1].timestamp if history else None,
+                    log_count=len(history),
+                )
+
+        started = time.monotonic()
+        application_count = log_count = 0
+        with explicit_timestamps(Application, ApplicationLog):
+            for batch in chunked(iter_applications(), self.batch_size):
+                # The logs of a batch were collected while generating it
+                with transaction.atomic():
+                    Application.objects.bulk_create(batch)
+                    ApplicationLog.objects.bulk_create(logs, batch_size=self.batch_size)
+                application_count += len(batch)
+                log_count += len(logs)
+                logs.clear()
+        self.report(Application, application_count, started)
+        self.report(ApplicationLog, log_count, started)
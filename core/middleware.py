@@ -0,0 +1,208 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from core import instrumentation
+from core.db_routers import begin_request, end_request
+
+logger = logging.getLogger('core.instrumentation')
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoiseMiddleware that can run in an async middleware chain.
+
+    WhiteNoise's own middleware is sync-only, which under ASGI would switch
+    every middleware below it, and the async catalog views, to the sync path.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        # An in-memory lookup, except with autorefresh (DEBUG), which stats files
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            # Opening the file is blocking I/O
+            return await sync_to_async(self.serve, thread_sensitive=False)(static_file, request)
+        return await self.get_response(request)
+
+
+class ReplicaStickinessMiddleware:
+    """Pin a visitor's reads to the primary for a short while after they write.
+
+    Unsafe requests always read from the primary. When a request writes, a
+    short-lived cookie keeps the visitor's following requests on the primary
+    until the replicas have caught up. Disabled when no replicas are set up.
+    The routing state is a context variable, so it follows the request into
+    the worker threads of async views.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = begin_request(self.is_pinned(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = end_request(token)
+        return self.finish(request, response, wrote)
+
+    async def __acall__(self, request):
+        token = begin_request(self.is_pinned(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            wrote = end_request(token)
+        return self.finish(request, response, wrote)
+
+    def is_pinned(self, request):
+        return request.method not in SAFE_METHODS or settings.REPLICA_PIN_COOKIE in request.COOKIES
+
+    def finish(self, request, response, wrote):
+        if wrote:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                secure=request.is_secure(),
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+class QueryCounter:
+    """execute_wrapper that counts queries and their time"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class RequestInstrumentationMiddleware:
+    """Measure queries, DB time, view time and template render time per request.
+
+    Adds a Server-Timing header when INSTRUMENTATION_SERVER_TIMING is set, logs
+    requests over INSTRUMENTATION_BUDGETS and records everything in the
+    per-URL-name histograms of core.instrumentation. Render time only covers
+    TemplateResponses; views that call render() count it as view time.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = QueryCounter()
+        request._instrumentation = {}
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            self.wrap_connections(stack, counter)
+            response = self.get_response(request)
+        return self.finish(request, response, counter, started)
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        request._instrumentation = {}
+        started = time.perf_counter()
+        # Connections are per thread: async views query from the request's
+        # thread-sensitive worker, so the wrappers are installed there
+        stack = ExitStack()
+        await sync_to_async(self.wrap_connections)(stack, counter)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response, counter, started)
+
+    def wrap_connections(self, stack, counter):
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(counter))
+
+    def finish(self, request, response, counter, started):
+        finished = time.perf_counter()
+        marks = request._instrumentation
+        view_started = marks.get('view', started)
+        render_started = marks.get('render')
+        sample = {
+            'total_ms': (finished - started) * 1000,
+            'view_ms': ((render_started or finished) - view_started) * 1000,
+            'render_ms': (finished - render_started) * 1000 if render_started else 0.0,
+            'db_ms': counter.duration * 1000,
+            'queries': counter.count,
+        }
+        match = request.resolver_match
+        url_name = (match.view_name if match else None) or '<unresolved>'
+
+        exceeded = instrumentation.check_budget(url_name, sample)
+        if exceeded:
+            logger.warning(
+                "%s %s (%s) over budget: %s",
+                request.method, request.path, url_name,
+                ', '.join(f'{metric}={value:.0f} > {limit}' for metric, (value, limit) in exceeded.items()),
+            )
+        instrumentation.record(url_name, sample, over_budget=bool(exceeded))
+
+        if settings.INSTRUMENTATION_SERVER_TIMING:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={sample["db_ms"]:.1f};desc="{counter.count} queries"',
+                f'view;dur={sample["view_ms"]:.1f}',
+                f'render;dur={sample["render_ms"]:.1f}',
+                f'total;dur={sample["total_ms"]:.1f}',
+            ])
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._instrumentation['view'] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Called after the view returns and before the response is rendered
+        request._instrumentation['render'] = time.perf_counter()
+        return response
@@ -0,0 +1,87 @@
+"""
+Paginators for very large tables.
+
+Paginator.count runs SELECT COUNT(*) over the whole (filtered) queryset, which
+on PostgreSQL visits every matching row. EstimatedCountPaginator asks the
+planner instead: pg_class.reltuples for an unfiltered table and the EXPLAIN
+row estimate for a filtered one. Small results are still counted exactly, so
+short lists show the right number of pages. Other databases always count.
+
+An estimate can be off either way. A page that falls past the real end (an
+empty page, or EmptyPage when the estimate was low) makes the paginator
+count exactly and serve the page again, or the last page when the number is
+still out of range, rather than failing the request.
+"""
+import json
+
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimate_count(queryset):
+    """Planner row estimate for queryset on PostgreSQL; None elsewhere or if unknown"""
+    query = getattr(queryset, 'query', None)
+    if query is None:
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        if not query.where and not query.distinct and not query.combinator:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # reltuples is -1 until the table has been vacuumed or analyzed
+            return row[0] if row and row[0] >= 0 else None
+        sql, params = query.get_compiler(using=queryset.db).as_sql()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator whose count is the planner's estimate for large results"""
+
+    # Estimates below this are replaced by an exact count
+    exact_threshold = 10000
+    # Whether count is currently the planner's estimate
+    estimated = False
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < self.exact_threshold:
+            return super().count
+        self.estimated = True
+        return estimate
+
+    def page(self, number):
+        try:
+            page = super().page(number)
+        except EmptyPage:
+            # Past the estimated end; the number itself was a valid integer
+            if not self.estimated or int(number) < 1:
+                raise
+        else:
+            # An empty page past the real end of a high estimate
+            if not self.estimated or page.number == 1 or len(page.object_list):
+                return page
+        self.count_exactly()
+        return super().page(min(int(number), self.num_pages))
+
+    def get_elided_page_range(self, number=1, **kwargs):
+        # The admin passes the number it asked page() for, which may have been past the end
+        if self.num_pages and str(number).isdigit():
+            number = min(int(number), self.num_pages)
+        return super().get_elided_page_range(number, **kwargs)
+
+    def count_exactly(self):
+        """Drop the estimate (and the page count derived from it) for an exact count"""
+        self.__dict__['count'] = super().count
+        self.__dict__.pop('num_pages', None)
+        self.estimated = False
@@ -0,0 +1,251 @@
+"""
+Sitemaps for the public catalog, written as static files.
+
+Crawlers that find no sitemap walk the university and program lists with
+every filter combination. generate_sitemaps writes gzip-compressed sitemap
+sections for the pages below (at most Sitemap.limit URLs each), a sitemap
+index and a robots.txt that points at it and keeps filtered list URLs and
+private pages out, all under SITEMAP_ROOT, which WhiteNoise serves from the
+site root (WHITENOISE_ROOT). Items are slugs streamed from
+values_list(...).iterator(), so no model instances are built however large
+the catalog gets.
+
+University and program detail pages still require a login, so their
+sections are only written when SITEMAP_DETAIL_PAGES is set.
+
+WhiteNoise indexes SITEMAP_ROOT when a worker starts: generate the files
+before starting the web processes (or restart them afterwards).
+"""
+import datetime
+import gzip
+import os
+import shutil
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.contrib.sitemaps import Sitemap
+from django.urls import reverse
+
+SECTIONS_DIR = 'sitemaps'
+INDEX_FILENAME = 'sitemap.xml'
+ROBOTS_FILENAME = 'robots.txt'
+
+URLSET_OPEN = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = '</urlset>\n'
+
+
+class SlugSitemap(Sitemap):
+    """Detail pages addressed by slug; items() yields slugs"""
+
+    url_name = None
+
+    def location(self, slug):
+        # reverse() once, then fill in each slug: it dominates the run time otherwise
+        if not hasattr(self, '_url_template'):
+            self._url_template = reverse(self.url_name, args=['slug']).replace('slug', '{}')
+        return self._url_template.format(slug)
+
+
+class StaticViewSitemap(Sitemap):
+    changefreq = 'monthly'
+    priority = 0.5
+
+    def items(self):
+        return ['core:landing', 'core:about', 'core:contact', 'universities:list', 'programs:list']
+
+    def location(self, item):
+        return reverse(item)
+
+
+class UniversitySitemap(SlugSitemap):
+    url_name = 'universities:detail'
+    changefreq = 'weekly'
+    priority = 0.8
+
+    def items(self):
+        from universities.models import University
+        return University.objects.exclude(slug__isnull=True).exclude(slug='').order_by('slug').values_list('slug', flat=True)
+
+
+class ProgramSitemap(SlugSitemap):
+    url_name = 'programs:detail'
+    changefreq = 'weekly'
+    priority = 0.6
+
+    def items(self):
+        from programs.models import Program
+        return (
+            Program.objects.filter(is_active=True).exclude(slug__isnull=True).exclude(slug='')
+            .order_by('slug').values_list('slug', flat=True)
+        )
+
+
+SITEMAPS = {
+    'pages': StaticViewSitemap,
+}
+# Written only with SITEMAP_DETAIL_PAGES, once the pages are public
+DETAIL_SITEMAPS = {
+    'universities': UniversitySitemap,
+    'programs': ProgramSitemap,
+}
+
+# Pages behind a login, kept out of robots.txt crawls (with everything below them)
+PRIVATE_URL_NAMES = [
+    'admin:index', 'students:dashboard', 'students:profile', 'students:upload_document', 'students:test_scores',
+]
+
+
+def get_sitemaps():
+    """Sections to write, by name"""
+    if settings.SITEMAP_DETAIL_PAGES:
+        return {**SITEMAPS, **DETAIL_SITEMAPS}
+    return dict(SITEMAPS)
+
+
+def private_paths():
+    """Paths of the login-protected areas"""
+    paths = [reverse(name) for name in PRIVATE_URL_NAMES]
+    # Application pages: the prefix their ids sit under
+    paths.append(reverse('applications:detail', args=['id']).rsplit('id/', 1)[0])
+    return paths
+
+
+def robots_disallow():
+    """Private areas, and the filtered and paginated variants of the list pages"""
+    return private_paths() + [reverse(name) + '?' for name in ('universities:list', 'programs:list')]
+
+
+def iter_items(sitemap, chunk_size=2000):
+    """Stream a sitemap's items, server-side for querysets"""
+    items = sitemap.items()
+    if hasattr(items, 'iterator'):
+        return items.iterator(chunk_size=chunk_size)
+    return iter(items)
+
+
+def url_entry(base_url, sitemap, item):
+    """One <url> element"""
+    entry = f'<url><loc>{escape(base_url + sitemap.location(item))}</loc>'
+    changefreq = _attribute(sitemap, 'changefreq', item)
+    if changefreq:
+        entry += f'<changefreq>{changefreq}</changefreq>'
+    priority = _attribute(sitemap, 'priority', item)
+    if priority is not None:
+        entry += f'<priority>{priority:.1f}</priority>'
+    return entry + '</url>\n'
+
+
+def _attribute(sitemap, name, item):
+    # Sitemap attributes may be values or methods taking the item
+    value = getattr(sitemap, name, None)
+    return value(item) if callable(value) else value
+
+
+class _TextWriter:
+    """Buffered UTF-8 writes into a GzipFile"""
+
+    def __init__(self, raw, buffer_size=64 * 1024):
+        self.raw = raw
+        self.buffer = []
+        self.size = 0
+        self.buffer_size = buffer_size
+
+    def write(self, text):
+        self.buffer.append(text)
+        self.size += len(text)
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        self.raw.write(''.join(self.buffer).encode('utf-8'))
+        self.buffer, self.size = [], 0
+
+    def close(self):
+        self.flush()
+        self.raw.close()
+
+
+def write_sections(directory, name, sitemap, base_url, chunk_size=2000):
+    """Write <name>-<n>.xml.gz files of at most sitemap.limit URLs; returns (filenames, url count)"""
+    filenames, count, out = [], 0, None
+    for item in iter_items(sitemap, chunk_size):
+        if count % sitemap.limit == 0:
+            if out:
+                out.write(URLSET_CLOSE)
+                out.close()
+            filenames.append(f'{name}-{len(filenames) + 1}.xml.gz')
+            # mtime=0 keeps unchanged sections byte-identical between runs
+            out = _TextWriter(gzip.GzipFile(os.path.join(directory, filenames[-1]), 'wb', mtime=0))
+            out.write(URLSET_OPEN)
+        out.write(url_entry(base_url, sitemap, item))
+        count += 1
+    if out:
+        out.write(URLSET_CLOSE)
+        out.close()
+    return filenames, count
+
+
+def render_index(base_url, filenames, lastmod):
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for filename in filenames:
+        lines.append(
+            f'<sitemap><loc>{escape(f"{base_url}/{SECTIONS_DIR}/{filename}")}</loc>'
+            f'<lastmod>{lastmod}</lastmod></sitemap>'
+        )
+    lines.append('</sitemapindex>')
+    return '\n'.join(lines) + '\n'
+
+
+def render_robots(base_url):
+    lines = ['User-agent: *']
+    lines.extend(f'Disallow: {path}' for path in robots_disallow())
+    lines.append('')
+    lines.append(f'Sitemap: {base_url}/{INDEX_FILENAME}')
+    return '\n'.join(lines) + '\n'
+
+
+def write_sitemaps(root=None, base_url=None, sitemaps=None, chunk_size=2000):
+    """Regenerate every file under root; returns {section name: url count}.
+
+    Sections are written to a fresh directory that replaces the old one,
+    then the index (plain and precompressed for WhiteNoise) and robots.txt,
+    so a crawler never sees an index pointing at missing sections for long.
+    """
+    root = str(root or settings.SITEMAP_ROOT)
+    base_url = (base_url or settings.SITEMAP_BASE_URL).rstrip('/')
+    sitemaps = get_sitemaps() if sitemaps is None else sitemaps
+    os.makedirs(root, exist_ok=True)
+
+    sections = os.path.join(root, SECTIONS_DIR)
+    staging = sections + '.new'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    counts, filenames = {}, []
+    for name, sitemap in sitemaps.items():
+        sitemap = sitemap() if isinstance(sitemap, type) else sitemap
+        written, counts[name] = write_sections(staging, name, sitemap, base_url, chunk_size)
+        filenames.extend(written)
+
+    previous = sections + '.old'
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.isdir(sections):
+        os.rename(sections, previous)
+    os.rename(staging, sections)
+    shutil.rmtree(previous, ignore_errors=True)
+
+    lastmod = datetime.date.today().isoformat()
+    index = render_index(base_url, filenames, lastmod).encode('utf-8')
+    _replace(os.path.join(root, INDEX_FILENAME), index)
+    _replace(os.path.join(root, INDEX_FILENAME + '.gz'), gzip.compress(index, mtime=0))
+    _replace(os.path.join(root, ROBOTS_FILENAME), render_robots(base_url).encode('utf-8'))
+    return counts
+
+
+def _replace(path, content):
+    with open(path + '.tmp', 'wb') as f:
+        f.write(content)
+    os.replace(path + '.tmp', path)
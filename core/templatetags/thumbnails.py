@@ -0,0 +1,19 @@
+from django import template
+
+from core.thumbnails import get_derivative_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def thumbnail_url(fieldfile, alias):
+    """URL of the resized derivative, falling back to the original until it is ready"""
+    if not fieldfile:
+        return ''
+    return get_derivative_url(fieldfile, alias) or fieldfile.url
+
+
+@register.simple_tag
+def document_preview_url(document):
+    """Preview image URL for a StudentDocument, or '' when none is available"""
+    return get_derivative_url(document.file_url, 'preview', document.sha256 or None) or ''
@@ -0,0 +1,141 @@
+"""
+Deterministic data set shared by the test suite.
+
+Every name, date and amount is fixed so query counts and rendered pages are
+the same on every run. Expiry-dependent rows use dates far in the past or
+future so "today" never changes their state.
+"""
+import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from applications.models import Application
+from applications.services import record_event
+from core.models import Country, Curriculum, Emirate
+from programs.models import AcademicIntake, EnglishRequirement, Program, ProgramLevel, ProgramType, TuitionFee
+from students.models import Student, StudentDocument, StudentTestScore
+from universities.models import (
+    ContactInfo, EnrollmentStat, Scholarship, University, UniversityCurriculum, VisaSponsorship,
+)
+
+UNIVERSITY_COUNT = 4
+PROGRAMS_PER_UNIVERSITY = 3
+PASSWORD = 'fixture-password'
+# Process-local stand-ins for both cache aliases, cleared before every test
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-default'},
+    'local': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-local'},
+}
+
+
+def build_fixture():
+    """Create the data set and return the interesting objects"""
+    uae = Country.objects.create(name='United Arab Emirates', country_code='ARE')
+    dubai = Emirate.objects.create(name='Dubai', country=uae)
+    sharjah = Emirate.objects.create(name='Sharjah', country=uae)
+    ib = Curriculum.objects.create(name='IB', description='International Baccalaureate', country_origin='Switzerland')
+    bachelor = ProgramLevel.objects.create(name="Bachelor's")
+    master = ProgramLevel.objects.create(name="Master's")
+    program_types = [
+        ProgramType.objects.create(name='BSc Computer Science', level=bachelor, duration=4, entry_requirements='Grade 12'),
+        ProgramType.objects.create(name='MBA', level=master, duration=2, entry_requirements='Bachelor degree'),
+    ]
+
+    universities, programs = [], []
+    for index in range(UNIVERSITY_COUNT):
+        contact = ContactInfo.objects.create(email=f'admissions{index}@uni.test', phone=f'+971 4 000 000{index}')
+        university = University.objects.create(
+            name=f'Fixture University {index}',
+            short_name=f'FU{index}',
+            location_emirate=dubai if index % 2 == 0 else sharjah,
+            contact_info=contact,
+            description='A university used by the test suite.',
+            established_year=1990 + index,
+            accreditation='CAA',
+            facilities='Library, labs',
+            is_partner=index % 2 == 0,
+        )
+        universities.append(university)
+        UniversityCurriculum.objects.create(university=university, curriculum=ib)
+        Scholarship.objects.create(
+            university=university, name='Merit', amount=Decimal('5000.00'),
+            eligibility='GPA 3.5+', coverage='Tuition',
+        )
+        VisaSponsorship.objects.create(university=university, details='Student visa provided')
+        for year in (2021, 2022):
+            EnrollmentStat.objects.create(
+                university=university, academic_year=f'{year}-{year + 1}', total_enrollment=1000 + year,
+            )
+        for number in range(PROGRAMS_PER_UNIVERSITY):
+            program = Program.objects.create(
+                university=university,
+                type=program_types[number % len(program_types)],
+                name=f'Program {index}-{number}',
+                description='A program used by the test suite.',
+            )
+            TuitionFee.objects.create(program=program, amount=Decimal('45000.00'))
+            AcademicIntake.objects.create(
+                program=program, name='Fall 2099',
+                start_date=datetime.date(2099, 9, 1), end_date=datetime.date(2100, 6, 30),
+            )
+            EnglishRequirement.objects.create(program=program, overall_score=Decimal('6.5'))
+            programs.append(program)
+
+    student = Student.objects.create_user(
+        'fixture.student', 'student@fixture.test', PASSWORD, first_name='Fixture', last_name='Student',
+    )
+    staff = Student.objects.create_superuser('fixture.staff', 'staff@fixture.test', PASSWORD)
+
+    applications = []
+    statuses = ['draft', 'pending', 'accepted', 'rejected']
+    for index, program in enumerate(programs[:len(statuses)]):
+        application = Application.objects.create(
+            student=student, university=program.university, program=program,
+            application_type='undergraduate', status=statuses[index],
+        )
+        for event in ('Application submitted', 'Documents reviewed', 'Decision made'):
+            record_event(application, event)
+        applications.append(application)
+
+    documents = [
+        StudentDocument.objects.create(student=student, doc_type='passport', file_url=f'documents/fixture/passport{n}.pdf')
+        for n in range(3)
+    ]
+    scores = [
+        StudentTestScore.objects.create(student=student, test_type='IELTS', test_date=datetime.date(2000, 1, 1)),
+        StudentTestScore.objects.create(student=student, test_type='TOEFL', test_date=datetime.date(2099, 1, 1)),
+    ]
+
+    return SimpleNamespace(
+        country=uae, emirates=[dubai, sharjah], universities=universities, programs=programs,
+        student=student, staff=staff, applications=applications, documents=documents, scores=scores,
+    )
+
+
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+)
+class FastTestCase(TestCase):
+    """TestCase with cheap password hashing and static files that need no manifest"""
+
+
+class FixtureTestCase(FastTestCase):
+    """FastTestCase with the shared data set as cls.fixture, built once per class"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.fixture = build_fixture()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CachedFixtureTestCase(FixtureTestCase):
+    """FixtureTestCase for code that reads the cache; every test starts cold"""
+
+    def setUp(self):
+        super().setUp()
+        for cache in caches.all():
+            cache.clear()
@@ -0,0 +1,116 @@
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.core.paginator import Page, Paginator
+from django.db.models import Model, QuerySet
+from django.test import AsyncClient, Client, override_settings
+from django.urls import include, path
+
+from config.urls import urlpatterns as site_urlpatterns
+from core import views as core_views
+from core.tests.fixtures import PASSWORD, CachedFixtureTestCase
+from programs import views as program_views
+from universities import views as university_views
+
+# The site as configured, plus every async variant under /async/
+urlpatterns = [
+    path('async/', include([
+        path('', core_views.AsyncLandingPageView.as_view(), name='async-landing'),
+        path('universities/', university_views.AsyncUniversityListView.as_view()),
+        path('universities/<slug:slug>/', university_views.AsyncUniversityDetailView.as_view()),
+        path('programs/', program_views.AsyncProgramListView.as_view()),
+        path('programs/<slug:slug>/', program_views.AsyncProgramDetailView.as_view()),
+    ])),
+    *site_urlpatterns,
+]
+
+LANDING_KEYS = [
+    'featured_universities', 'total_universities', 'total_partner_universities', 'total_programs',
+    'total_student_help', 'total_success_rate',
+]
+LIST_KEYS = ['page_obj', 'paginator', 'is_paginated']
+UNIVERSITY_LIST_KEYS = LIST_KEYS + [
+    'universities', 'countries', 'emirates', 'selected_country', 'filtered_emirates', 'alphabet', 'current_letter',
+]
+UNIVERSITY_DETAIL_KEYS = [
+    'university', 'active_tab', 'latest_stats', 'enrollment_history', 'available_levels', 'selected_level',
+    'filtered_programs',
+]
+PROGRAM_DETAIL_KEYS = ['program', 'next_intake', 'intake', 'tuition_fee', 'english_requirement']
+
+
+def comparable(value):
+    """Context values reduced to primary keys, so sync and async results compare"""
+    if isinstance(value, Model):
+        return value.pk
+    if isinstance(value, Page):
+        return value.number, comparable(value.object_list)
+    if isinstance(value, Paginator):
+        return value.count, value.num_pages
+    if isinstance(value, (QuerySet, list, tuple)):
+        return [comparable(item) for item in value]
+    return value
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewParityTests(CachedFixtureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sync_client = Client()
+        self.async_client = AsyncClient()
+        self.sync_client.login(username=self.fixture.student.username, password=PASSWORD)
+        self.async_client.cookies = self.sync_client.cookies
+
+    @async_to_sync
+    async def async_get(self, url):
+        return await self.async_client.get(url)
+
+    def assertParity(self, path, keys, status=200):
+        """GET path from the sync view and /async + path from its async variant; compare keys"""
+        responses = []
+        for get, url in ((self.sync_client.get, path), (self.async_get, '/async' + path)):
+            # Both variants share cache keys; each must build its own context
+            for cache in caches.all():
+                cache.clear()
+            response = get(url)
+            self.assertEqual(response.status_code, status, url)
+            responses.append(response)
+        if status != 200:
+            return
+        sync, asynchronous = (response.context for response in responses)
+        for key in keys:
+            with self.subTest(path=path, key=key):
+                self.assertIn(key, asynchronous)
+                self.assertEqual(comparable(asynchronous[key]), comparable(sync[key]))
+
+    def test_landing(self):
+        self.assertParity('/', LANDING_KEYS)
+
+    def test_university_list(self):
+        for query in ('', '?page=last', '?country=United+Arab+Emirates', '?letter=F&partner=1', '?emirate=Nowhere'):
+            self.assertParity('/universities/' + query, UNIVERSITY_LIST_KEYS)
+        self.assertParity('/universities/?page=9', [], status=404)
+
+    def test_university_detail(self):
+        slug = self.fixture.universities[0].slug
+        self.assertParity(f'/universities/{slug}/', UNIVERSITY_DETAIL_KEYS[:4])
+        for query in ('?tab=programs', "?tab=programs&level=Master's"):
+            self.assertParity(f'/universities/{slug}/{query}', UNIVERSITY_DETAIL_KEYS)
+        self.assertParity('/universities/no-such-university/', [], status=404)
+
+    def test_program_list(self):
+        for query in ('', '?page=last'):
+            self.assertParity('/programs/' + query, LIST_KEYS + ['programs'])
+
+    def test_program_detail(self):
+        self.assertParity(f'/programs/{self.fixture.programs[0].slug}/', PROGRAM_DETAIL_KEYS)
+        self.assertParity('/programs/no-such-program/', [], status=404)
+
+    def test_login_required_redirects_alike(self):
+        self.sync_client.logout()
+        self.async_client.cookies = self.sync_client.cookies
+        slug = self.fixture.programs[0].slug
+        sync_response = self.sync_client.get(f'/programs/{slug}/')
+        async_response = self.async_get(f'/async/programs/{slug}/')
+        self.assertEqual(sync_response.status_code, 302)
+        self.assertEqual(async_response.status_code, 302)
+        self.assertEqual(sync_response['Location'].split('?')[0], async_response['Location'].split('?')[0])
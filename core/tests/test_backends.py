@@ -0,0 +1,34 @@
+from unittest import mock
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import check_password, make_password
+from django.test import TestCase, override_settings
+
+from core.backends import reset_dummy_password
+from students.models import Student
+
+
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher', 'core.hashers.TunedPBKDF2PasswordHasher'],
+    PASSWORD_PBKDF2_ITERATIONS=1000,
+)
+class UnknownIdentifierTests(TestCase):
+    def setUp(self):
+        # The dummy is built once per process
+        reset_dummy_password(setting='PASSWORD_HASHERS')
+
+    def dummy_checked(self):
+        with mock.patch('core.backends.check_password', wraps=check_password) as checked:
+            self.assertIsNone(authenticate(username='nobody@example.test', password='guess'))
+        checked.assert_called_once()
+        return checked.call_args.args[1]
+
+    def test_checks_a_hash_of_the_stored_algorithm(self):
+        for index in range(3):
+            Student.objects.create_user(username=f'legacy{index}', email=f'legacy{index}@example.test')
+        # Hashes from before the default changed
+        Student.objects.update(password=make_password('secret', hasher='pbkdf2_sha256'))
+        self.assertTrue(self.dummy_checked().startswith('pbkdf2_sha256$1000$'))
+
+    def test_default_hasher_without_users(self):
+        self.assertTrue(self.dummy_checked().startswith('md5$'))
@@ -0,0 +1,38 @@
+from applications.models import ApplicationLog
+from core.cache import STUDENT_SCOPED_MODELS
+from core.tests.fixtures import CachedFixtureTestCase
+from students.models import Student
+
+
+class InvalidationTests(CachedFixtureTestCase):
+    def landing_stats(self):
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        return {key: response.context[key] for key in ('total_student_help', 'total_success_rate')}
+
+    def test_landing_stats_follow_students_and_applications(self):
+        self.assertEqual(self.landing_stats(), {'total_student_help': 2, 'total_success_rate': 25})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            student = Student.objects.create_user(username='new', email='new@fixture.test', password='x')
+        self.assertEqual(self.landing_stats()['total_student_help'], 3)
+
+        # Other student saves (last_login on every login) keep the entry
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            student.save()
+        self.assertEqual(len(callbacks), 1)  # the student's own dashboard only
+
+        with self.captureOnCommitCallbacks(execute=True):
+            application = self.fixture.applications[0]
+            application.status = 'accepted'
+            application.save()
+        self.assertEqual(self.landing_stats(), {'total_student_help': 3, 'total_success_rate': 50})
+
+    def test_log_scope_reads_the_loaded_application(self):
+        scope = STUDENT_SCOPED_MODELS['applications.ApplicationLog']
+        log = ApplicationLog.objects.select_related('application').first()
+        with self.assertNumQueries(0):
+            self.assertEqual(scope(log), self.fixture.student.pk)
+        log = ApplicationLog.objects.first()
+        with self.assertNumQueries(1):
+            self.assertEqual(scope(log), self.fixture.student.pk)
@@ -0,0 +1,86 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from core import thumbnails
+from core.tests.fixtures import FixtureTestCase
+from students.models import StudentDocument
+
+DAY = 24 * 3600
+
+
+class CollectOrphanedMediaTests(FixtureTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, THUMBNAIL_FORMAT='WEBP')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        university = self.fixture.universities[0]
+        university.logo = 'university_logos/kept.png'
+        university.save(update_fields=['logo'])
+        self.document = self.fixture.documents[0]
+        StudentDocument.objects.filter(pk=self.document.pk).update(sha256='d' * 64)
+
+        self.kept = self.create('university_logos/kept.png')
+        self.kept_logo = self.create(thumbnails.derivative_name(thumbnails.source_hash(university.logo), 'logo'))
+        self.kept_preview = self.create(thumbnails.derivative_name('d' * 64, 'preview'))
+        self.orphan = self.create('university_logos/replaced.png')
+        self.orphan_logo = self.create(thumbnails.derivative_name('e' * 64, 'logo'))
+
+    def create(self, name, age=2 * DAY):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b'x' * 10)
+        modified = time.time() - age
+        os.utime(path, (modified, modified))
+        return name
+
+    def exists(self, name, root=None):
+        return os.path.exists(os.path.join(root or self.media_root, name))
+
+    def collect(self, *args):
+        out = io.StringIO()
+        call_command('collect_orphaned_media', *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_only_reports(self):
+        output = self.collect('--dry-run')
+        self.assertIn(f'  - {self.orphan} (10 bytes)', output)
+        self.assertIn(f'  - {self.orphan_logo} (10 bytes)', output)
+        self.assertIn('Would remove 2 orphaned file(s)', output)
+        self.assertTrue(self.exists(self.orphan))
+        self.assertTrue(self.exists(self.orphan_logo))
+
+    def test_removes_orphans_and_derivatives_of_deleted_sources(self):
+        self.assertIn('Removed 2 orphaned file(s) (0.0 MB) out of 5 scanned.', self.collect())
+        self.assertFalse(self.exists(self.orphan))
+        self.assertFalse(self.exists(self.orphan_logo))
+        for name in (self.kept, self.kept_logo, self.kept_preview):
+            self.assertTrue(self.exists(name), name)
+
+    def test_quarantine_keeps_the_relative_path(self):
+        quarantine = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, quarantine)
+        self.assertIn('Quarantined 2 orphaned file(s)', self.collect('--quarantine', quarantine))
+        self.assertFalse(self.exists(self.orphan))
+        self.assertTrue(self.exists(self.orphan, quarantine))
+        self.assertTrue(self.exists(self.orphan_logo, quarantine))
+
+    def test_recent_files_are_left_for_in_flight_uploads(self):
+        fresh = self.create('documents/uploading.pdf', age=60)
+        self.assertIn('Removed 2 orphaned file(s)', self.collect())
+        self.assertTrue(self.exists(fresh))
+        self.assertIn('Removed 1 orphaned file(s)', self.collect('--min-age-hours', '0'))
+        self.assertFalse(self.exists(fresh))
+
+    def test_excluded_directories_are_not_scanned(self):
+        self.assertIn('Removed 1 orphaned file(s)', self.collect('--exclude', 'thumbnails'))
+        self.assertTrue(self.exists(self.orphan_logo))
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, TransactionTestCase, override_settings
+
+from core import db_routers
+from core.db_routers import use_primary
+from core.middleware import ReplicaStickinessMiddleware
+from core.models import Country
+from students.models import Student
+
+REPLICA = 'replica'
+
+
+@override_settings(
+    DATABASE_ROUTERS=['core.db_routers.PrimaryReplicaRouter'],
+    DATABASE_REPLICAS=[REPLICA],
+    REPLICA_PIN_COOKIE='db_primary',
+    REPLICA_STICKY_SECONDS=5,
+    REPLICA_RETRY_SECONDS=30,
+)
+class PrimaryReplicaRoutingTests(TransactionTestCase):
+    """The test database is the primary; the replica is a second SQLite file.
+
+    TransactionTestCase because the router sends every read inside an atomic
+    block on the primary to the primary.
+    """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.add_replica(os.path.join(directory, 'replica.sqlite3'))
+        with connections[REPLICA].schema_editor() as editor:
+            editor.create_model(Country)
+        # A row only the replica has, so reads show where they went
+        Country.objects.using(REPLICA).create(name='Replica only', country_code='RPL')
+        Country.objects.create(name='United Arab Emirates', country_code='ARE')
+        db_routers._replica_down_until.clear()
+        self.addCleanup(db_routers._replica_down_until.clear)
+
+    def add_replica(self, name):
+        connections.settings[REPLICA] = {**connections.settings[DEFAULT_DB_ALIAS], 'NAME': name, 'TEST': {}}
+        self.addCleanup(self.remove_replica)
+
+    def remove_replica(self):
+        if REPLICA in connections.settings:
+            connections[REPLICA].close()
+            del connections[REPLICA]
+            del connections.settings[REPLICA]
+
+    def read_names(self):
+        return list(Country.objects.values_list('name', flat=True))
+
+    def test_catalog_reads_use_the_replica_and_writes_the_primary(self):
+        self.assertEqual(self.read_names(), ['Replica only'])
+        self.assertEqual(router.db_for_write(Country), DEFAULT_DB_ALIAS)
+        # Other apps always read from the primary
+        self.assertEqual(router.db_for_read(Student), DEFAULT_DB_ALIAS)
+        with use_primary():
+            self.assertEqual(self.read_names(), ['United Arab Emirates'])
+
+    def test_requests_stick_to_the_primary_after_a_write(self):
+        def view(request):
+            if request.method == 'POST':
+                Country.objects.create(name='Oman', country_code='OMN')
+            return HttpResponse(', '.join(self.read_names()))
+
+        middleware = ReplicaStickinessMiddleware(view)
+        factory = RequestFactory()
+        response = middleware(factory.get('/'))
+        self.assertEqual(response.content, b'Replica only')
+        self.assertNotIn('db_primary', response.cookies)
+
+        # The writing request reads its own writes, and pins the visitor
+        response = middleware(factory.post('/'))
+        self.assertEqual(response.content, b'Oman, United Arab Emirates')
+        cookie = response.cookies['db_primary']
+        self.assertEqual(cookie['max-age'], 5)
+
+        request = factory.get('/')
+        request.COOKIES['db_primary'] = cookie.value
+        self.assertEqual(middleware(request).content, b'Oman, United Arab Emirates')
+        # Without the cookie (it expired) reads go back to the replica
+        self.assertEqual(middleware(factory.get('/')).content, b'Replica only')
+
+    def test_unreachable_replica_falls_back_to_the_primary(self):
+        self.remove_replica()
+        self.add_replica(os.path.join(tempfile.gettempdir(), 'missing-directory', 'replica.sqlite3'))
+        with self.assertLogs('core.db_routers', 'WARNING'):
+            self.assertEqual(self.read_names(), ['United Arab Emirates'])
+        self.assertIn(REPLICA, db_routers._replica_down_until)
+        # Skipped without another connection attempt until the retry time
+        with self.assertNoLogs('core.db_routers', 'WARNING'):
+            self.assertEqual(self.read_names(), ['United Arab Emirates'])
@@ -0,0 +1,33 @@
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from students.models import Student
+
+
+@override_settings(
+    PASSWORD_HASHERS=['core.hashers.TunedPBKDF2PasswordHasher', 'django.contrib.auth.hashers.MD5PasswordHasher'],
+    PASSWORD_PBKDF2_ITERATIONS=2000,
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+    LOGIN_THROTTLE_ENABLED=False,
+)
+class RehashOnLoginTests(TestCase):
+    def login_with(self, encoded):
+        student = Student.objects.create_user(username='returning', email='returning@example.test')
+        Student.objects.filter(pk=student.pk).update(password=encoded)
+        response = self.client.post(
+            reverse('students:login'), {'username': 'returning@example.test', 'password': 'secret'},
+        )
+        self.assertRedirects(response, reverse('students:dashboard'), fetch_redirect_response=False)
+        student.refresh_from_db()
+        return student.password
+
+    def test_cheaper_hash_is_reencoded_with_the_current_cost(self):
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+            encoded = make_password('secret')
+        self.assertTrue(identify_hasher(encoded).must_update(encoded))
+        self.assertTrue(self.login_with(encoded).startswith('pbkdf2_sha256$2000$'))
+
+    def test_other_hasher_is_replaced_by_the_preferred_one(self):
+        stored = self.login_with(make_password('secret', hasher='md5'))
+        self.assertTrue(stored.startswith('pbkdf2_sha256$2000$'))
@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from core.middleware import ReplicaStickinessMiddleware, RequestInstrumentationMiddleware, StaticFilesMiddleware
+from core.models import Country
+
+
+@override_settings(INSTRUMENTATION_ENABLED=True, INSTRUMENTATION_SERVER_TIMING=True, DATABASE_REPLICAS=['replica'])
+class AsyncMiddlewareTests(TestCase):
+    async def test_async_chain_stays_async_and_counts_queries(self):
+        async def view(request):
+            await Country.objects.acount()
+            await Country.objects.filter(name='UAE').aexists()
+            return HttpResponse('ok')
+
+        middleware = RequestInstrumentationMiddleware(ReplicaStickinessMiddleware(view))
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertTrue(iscoroutinefunction(middleware.get_response))
+        response = await middleware(RequestFactory().get('/'))
+        self.assertIn('desc="2 queries"', response['Server-Timing'])
+
+    def test_sync_chain(self):
+        def view(request):
+            Country.objects.count()
+            return HttpResponse('ok')
+
+        middleware = RequestInstrumentationMiddleware(ReplicaStickinessMiddleware(view))
+        self.assertFalse(iscoroutinefunction(middleware))
+        response = middleware(RequestFactory().get('/'))
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+
+    async def test_static_files_in_an_async_chain(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        with open(os.path.join(root, 'robots.txt'), 'w') as f:
+            f.write('User-agent: *\n')
+
+        async def view(request):
+            return HttpResponse('view')
+
+        with self.settings(WHITENOISE_ROOT=root, WHITENOISE_AUTOREFRESH=False):
+            middleware = StaticFilesMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = await middleware(RequestFactory().get('/robots.txt'))
+        self.assertEqual(b''.join(response.streaming_content), b'User-agent: *\n')
+        response = await middleware(RequestFactory().get('/about/'))
+        self.assertEqual(response.content, b'view')
+
+    def test_static_files_are_not_instrumented(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        with open(os.path.join(root, 'robots.txt'), 'w') as f:
+            f.write('User-agent: *\n')
+
+        with self.settings(
+            WHITENOISE_ROOT=root,
+            STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+        ), mock.patch('core.instrumentation.record') as record:
+            self.assertEqual(self.client.get('/robots.txt').status_code, 200)
+            record.assert_not_called()
+            self.client.get('/about/')
+            self.assertEqual(record.call_args.args[0], 'core:about')
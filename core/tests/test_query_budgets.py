@@ -0,0 +1,198 @@
+"""
+Query-count and render-time budgets for every URL in config/urls.py.
+
+Each URL is requested as an anonymous visitor, a student and a staff user
+against the deterministic fixture, with empty caches, and must stay within
+the budget below. A new URL fails until it gets a row here; a view that
+starts issuing more queries (a lazy lookup in a template, a missing
+select_related) fails until it is fixed or its budget is raised on purpose.
+"""
+import shutil
+import tempfile
+import time
+
+from django.contrib import admin
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from core.tests.fixtures import CachedFixtureTestCase
+
+ROLES = ('anonymous', 'student', 'staff')
+# Render-time ceiling (ms) for rows that don't set one; generous for slow CI
+DEFAULT_MAX_MS = 1500
+
+# URL name: maximum queries per role, and optionally a render-time ceiling.
+# Anonymous requests to login-protected pages are redirects.
+BUDGETS = {
+    'core:landing': {'anonymous': 7, 'student': 9, 'staff': 9},
+    'core:about': {'anonymous': 0, 'student': 2, 'staff': 2},
+    'core:contact': {'anonymous': 0, 'student': 2, 'staff': 2},
+    'universities:list': {'anonymous': 5, 'student': 7, 'staff': 7},
+    'universities:detail': {'anonymous': 0, 'student': 16, 'staff': 16},
+    'programs:list': {'anonymous': 2, 'student': 4, 'staff': 4},
+    'programs:detail': {'anonymous': 0, 'student': 7, 'staff': 7},
+    'students:login': {'anonymous': 0, 'student': 2, 'staff': 2},
+    'students:register': {'anonymous': 0, 'student': 2, 'staff': 2},
+    'students:logout': {'anonymous': 0, 'student': 4, 'staff': 4},
+    'students:dashboard': {'anonymous': 0, 'student': 7, 'staff': 6},
+    'students:profile': {'anonymous': 0, 'student': 2, 'staff': 2},
+    'students:upload_document': {'anonymous': 0, 'student': 5, 'staff': 5},
+    'students:test_scores': {'anonymous': 0, 'student': 3, 'staff': 3},
+    'students:add_test_score': {'anonymous': 0, 'student': 2, 'staff': 2},
+    'students:edit_test_score': {'anonymous': 0, 'student': 3, 'staff': 3},
+    'students:delete_test_score': {'anonymous': 0, 'student': 2, 'staff': 2},
+    'applications:create': {'anonymous': 0, 'student': 4, 'staff': 3},
+    'applications:apply': {'anonymous': 0, 'student': 3, 'staff': 3},
+    # Timelines read the archived summaries too (one query on detail and pdf)
+    'applications:detail': {'anonymous': 0, 'student': 7, 'staff': 3},
+    # Deleting a draft cascades to the notification outbox and the log archive
+    # (one DELETE each) besides the log itself
+    'applications:cancel': {'anonymous': 0, 'student': 11, 'staff': 3},
+    'applications:pdf': {'anonymous': 0, 'student': 2, 'staff': 14, 'ms': 3000},
+    # Admin pages are checked for staff only; rows apply to every model
+    'admin:index': {'staff': 3},
+    'admin:changelist': {'staff': 17},
+    'admin:add': {'staff': 21},
+    'admin:change': {'staff': 24},
+}
+
+# Views that change data only on POST, budgeted separately from their GET row
+POST_BUDGETS = {
+    'students:delete_test_score': {'anonymous': 0, 'student': 4, 'staff': 3},
+}
+
+
+def url_kwargs(fixture):
+    """Keyword arguments for URL names that take them"""
+    student_score = fixture.scores[1]
+    draft, pending = fixture.applications[0], fixture.applications[1]
+    return {
+        'universities:detail': {'slug': fixture.universities[0].slug},
+        'programs:detail': {'slug': fixture.programs[0].slug},
+        'students:edit_test_score': {'pk': student_score.pk},
+        'students:delete_test_score': {'pk': student_score.pk},
+        'applications:detail': {'application_id': pending.application_id},
+        'applications:cancel': {'application_id': draft.application_id},
+        'applications:pdf': {'application_id': pending.application_id},
+    }
+
+
+def iter_url_names(patterns=None, namespace=None):
+    """Yield the namespaced name of every named, non-admin URL pattern"""
+    for pattern in patterns if patterns is not None else get_resolver().url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace == 'admin':
+                continue
+            child = ':'.join(filter(None, [namespace, pattern.namespace]))
+            yield from iter_url_names(pattern.url_patterns, child or None)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield f'{namespace}:{pattern.name}' if namespace else pattern.name
+
+
+@override_settings(
+    BACKGROUND_TASKS_EAGER=True,
+    LOGIN_THROTTLE_ENABLED=False,
+    INSTRUMENTATION_ENABLED=False,
+)
+class QueryBudgetTests(CachedFixtureTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_override = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_override.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.media_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.kwargs = url_kwargs(cls.fixture)
+
+    def client_for(self, role):
+        client = Client()
+        if role != 'anonymous':
+            client.force_login(getattr(self.fixture, role))
+        return client
+
+    def measure(self, role, url, method='get'):
+        """Request url as role with cold caches; returns (response, queries, ms)"""
+        client = self.client_for(role)
+        for cache in caches.all():
+            cache.clear()
+        # Some GET views write (cancel, logout); keep every request isolated
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = getattr(client, method)(url)
+                elapsed = (time.perf_counter() - started) * 1000
+            transaction.set_rollback(True)
+        return response, queries, elapsed
+
+    def assert_within_budget(self, name, role, url, budget, method='get'):
+        response, queries, elapsed = self.measure(role, url, method)
+        self.assertLess(response.status_code, 500, f'{url} as {role} failed')
+        self.assertLessEqual(
+            len(queries), budget[role],
+            f'{name} as {role} issued {len(queries)} queries (budget {budget[role]}):\n'
+            + '\n'.join(query['sql'] for query in queries.captured_queries),
+        )
+        self.assertLessEqual(
+            elapsed, budget.get('ms', DEFAULT_MAX_MS),
+            f'{name} as {role} took {elapsed:.0f} ms',
+        )
+
+    def test_every_url_has_a_budget(self):
+        missing = sorted(set(iter_url_names()) - set(BUDGETS))
+        self.assertEqual(missing, [], 'Add these URL names to BUDGETS')
+
+    def test_views_within_budget(self):
+        for name in iter_url_names():
+            url = reverse(name, kwargs=self.kwargs.get(name))
+            for role in ROLES:
+                with self.subTest(url=name, role=role):
+                    self.assert_within_budget(name, role, url, BUDGETS[name])
+
+    def test_posts_within_budget(self):
+        for name, budget in POST_BUDGETS.items():
+            url = reverse(name, kwargs=self.kwargs.get(name))
+            for role in ROLES:
+                with self.subTest(url=name, role=role):
+                    self.assert_within_budget(name, role, url, budget, method='post')
+
+    def test_delete_only_on_post(self):
+        client = self.client_for('student')
+        url = reverse('students:delete_test_score', kwargs=self.kwargs['students:delete_test_score'])
+        self.assertEqual(client.get(url).status_code, 405)
+        self.assertTrue(self.fixture.student.test_scores.filter(pk=self.fixture.scores[1].pk).exists())
+        self.assertRedirects(client.post(url), reverse('students:test_scores'), fetch_redirect_response=False)
+        self.assertFalse(self.fixture.student.test_scores.filter(pk=self.fixture.scores[1].pk).exists())
+
+    def test_admin_within_budget(self):
+        self.assert_within_budget('admin:index', 'staff', reverse('admin:index'), BUDGETS['admin:index'])
+        for model, model_admin in admin.site._registry.items():
+            opts = model._meta
+            prefix = f'admin:{opts.app_label}_{opts.model_name}'
+            urls = [('admin:changelist', reverse(f'{prefix}_changelist'))]
+            if model_admin.has_add_permission(self._staff_request()):
+                urls.append(('admin:add', reverse(f'{prefix}_add')))
+            instance = model._default_manager.order_by('pk').first()
+            if instance is not None:
+                urls.append(('admin:change', reverse(f'{prefix}_change', args=[instance.pk])))
+            for row, url in urls:
+                with self.subTest(url=url):
+                    self.assert_within_budget(row, 'staff', url, BUDGETS[row])
+
+    def _staff_request(self):
+        from django.test import RequestFactory
+
+        request = RequestFactory().get('/admin/')
+        request.user = self.fixture.staff
+        return request
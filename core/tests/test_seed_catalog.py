@@ -0,0 +1,70 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+
+from applications.models import Application, ApplicationLog
+from core.tests.fixtures import FastTestCase
+from programs.models import Program
+from students.models import Student, StudentTestScore
+
+SEED_OPTIONS = {
+    'seed': 3,
+    'anchor_date': datetime.date(2025, 1, 1),
+    'universities': 5,
+    'programs': 4,
+    'students': 40,
+    'applications': 150,
+    'batch_size': 50,
+}
+
+
+class SeedCatalogTests(FastTestCase):
+    def seed(self, **options):
+        call_command('seed_catalog', stdout=StringIO(), **{**SEED_OPTIONS, **options})
+
+    def snapshot(self):
+        return {
+            'programs': list(Program.objects.order_by('pk').values_list('pk', 'name', 'university_id')),
+            'students': list(Student.objects.order_by('pk').values_list('pk', 'username', 'date_joined')),
+            'applications': list(Application.objects.order_by('application_id').values_list(
+                'pk', 'application_id', 'student_id', 'program_id', 'status', 'created_at',
+            )),
+            'logs': list(ApplicationLog.objects.order_by('pk').values_list('pk', 'event', 'timestamp')),
+        }
+
+    def test_same_seed_gives_the_same_rows(self):
+        with transaction.atomic():
+            self.seed()
+            first = self.snapshot()
+            transaction.set_rollback(True)
+        self.seed()
+        self.assertEqual(self.snapshot(), first)
+
+    def test_seeds_requested_volume(self):
+        self.seed()
+        self.assertEqual(Student.objects.count(), 40)
+        self.assertEqual(Application.objects.count(), 150)
+        self.assertEqual(Application.next_application_number(), 151)
+        self.assertTrue(StudentTestScore.objects.exists())
+        # Drafts have no log; every submitted application starts with one
+        submitted = Application.objects.exclude(status='draft').count()
+        self.assertEqual(ApplicationLog.objects.filter(event='Application Submitted').count(), submitted)
+        # Students share one usable password
+        self.assertTrue(Student.objects.first().check_password('seed-password'))
+
+    def test_refuses_to_seed_twice(self):
+        self.seed()
+        with self.assertRaises(CommandError):
+            self.seed()
+
+
+class ApplicationNumberTests(FastTestCase):
+    def test_next_number_after_six_digits(self):
+        self.assertEqual(Application.next_application_number(), 1)
+        call_command('seed_catalog', stdout=StringIO(), **{**SEED_OPTIONS, 'applications': 2})
+        Application.objects.filter(application_id='000001').update(application_id='999999')
+        Application.objects.filter(application_id='000002').update(application_id='1000000')
+        self.assertEqual(Application.next_application_number(), 1000001)
@@ -0,0 +1,90 @@
+import gzip
+import io
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.sitemaps import DETAIL_SITEMAPS, SITEMAPS, ProgramSitemap, write_sitemaps
+from core.tests.fixtures import FixtureTestCase
+from programs.models import Program
+
+
+@override_settings(SITEMAP_BASE_URL='https://example.test', SITEMAP_DETAIL_PAGES=True)
+class SitemapTests(FixtureTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def read(self, *parts):
+        path = os.path.join(self.root, *parts)
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            return f.read()
+
+    def test_sections_index_and_robots(self):
+        Program.objects.filter(pk=self.fixture.programs[0].pk).update(is_active=False)
+        counts = write_sitemaps(self.root)
+        self.assertEqual(counts, {'pages': 5, 'universities': 4, 'programs': 11})
+
+        universities = self.read('sitemaps', 'universities-1.xml.gz')
+        self.assertIn('<loc>https://example.test/universities/fixture-university-0/</loc>', universities)
+        programs = self.read('sitemaps', 'programs-1.xml.gz')
+        self.assertNotIn(self.fixture.programs[0].slug, programs)
+        self.assertIn(f'<loc>https://example.test/programs/{self.fixture.programs[1].slug}/</loc>', programs)
+
+        index = self.read('sitemap.xml')
+        self.assertEqual(index, self.read('sitemap.xml.gz'))
+        self.assertIn('<loc>https://example.test/sitemaps/programs-1.xml.gz</loc>', index)
+        robots = self.read('robots.txt')
+        self.assertIn('Disallow: /universities/?', robots)
+        self.assertIn('Sitemap: https://example.test/sitemap.xml', robots)
+
+    @override_settings(SITEMAP_DETAIL_PAGES=False)
+    def test_login_protected_pages_are_left_out(self):
+        self.assertEqual(write_sitemaps(self.root), {'pages': 5})
+        self.assertNotIn('universities-1', self.read('sitemap.xml'))
+        robots = self.read('robots.txt')
+        for path in ('/admin/', '/apply/', '/dashboard/', '/profile/', '/documents/upload/', '/test-scores/'):
+            self.assertIn(f'Disallow: {path}\n', robots)
+
+    def test_large_sections_are_split_and_stale_ones_removed(self):
+        class SmallProgramSitemap(ProgramSitemap):
+            limit = 5
+
+        write_sitemaps(self.root, sitemaps={**SITEMAPS, **DETAIL_SITEMAPS, 'programs': SmallProgramSitemap})
+        self.assertEqual(
+            sorted(name for name in os.listdir(os.path.join(self.root, 'sitemaps')) if name.startswith('programs')),
+            ['programs-1.xml.gz', 'programs-2.xml.gz', 'programs-3.xml.gz'],
+        )
+        self.assertEqual(self.read('sitemaps', 'programs-3.xml.gz').count('<url>'), 2)
+
+        write_sitemaps(self.root)
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'sitemaps', 'programs-2.xml.gz')))
+        self.assertNotIn('programs-2', self.read('sitemap.xml'))
+
+    def test_query_count_does_not_grow_with_the_catalog(self):
+        with CaptureQueriesContext(connection) as queries:
+            write_sitemaps(self.root, chunk_size=2)
+        # One query per model section; iterator() chunks are fetched from the same cursor
+        self.assertEqual(len(queries), 2)
+
+    def test_whitenoise_serves_the_files(self):
+        write_sitemaps(self.root)
+        with override_settings(WHITENOISE_ROOT=self.root):
+            response = self.client.get('/robots.txt')
+            self.assertEqual(response.status_code, 200)
+            response = self.client.get('/sitemap.xml', HTTP_ACCEPT_ENCODING='gzip')
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            response = self.client.get('/sitemaps/universities-1.xml.gz')
+            self.assertEqual(response.status_code, 200)
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('generate_sitemaps', '--output-dir', self.root, '--base-url', 'https://www.example.test', stdout=out)
+        self.assertIn('Wrote sitemaps for 21 URL(s)', out.getvalue())
+        self.assertIn('Sitemap: https://www.example.test/sitemap.xml', self.read('robots.txt'))
@@ -0,0 +1,40 @@
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+
+from core.tests.fixtures import PASSWORD, CachedFixtureTestCase
+
+
+@override_settings(
+    LOGIN_THROTTLE_ENABLED=True,
+    LOGIN_THROTTLE_CACHE='default',
+    LOGIN_THROTTLE_IDENTIFIER_LIMIT=3,
+    LOGIN_THROTTLE_IP_LIMIT=10,
+)
+class LoginThrottleTests(CachedFixtureTestCase):
+    def login(self, password, ip='203.0.113.7'):
+        return self.client.post(
+            reverse('students:login'), {'username': self.fixture.student.email, 'password': password},
+            REMOTE_ADDR=ip,
+        )
+
+    def test_guessing_locks_out_the_guesser_not_the_owner(self):
+        for _ in range(3):
+            self.assertEqual(self.login('wrong').status_code, 200)
+        self.assertEqual(self.login(PASSWORD).status_code, 429)
+        # The owner, from elsewhere, is not affected
+        response = self.login(PASSWORD, ip='198.51.100.20')
+        self.assertRedirects(response, reverse('students:dashboard'), fetch_redirect_response=False)
+
+    def test_throttled_attempts_skip_authentication_and_hashing(self):
+        for _ in range(3):
+            self.login('wrong')
+        with mock.patch('django.contrib.auth.forms.authenticate') as authenticate, \
+                mock.patch('django.contrib.auth.hashers.identify_hasher') as identify_hasher, \
+                mock.patch('django.contrib.auth.hashers.get_hasher') as get_hasher:
+            response = self.login(PASSWORD)
+        self.assertEqual(response.status_code, 429)
+        authenticate.assert_not_called()
+        identify_hasher.assert_not_called()
+        get_hasher.assert_not_called()
@@ -0,0 +1,153 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+from PIL import Image
+
+from core import thumbnails
+from core.tests.fixtures import FixtureTestCase
+from students.models import Student
+from universities.models import University
+
+
+def png_bytes(size=(800, 600), color='navy'):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class MediaRootMixin:
+    """A throwaway MEDIA_ROOT, background jobs run inline and an empty LRU"""
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root, MEDIA_URL='/media/', BACKGROUND_TASKS_EAGER=True, THUMBNAIL_FORMAT='WEBP',
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        thumbnails._known.clear()
+        self.addCleanup(thumbnails._known.clear)
+        self.addCleanup(thumbnails._in_flight.clear)
+
+    def save_image(self, name, size=(800, 600)):
+        return default_storage.save(name, ContentFile(png_bytes(size)))
+
+
+class KnownDerivativesTests(SimpleTestCase):
+    def setUp(self):
+        thumbnails._known.clear()
+        self.addCleanup(thumbnails._known.clear)
+
+    @mock.patch.object(thumbnails, 'KNOWN_DERIVATIVES_MAX', 3)
+    def test_bounded_and_least_recently_used_goes_first(self):
+        for source in ('a', 'b', 'c'):
+            thumbnails._remember(source, 'card', f'thumbnails/{source}.webp')
+        self.assertEqual(thumbnails._known_derivative('a', 'card'), 'thumbnails/a.webp')
+        thumbnails._remember('d', 'card', 'thumbnails/d.webp')
+        self.assertEqual(list(thumbnails._known), [('c', 'card'), ('a', 'card'), ('d', 'card')])
+        self.assertIsNone(thumbnails._known_derivative('b', 'card'))
+        self.assertIsNone(thumbnails._known_derivative('a', 'logo'))
+
+
+class GenerateDerivativeTests(MediaRootMixin, SimpleTestCase):
+    def test_crop_and_fit(self):
+        source = self.save_image('university_images/campus.png')
+        key = thumbnails.source_hash(University(image=source).image)
+
+        card = thumbnails.generate_derivative(source, key, 'card')
+        self.assertEqual(card, f'thumbnails/card/{key[:2]}/{key}.webp')
+        with default_storage.open(card) as fh, Image.open(fh) as image:
+            self.assertEqual((image.format, image.size), ('WEBP', (640, 384)))
+
+        logo = thumbnails.generate_derivative(source, key, 'logo')
+        with default_storage.open(logo) as fh, Image.open(fh) as image:
+            self.assertEqual(image.size, (128, 96))
+
+    def test_existing_derivative_is_not_rendered_again(self):
+        source = self.save_image('university_images/campus.png')
+        name = thumbnails.generate_derivative(source, 'k' * 64, 'card')
+        with mock.patch.object(thumbnails, 'render_derivative') as render:
+            self.assertEqual(thumbnails.generate_derivative(source, 'k' * 64, 'card'), name)
+        render.assert_not_called()
+
+    def test_unreadable_source_is_skipped(self):
+        name = default_storage.save('university_images/broken.png', ContentFile(b'not an image'))
+        with self.assertLogs('core.thumbnails', 'WARNING'):
+            self.assertIsNone(thumbnails.generate_derivative(name, 'b' * 64, 'card'))
+        self.assertFalse(default_storage.exists(thumbnails.derivative_name('b' * 64, 'card')))
+
+    def test_content_hash_is_the_key(self):
+        self.assertEqual(thumbnails.source_hash(University(image='any.png').image, 'c' * 64), 'c' * 64)
+
+
+class ThumbnailTagTests(MediaRootMixin, SimpleTestCase):
+    template = Template("{% load thumbnails %}{% thumbnail_url university.logo 'logo' %}")
+
+    def render(self, university):
+        return self.template.render(Context({'university': university}))
+
+    def test_original_until_the_derivative_exists(self):
+        university = University(logo=self.save_image('university_logos/logo.png'))
+        with mock.patch.object(thumbnails, 'run_in_background') as run:
+            self.assertEqual(self.render(university), '/media/university_logos/logo.png')
+        run.assert_called_once()
+        self.assertEqual(run.call_args.args[1:], ('university_logos/logo.png', mock.ANY, 'logo'))
+        # Scheduled once until the job finishes
+        with mock.patch.object(thumbnails, 'run_in_background') as run:
+            self.render(university)
+        run.assert_not_called()
+        thumbnails._in_flight.clear()
+
+        # Eagerly generated on the next miss, then served from then on
+        self.assertEqual(self.render(university), '/media/university_logos/logo.png')
+        self.assertRegex(self.render(university), r'^/media/thumbnails/logo/\w\w/\w{64}\.webp$')
+
+    def test_known_derivatives_skip_stat_and_storage(self):
+        university = University(logo=self.save_image('university_logos/logo.png'))
+        self.render(university)
+        url = self.render(university)
+        with mock.patch.object(thumbnails.os, 'stat') as stat, \
+                mock.patch.object(default_storage, 'exists') as exists:
+            self.assertEqual(self.render(university), url)
+        stat.assert_not_called()
+        exists.assert_not_called()
+
+    def test_empty_and_non_image_files(self):
+        self.assertEqual(self.render(University()), '')
+        university = University(logo='university_logos/logo.svg')
+        self.assertEqual(self.render(university), '/media/university_logos/logo.svg')
+
+
+class GenerateThumbnailsCommandTests(MediaRootMixin, FixtureTestCase):
+    def test_generates_missing_derivatives(self):
+        university = self.fixture.universities[0]
+        university.image = self.save_image('university_images/campus.png')
+        university.logo = self.save_image('university_logos/logo.png', (300, 300))
+        university.save()
+        student = Student.objects.get(pk=self.fixture.student.pk)
+        student.profile_picture = self.save_image('student_profiles/me.png', (200, 300))
+        student.save()
+
+        out = io.StringIO()
+        call_command('generate_thumbnails', stdout=out)
+        # The fixture's PDF documents are skipped without a PDF renderer (or missing on disk)
+        self.assertIn('3 derivative(s) available', out.getvalue())
+        expected = [(university.image, 'card'), (university.logo, 'logo'), (student.profile_picture, 'avatar')]
+        for fieldfile, alias in expected:
+            name = thumbnails.derivative_name(thumbnails.source_hash(fieldfile), alias)
+            self.assertTrue(default_storage.exists(name), name)
+
+        out = io.StringIO()
+        call_command('generate_thumbnails', '--alias', 'logo', stdout=out)
+        self.assertIn('1 derivative(s) available', out.getvalue())
+        self.assertEqual(len(os.listdir(os.path.join(default_storage.location, 'thumbnails'))), 3)
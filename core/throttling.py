@@ -0,0 +1,178 @@
+"""
+Login throttling.
+
+Failed logins are counted per client IP and per normalised identifier from
+that IP with a sliding-window counter: the current fixed window plus the
+previous window weighted by how much of it still overlaps. Scoping the
+identifier limit to the IP means someone guessing at an account locks out
+themselves, not its owner. Two cache keys per subject keep it cheap, and the
+check runs before the form authenticates, so rejected attempts never reach
+the password hasher.
+
+The counters need a cache whose incr() is atomic and shared by every worker
+(Redis or Memcached via LOGIN_THROTTLE_CACHE). The file-based default
+implements incr() as read-then-write, so concurrent failures can be lost
+and each attempt slips a little past the limit; manage.py check --deploy
+warns about it.
+"""
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'login-throttle'
+# Monitoring counters kept alongside the windows
+STAT_NAMES = ('checked', 'blocked', 'failures')
+STATS_TIMEOUT = 7 * 24 * 3600
+
+_fallback_cache = None
+
+
+def get_throttle_cache():
+    """Return the configured throttle cache, or a process-local fallback"""
+    global _fallback_cache
+    alias = getattr(settings, 'LOGIN_THROTTLE_CACHE', 'default')
+    if alias in settings.CACHES:
+        return caches[alias]
+    if _fallback_cache is None:
+        _fallback_cache = LocMemCache('login-throttle', {})
+    return _fallback_cache
+
+
+def has_atomic_counters(cache):
+    """Whether cache.incr() is atomic across processes"""
+    return not isinstance(cache, (FileBasedCache, LocMemCache))
+
+
+def get_client_ip(request):
+    """Client address, taken from X-Forwarded-For only behind trusted proxies"""
+    proxies = getattr(settings, 'LOGIN_THROTTLE_TRUSTED_PROXIES', 0)
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+    if proxies and forwarded:
+        hops = [hop.strip() for hop in forwarded.split(',') if hop.strip()]
+        if len(hops) >= proxies:
+            return hops[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def normalize_identifier(identifier):
+    return (identifier or '').strip().lower()
+
+
+class SlidingWindowLimiter:
+    """Approximate sliding-window counter over a shared cache"""
+
+    def __init__(self, name, limit, window, cache=None):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.cache = cache or get_throttle_cache()
+
+    def _keys(self, subject, now):
+        digest = hashlib.sha256(subject.encode()).hexdigest()[:32]
+        current = int(now // self.window)
+        base = f'{KEY_PREFIX}:{self.name}:{digest}'
+        return f'{base}:{current}', f'{base}:{current - 1}', now % self.window
+
+    def count(self, subject, now=None):
+        """Weighted number of hits in the last ``window`` seconds"""
+        now = time.time() if now is None else now
+        current_key, previous_key, elapsed = self._keys(subject, now)
+        hits = self.cache.get_many([current_key, previous_key])
+        overlap = (self.window - elapsed) / self.window
+        return hits.get(current_key, 0) + hits.get(previous_key, 0) * overlap
+
+    def is_limited(self, subject, now=None):
+        return self.count(subject, now) >= self.limit
+
+    def hit(self, subject, now=None):
+        now = time.time() if now is None else now
+        current_key, _, _ = self._keys(subject, now)
+        # Keep the window around for the next one, which still weights it
+        if not self.cache.add(current_key, 1, timeout=self.window * 2):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                self.cache.set(current_key, 1, timeout=self.window * 2)
+
+    def reset(self, subject, now=None):
+        now = time.time() if now is None else now
+        current_key, previous_key, _ = self._keys(subject, now)
+        self.cache.delete_many([current_key, previous_key])
+
+
+def _limiters():
+    window = getattr(settings, 'LOGIN_THROTTLE_WINDOW', 300)
+    return (
+        SlidingWindowLimiter('ip', getattr(settings, 'LOGIN_THROTTLE_IP_LIMIT', 30), window),
+        SlidingWindowLimiter('identifier', getattr(settings, 'LOGIN_THROTTLE_IDENTIFIER_LIMIT', 5), window),
+    )
+
+
+def _subjects(request, identifier):
+    """(IP, identifier from that IP); either is empty when unknown"""
+    ip, identifier = get_client_ip(request), normalize_identifier(identifier)
+    return ip, f'{ip} {identifier}' if identifier else ''
+
+
+def _bump(stat):
+    cache = get_throttle_cache()
+    key = f'{KEY_PREFIX}:stats:{stat}'
+    if not cache.add(key, 1, timeout=STATS_TIMEOUT):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=STATS_TIMEOUT)
+
+
+def throttling_enabled():
+    return getattr(settings, 'LOGIN_THROTTLE_ENABLED', True)
+
+
+def check_login_allowed(request, identifier):
+    """Return True if a login attempt for identifier may be authenticated"""
+    if not throttling_enabled():
+        return True
+    _bump('checked')
+    for limiter, subject in zip(_limiters(), _subjects(request, identifier)):
+        if subject and limiter.is_limited(subject):
+            _bump('blocked')
+            logger.warning("Login throttled by %s limit", limiter.name)
+            return False
+    return True
+
+
+def record_login_failure(request, identifier):
+    if not throttling_enabled():
+        return
+    _bump('failures')
+    for limiter, subject in zip(_limiters(), _subjects(request, identifier)):
+        if subject:
+            limiter.hit(subject)
+
+
+def record_login_success(request, identifier):
+    """Clear the identifier's window so a legitimate user starts fresh"""
+    if not throttling_enabled():
+        return
+    identifier_limiter = _limiters()[1]
+    subject = _subjects(request, identifier)[1]
+    if subject:
+        identifier_limiter.reset(subject)
+
+
+def get_throttle_stats():
+    """Return the monitoring counters as a dict"""
+    cache = get_throttle_cache()
+    values = cache.get_many([f'{KEY_PREFIX}:stats:{stat}' for stat in STAT_NAMES])
+    return {stat: values.get(f'{KEY_PREFIX}:stats:{stat}', 0) for stat in STAT_NAMES}
+
+
+def reset_throttle_stats():
+    get_throttle_cache().delete_many([f'{KEY_PREFIX}:stats:{stat}' for stat in STAT_NAMES])
@@ -0,0 +1,219 @@
+"""
+Derivative images (thumbnails and document previews).
+
+Derivatives are generated with Pillow on the background pool and stored under
+THUMBNAIL_DIR, named by the hash of their source so an unchanged file is never
+processed twice. Until a derivative exists, callers fall back to the original.
+"""
+import hashlib
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, features
+
+from .background import run_in_background
+
+try:
+    import pypdfium2
+except ImportError:  # PDF previews are optional
+    pypdfium2 = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THUMBNAIL_SPECS = {
+    # alias: (width, height, crop)
+    'card': (640, 384, True),
+    'logo': (128, 128, False),
+    'avatar': (128, 128, True),
+    'preview': (320, 420, False),
+}
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'}
+
+# File fields whose derivatives are keyed by a stored content hash:
+# (model label, file field) -> hash field
+CONTENT_HASH_FIELDS = {
+    ('students.StudentDocument', 'file_url'): 'sha256',
+}
+
+# Derivatives seen to exist, by (source name, alias), most recently used
+# last. A hit skips both the source stat and the storage lookup for the
+# common ones without growing for the life of the process. Storage never
+# reuses a name for new content, so a source name keeps its derivative.
+KNOWN_DERIVATIVES_MAX = 10000
+
+_in_flight = set()
+_in_flight_lock = threading.Lock()
+_known = OrderedDict()
+_known_lock = threading.Lock()
+
+
+def _remember(source_name, alias, name):
+    with _known_lock:
+        _known[source_name, alias] = name
+        _known.move_to_end((source_name, alias))
+        if len(_known) > KNOWN_DERIVATIVES_MAX:
+            _known.popitem(last=False)
+
+
+def _known_derivative(source_name, alias):
+    """Derivative name recorded for the source, or None"""
+    with _known_lock:
+        name = _known.get((source_name, alias))
+        if name is not None:
+            _known.move_to_end((source_name, alias))
+        return name
+
+
+def get_specs():
+    return getattr(settings, 'THUMBNAIL_SPECS', DEFAULT_THUMBNAIL_SPECS)
+
+
+def get_output_format():
+    """WebP when Pillow was built with it, JPEG otherwise"""
+    preferred = getattr(settings, 'THUMBNAIL_FORMAT', 'WEBP').upper()
+    if preferred == 'WEBP' and not features.check('webp'):
+        return 'JPEG'
+    return preferred
+
+
+def source_hash(fieldfile, content_hash=None):
+    """Key a source file by its content hash when known.
+
+    Documents carry a SHA-256 from the upload pipeline. Other files are keyed
+    by name, size and modification time, which changes whenever the content is
+    replaced, so the key never needs the file to be read.
+    """
+    if content_hash:
+        return content_hash
+    try:
+        stat = os.stat(default_storage.path(fieldfile.name))
+        fingerprint = f"{fieldfile.name}:{stat.st_size}:{stat.st_mtime_ns}"
+    except (NotImplementedError, OSError):
+        fingerprint = fieldfile.name
+    return hashlib.sha256(fingerprint.encode()).hexdigest()
+
+
+def derivative_name(key, alias):
+    extension = 'webp' if get_output_format() == 'WEBP' else 'jpg'
+    thumbnail_dir = getattr(settings, 'THUMBNAIL_DIR', 'thumbnails')
+    return f"{thumbnail_dir}/{alias}/{key[:2]}/{key}.{extension}"
+
+
+def derivative_names(fieldfile, content_hash=None):
+    """Names of every derivative the source can have with the current settings"""
+    if not (is_image(fieldfile.name) or is_pdf(fieldfile.name)):
+        return []
+    key = source_hash(fieldfile, content_hash)
+    return [derivative_name(key, alias) for alias in get_specs()]
+
+
+def is_image(name):
+    return os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def is_pdf(name):
+    return os.path.splitext(name)[1].lower() == '.pdf'
+
+
+def _open_source(source_name, size):
+    """Open the source as a Pillow image (first page for PDFs)"""
+    if is_pdf(source_name):
+        if pypdfium2 is None:
+            return None
+        with default_storage.open(source_name, 'rb') as fh:
+            pdf = pypdfium2.PdfDocument(fh.read())
+        try:
+            page = pdf[0]
+            scale = max(size[0] / page.get_width(), size[1] / page.get_height())
+            return page.render(scale=scale).to_pil()
+        finally:
+            pdf.close()
+
+    with default_storage.open(source_name, 'rb') as fh:
+        image = Image.open(fh)
+        # Let the JPEG decoder downscale while decoding; much cheaper for large photos
+        image.draft('RGB', size)
+        image.load()
+    return ImageOps.exif_transpose(image)
+
+
+def render_derivative(source_name, alias):
+    """Render source_name for alias and return the encoded bytes (or None)"""
+    width, height, crop = get_specs()[alias]
+    image = _open_source(source_name, (width, height))
+    if image is None:
+        return None
+
+    if crop:
+        image = ImageOps.fit(image, (width, height), Image.LANCZOS)
+    else:
+        image.thumbnail((width, height), Image.LANCZOS)
+
+    output_format = get_output_format()
+    if output_format == 'JPEG' or image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGB' if output_format == 'JPEG' else 'RGBA')
+
+    buffer = io.BytesIO()
+    image.save(buffer, output_format, quality=getattr(settings, 'THUMBNAIL_QUALITY', 80), optimize=True)
+    return buffer.getvalue()
+
+
+def generate_derivative(source_name, key, alias):
+    """Create the derivative for (key, alias) unless it already exists"""
+    name = derivative_name(key, alias)
+    try:
+        if default_storage.exists(name):
+            _remember(source_name, alias, name)
+            return name
+        data = render_derivative(source_name, alias)
+        if data is None:
+            return None
+        default_storage.save(name, ContentFile(data))
+        _remember(source_name, alias, name)
+        return name
+    except (OSError, Image.DecompressionBombError, ValueError):
+        logger.warning("Could not generate %s derivative for %s", alias, source_name, exc_info=True)
+        return None
+    finally:
+        with _in_flight_lock:
+            _in_flight.discard(name)
+
+
+def schedule_derivative(source_name, key, alias):
+    """Queue derivative generation, at most once per derivative at a time"""
+    name = derivative_name(key, alias)
+    with _in_flight_lock:
+        if name in _in_flight:
+            return
+        _in_flight.add(name)
+    run_in_background(generate_derivative, source_name, key, alias)
+
+
+def get_derivative_url(fieldfile, alias, content_hash=None):
+    """Return the derivative URL if it exists, scheduling it otherwise.
+
+    Returns None while the derivative is not available yet.
+    """
+    if not fieldfile:
+        return None
+    if not (is_image(fieldfile.name) or is_pdf(fieldfile.name)):
+        return None
+    if is_pdf(fieldfile.name) and pypdfium2 is None:
+        return None
+
+    name = _known_derivative(fieldfile.name, alias)
+    if name is None:
+        key = source_hash(fieldfile, content_hash)
+        name = derivative_name(key, alias)
+        if not default_storage.exists(name):
+            schedule_derivative(fieldfile.name, key, alias)
+            return None
+        _remember(fieldfile.name, alias, name)
+    return default_storage.url(name)
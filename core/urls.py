@@ -1,10 +1,14 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = 'core'
 
+# Async variant runs natively under ASGI (uvicorn); see CATALOG_ASYNC_VIEWS
+landing_view = views.AsyncLandingPageView if settings.CATALOG_ASYNC_VIEWS else views.LandingPageView
+
 urlpatterns = [
-    path('', views.LandingPageView.as_view(), name='landing'),
+    path('', landing_view.as_view(), name='landing'),
     path('about/', views.AboutView.as_view(), name='about'),
     path('contact/', views.ContactView.as_view(), name='contact'),
 ]
@@ -1,5 +1,37 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.template.response import TemplateResponse
+from django.views import View
 from django.views.generic import TemplateView
 
+from core.cache import ACTIVITY, CATALOG, acached, cached, get_group_version
+
+
+def get_landing_stats():
+    """Featured universities and headline numbers for the landing page"""
+    # Import here to avoid circular imports
+    from universities.models import University
+    from programs.models import Program
+
+    from students.models import Student
+    from applications.models import Application
+
+    # Success rate: Accepted / Total Applications
+    total_apps = Application.objects.count()
+    accepted_apps = Application.objects.filter(status='accepted').count()
+
+    return {
+        'featured_universities': list(
+            University.objects.filter(is_partner=True).select_related('location_emirate', 'contact_info')[:6]
+        ),
+        'total_universities': University.objects.count(),
+        'total_partner_universities': University.objects.filter(is_partner=True).count(),
+        'total_programs': Program.objects.filter(is_active=True).count(),
+        'total_student_help': Student.objects.count(),
+        'total_success_rate': int((accepted_apps / total_apps * 100)) if total_apps > 0 else 0,
+    }
+
 
 class LandingPageView(TemplateView):
     """Landing page view"""
@@ -7,30 +39,54 @@ class LandingPageView(TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Import here to avoid circular imports
-        from universities.models import University
-        from programs.models import Program
-        
-        from students.models import Student
-        from applications.models import Application
-        
-        context['featured_universities'] = University.objects.filter(
-            is_partner=True
-        ).select_related('location_emirate', 'contact_info')[:6]
-        
-        context['total_universities'] = University.objects.count()
-        context['total_partner_universities'] = University.objects.filter(is_partner=True).count()
-        context['total_programs'] = Program.objects.filter(is_active=True).count()
-        context['total_student_help'] = Student.objects.count()
-        
-        # Success rate: Accepted / Total Applications
-        total_apps = Application.objects.count()
-        accepted_apps = Application.objects.filter(status='accepted').count()
-        context['total_success_rate'] = int((accepted_apps / total_apps * 100)) if total_apps > 0 else 0
-        
+        # The student and application counts follow the activity group
+        activity = get_group_version(ACTIVITY)
+        context.update(cached('landing', 'stats', activity, compute=get_landing_stats, timeout=300, group=CATALOG))
         return context
 
 
+async def aget_landing_stats():
+    """Async get_landing_stats(); the independent counts are awaited together"""
+    from universities.models import University
+    from programs.models import Program
+
+    from students.models import Student
+    from applications.models import Application
+
+    (
+        total_universities, total_partner_universities, total_programs,
+        total_student_help, total_apps, accepted_apps,
+    ) = await asyncio.gather(
+        University.objects.acount(),
+        University.objects.filter(is_partner=True).acount(),
+        Program.objects.filter(is_active=True).acount(),
+        Student.objects.acount(),
+        Application.objects.acount(),
+        Application.objects.filter(status='accepted').acount(),
+    )
+    featured = University.objects.filter(is_partner=True).select_related('location_emirate', 'contact_info')[:6]
+
+    return {
+        'featured_universities': [university async for university in featured],
+        'total_universities': total_universities,
+        'total_partner_universities': total_partner_universities,
+        'total_programs': total_programs,
+        'total_student_help': total_student_help,
+        'total_success_rate': int((accepted_apps / total_apps * 100)) if total_apps > 0 else 0,
+    }
+
+
+class AsyncLandingPageView(View):
+    """Landing page view for ASGI deployments (see CATALOG_ASYNC_VIEWS)"""
+    template_name = 'core/landing.html'
+
+    async def get(self, request, *args, **kwargs):
+        # Same cache entry as LandingPageView
+        activity = await sync_to_async(get_group_version)(ACTIVITY)
+        context = await acached('landing', 'stats', activity, compute=aget_landing_stats, timeout=300, group=CATALOG)
+        return TemplateResponse(request, self.template_name, context)
+
+
 class AboutView(TemplateView):
     """About page view"""
     template_name = 'core/about.html'
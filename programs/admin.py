@@ -1,4 +1,4 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django import forms
 from universities.models import University
 from .models import ProgramLevel, ProgramType, Program, AcademicIntake, TuitionFee, EnglishRequirement
@@ -16,6 +16,10 @@ class TuitionFeeInline(admin.TabularInline):
     model = TuitionFee
     extra = 1
 
+class CatalogImportForm(forms.Form):
+    catalog = forms.FileField(help_text="CSV (.csv), JSON Lines (.jsonl) or a JSON array (.json), one row per program")
+    dry_run = forms.BooleanField(required=False, help_text="Validate only; nothing is saved")
+
 @admin.register(Program)
 class ProgramAdmin(admin.ModelAdmin):
     list_display = ['name', 'get_university_name', 'type', 'delivery_type', 'is_active', 'slug']
@@ -24,6 +28,9 @@ class ProgramAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('name',)}
     autocomplete_fields = ['university']
     inlines = [TuitionFeeInline]
+    change_list_template = 'admin/programs/program/change_list.html'
+    # Errors listed on the result page; the import_catalog command writes them all
+    import_errors_shown = 200
     
     def get_university_name(self, obj):
         """Display full university name instead of short name"""
@@ -31,6 +38,48 @@ class ProgramAdmin(admin.ModelAdmin):
     get_university_name.short_description = 'University'
     get_university_name.admin_order_field = 'university__name'
 
+    def get_urls(self):
+        from django.urls import path
+        urls = super().get_urls()
+        custom_urls = [
+            path('import/', self.admin_site.admin_view(self.import_catalog_view), name='programs_program_import'),
+        ]
+        return custom_urls + urls
+
+    def import_catalog_view(self, request):
+        """Upload a partner catalog and run it through CatalogImporter"""
+        import io
+        from django.core.exceptions import PermissionDenied
+        from django.template.response import TemplateResponse
+        from .importers import CatalogImporter, detect_format, iter_records
+
+        if not (self.has_add_permission(request) and self.has_change_permission(request)):
+            raise PermissionDenied
+        result = None
+        form = CatalogImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['catalog']
+            try:
+                fmt = detect_format(upload.name)
+                stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+                result = CatalogImporter(dry_run=form.cleaned_data['dry_run']).run(iter_records(stream, fmt))
+            except (ValueError, UnicodeDecodeError) as error:
+                form.add_error('catalog', f'Could not read the file: {error}')
+            else:
+                level = messages.WARNING if result.errors else messages.SUCCESS
+                prefix = 'Dry run (nothing saved): ' if result.dry_run else ''
+                self.message_user(request, prefix + result.summary(), level)
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Import catalog',
+            'form': form,
+            'result': result,
+            'errors': result.errors[:self.import_errors_shown] if result else [],
+            'hidden_errors': max(0, len(result.errors) - self.import_errors_shown) if result else 0,
+        }
+        return TemplateResponse(request, 'admin/programs/program/import_catalog.html', context)
+
 class UniversityChoiceField(forms.ModelChoiceField):
     def label_from_instance(self, obj):
         return obj.name  # Show full name instead of __str__
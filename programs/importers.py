@@ -0,0 +1,586 @@
+"""
+Bulk catalog import.
+
+Partner catalogs arrive as CSV, JSON Lines or a JSON array with one row per
+program, repeating the university columns on every row:
+
+* university: ``university`` (name, required), ``university_short_name``,
+  ``emirate``, ``country`` (name or ISO code), ``city``, ``university_type``,
+  ``is_partner``, ``established_year`` (required for new universities),
+  ``university_description``, ``accreditation``, ``facilities``, ``ranking``,
+  ``email``, ``phone``, ``website``, ``address``
+* program: ``program`` (name, required), ``level`` and ``type`` (required for
+  new programs), ``delivery_type``, ``department``, ``description``,
+  ``is_active``
+* optional tuition fee: ``fee_amount``, ``fee_max_amount``, ``fee_currency``,
+  ``fee_per``
+* optional intake: ``intake_name``, ``intake_start``, ``intake_end``,
+  ``intake_deadline`` (dates as YYYY-MM-DD)
+
+The input is read as a stream and validated row by row. Emirates,
+countries, levels and program types are resolved through maps loaded once,
+and existing universities and programs are kept in memory so a row only
+overwrites the columns it has. Valid rows are upserted in batches with
+bulk_create(update_conflicts=True), keyed on the university name and on
+(university, program name). Fees and intakes in the file replace the
+program's existing ones. Rows that fail validation, and every row of a
+batch the database rejects, end up in ImportResult.errors.
+"""
+import csv
+import json
+import time
+import uuid
+from decimal import Decimal, InvalidOperation
+
+from django.db import DatabaseError, transaction
+from django.utils.dateparse import parse_date
+from django.utils.text import slugify
+
+FORMATS = ('csv', 'jsonl', 'json')
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 't'}
+FALSE_VALUES = {'0', 'false', 'no', 'n', 'f'}
+
+UNIVERSITY_COLUMNS = {
+    # column: University field
+    'university_short_name': 'short_name',
+    'city': 'location_city',
+    'university_type': 'university_type',
+    'is_partner': 'is_partner',
+    'established_year': 'established_year',
+    'university_description': 'description',
+    'accreditation': 'accreditation',
+    'facilities': 'facilities',
+    'ranking': 'ranking',
+}
+CONTACT_COLUMNS = {'email': 'email', 'phone': 'phone', 'website': 'website', 'address': 'address'}
+PROGRAM_COLUMNS = {
+    'delivery_type': 'delivery_type',
+    'department': 'department',
+    'description': 'description',
+    'is_active': 'is_active',
+}
+FEE_COLUMNS = ('fee_amount', 'fee_max_amount', 'fee_currency', 'fee_per')
+INTAKE_COLUMNS = ('intake_name', 'intake_start', 'intake_end', 'intake_deadline')
+
+UNIVERSITY_FIELDS = ['short_name', 'location_emirate_id', 'country_id', 'location_city', 'contact_info_id',
+                     'is_partner', 'description', 'established_year', 'accreditation', 'facilities', 'ranking',
+                     'university_type']
+PROGRAM_FIELDS = ['type_id', 'description', 'delivery_type', 'department', 'is_active']
+
+
+def detect_format(filename):
+    """Input format from a file name's extension"""
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    if extension in FORMATS:
+        return extension
+    raise ValueError(f'Cannot tell the format of {filename!r}; use .csv, .jsonl or .json')
+
+
+def iter_records(stream, fmt):
+    """Yield (row number, dict) from a text stream"""
+    if fmt == 'csv':
+        # Row 1 is the header
+        for number, record in enumerate(csv.DictReader(stream), start=2):
+            yield number, record
+    elif fmt == 'jsonl':
+        for number, line in enumerate(stream, start=1):
+            if line.strip():
+                try:
+                    yield number, json.loads(line)
+                except ValueError as error:
+                    yield number, error
+    elif fmt == 'json':
+        yield from enumerate(iter_json_array(stream), start=1)
+    else:
+        raise ValueError(f'Unknown format {fmt!r}')
+
+
+def iter_json_array(stream, chunk_size=1 << 16):
+    """Yield the items of a top-level JSON array without loading the whole document"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    eof = False
+    while True:
+        # Skip whitespace and separators; read more when the buffer runs dry
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+        if position >= len(buffer):
+            raise ValueError('Unexpected end of JSON input')
+        if not started:
+            if buffer[position] != '[':
+                raise ValueError('Expected a JSON array of objects')
+            started = True
+            position += 1
+            continue
+        if buffer[position] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except ValueError:
+            if eof:
+                raise
+            # The item continues past the buffer; read more and retry
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield item
+        position = end
+
+
+class RowError(Exception):
+    def __init__(self, problems):
+        super().__init__('; '.join(f'{field}: {message}' for field, message in problems))
+        self.problems = problems
+
+
+class ImportResult:
+    def __init__(self):
+        self.rows = 0
+        self.imported = 0
+        self.universities_created = 0
+        self.universities_updated = 0
+        self.programs_created = 0
+        self.programs_updated = 0
+        self.fees = 0
+        self.intakes = 0
+        # (row number, column, message)
+        self.errors = []
+        self.elapsed = 0.0
+        self.dry_run = False
+
+    @property
+    def failed_rows(self):
+        return len({number for number, _, _ in self.errors})
+
+    def summary(self):
+        return (
+            f'{self.rows} row(s) read, {self.imported} imported, {self.failed_rows} failed; '
+            f'universities {self.universities_created} created / {self.universities_updated} updated, '
+            f'programs {self.programs_created} created / {self.programs_updated} updated, '
+            f'{self.fees} fee(s), {self.intakes} intake(s) in {self.elapsed:.1f}s'
+        )
+
+
+def write_error_report(errors, stream):
+    writer = csv.writer(stream)
+    writer.writerow(['row', 'column', 'error'])
+    writer.writerows(errors)
+
+
+class _Row:
+    """One validated input row, pointing at the merged university and program state"""
+
+    __slots__ = ('number', 'university', 'program', 'fee', 'intake')
+
+    def __init__(self, number, university, program, fee, intake):
+        self.number = number
+        self.university = university
+        self.program = program
+        self.fee = fee
+        self.intake = intake
+
+
+class CatalogImporter:
+    """Validate and upsert catalog rows; see the module docstring for the columns"""
+
+    def __init__(self, batch_size=2000, dry_run=False):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+
+    def run(self, records):
+        """Import (row number, record) pairs from iter_records(); returns an ImportResult"""
+        from core.cache import CATALOG, invalidate_group
+
+        started = time.monotonic()
+        self.result = result = ImportResult()
+        result.dry_run = self.dry_run
+        self.load_maps()
+        with transaction.atomic():
+            batch = []
+            for number, record in records:
+                result.rows += 1
+                try:
+                    batch.append(self.parse(number, record))
+                except RowError as error:
+                    result.errors.extend((number, field, message) for field, message in error.problems)
+                if len(batch) >= self.batch_size:
+                    self.flush(batch)
+                    batch = []
+            if batch:
+                self.flush(batch)
+            if self.dry_run:
+                transaction.set_rollback(True)
+        if not self.dry_run and result.imported:
+            # bulk_create sends no post_save signals
+            invalidate_group(CATALOG)
+        result.elapsed = time.monotonic() - started
+        return result
+
+    def load_maps(self):
+        """Reference data and existing universities/programs, keyed the way rows name them"""
+        from core.models import Country, Emirate
+        from programs.models import Program, ProgramType
+        from universities.models import University
+
+        self.emirates = {name.lower(): pk for pk, name in Emirate.objects.values_list('pk', 'name')}
+        self.countries = {}
+        for pk, name, code in Country.objects.values_list('pk', 'name', 'country_code'):
+            self.countries[name.lower()] = self.countries[code.lower()] = pk
+        # (level, type) and type alone, both lower-cased; a bare type name is
+        # only usable when no other level has a type of that name
+        self.types = {}
+        for pk, name, level in ProgramType.objects.values_list('pk', 'name', 'level__name'):
+            self.types[(level.lower(), name.lower())] = pk
+            self.types[(None, name.lower())] = None if (None, name.lower()) in self.types else pk
+
+        self.universities = {}
+        self.university_slugs = set()
+        for values in University.objects.values('id', 'name', 'slug', *UNIVERSITY_FIELDS,
+                                                *(f'contact_info__{field}' for field in CONTACT_COLUMNS.values())):
+            values['contact'] = {field: values.pop(f'contact_info__{field}') for field in CONTACT_COLUMNS.values()}
+            values['created'] = False
+            self.universities[values['name']] = values
+            self.university_slugs.add(values['slug'])
+
+        self.programs = {}
+        self.program_slugs = set()
+        for values in Program.objects.values('id', 'name', 'slug', 'university__name', *PROGRAM_FIELDS):
+            values['created'] = False
+            self.programs[(values.pop('university__name'), values['name'])] = values
+            self.program_slugs.add(values['slug'])
+        # Program id -> fees/intakes written for it during this import
+        self.replaced_fees = {}
+        self.replaced_intakes = {}
+        # State of each university/program before the pending batch touched it,
+        # restored if the database rejects the batch
+        self.previous_universities = {}
+        self.previous_programs = {}
+
+    def parse(self, number, record):
+        """Validate one record and merge it into the in-memory state; raises RowError"""
+        if not isinstance(record, dict):
+            raise RowError([('', 'Not a JSON object' if not isinstance(record, Exception) else f'Invalid JSON: {record}')])
+        record = {
+            str(key).strip().lower(): value.strip() if isinstance(value, str) else value
+            for key, value in record.items() if key is not None
+        }
+        problems = []
+        university_name = self.text(record, 'university', 255, problems, required=True)
+        program_name = self.text(record, 'program', 255, problems, required=True)
+        if problems:
+            raise RowError(problems)
+
+        existing_university = self.universities.get(university_name)
+        university = dict(existing_university) if existing_university else {
+            'id': uuid.uuid4(), 'name': university_name, 'slug': None, 'created': True,
+            'short_name': '', 'location_emirate_id': None, 'country_id': None, 'location_city': '',
+            'contact_info_id': uuid.uuid4(), 'is_partner': False, 'description': '', 'established_year': None,
+            'accreditation': '', 'facilities': '', 'ranking': None, 'university_type': 'private',
+            'contact': {'email': '', 'phone': '', 'website': '', 'address': ''},
+        }
+        university['contact'] = dict(university['contact'])
+        self.parse_university(record, university, problems)
+
+        existing_program = self.programs.get((university_name, program_name))
+        program = dict(existing_program) if existing_program else {
+            'id': uuid.uuid4(), 'name': program_name, 'slug': None, 'created': True, 'type_id': None,
+            'description': '', 'delivery_type': 'on_campus', 'department': '', 'is_active': True,
+        }
+        self.parse_program(record, program, problems)
+        fee = self.parse_fee(record, problems)
+        intake = self.parse_intake(record, problems)
+        if problems:
+            raise RowError(problems)
+
+        if university['slug'] is None:
+            university['slug'] = self.unique_slug(slugify(university_name), self.university_slugs)
+        if program['slug'] is None:
+            program['slug'] = self.unique_slug(
+                slugify(f"{program_name}-{university['short_name'] or university_name}"), self.program_slugs,
+            )
+        self.previous_universities.setdefault(university_name, existing_university)
+        self.previous_programs.setdefault((university_name, program_name), existing_program)
+        self.universities[university_name] = university
+        self.programs[(university_name, program_name)] = program
+        return _Row(number, university, program, fee, intake)
+
+    def parse_university(self, record, university, problems):
+        from universities.models import University
+
+        if record.get('emirate'):
+            university['location_emirate_id'] = self.emirates.get(record['emirate'].lower())
+            if university['location_emirate_id'] is None:
+                problems.append(('emirate', f"Unknown emirate {record['emirate']!r}"))
+        if record.get('country'):
+            university['country_id'] = self.countries.get(record['country'].lower())
+            if university['country_id'] is None:
+                problems.append(('country', f"Unknown country {record['country']!r}"))
+        for column, field in UNIVERSITY_COLUMNS.items():
+            if column not in record or record[column] in (None, ''):
+                continue
+            if field == 'is_partner':
+                university[field] = self.boolean(record, column, problems)
+            elif field == 'established_year':
+                university[field] = self.integer(record, column, problems, minimum=1800, maximum=2100)
+            elif field == 'ranking':
+                university[field] = self.integer(record, column, problems, minimum=1)
+            elif field == 'university_type':
+                university[field] = self.choice(record, column, University, field, problems)
+            else:
+                max_length = University._meta.get_field(field).max_length
+                university[field] = self.text(record, column, max_length, problems)
+        for column, field in CONTACT_COLUMNS.items():
+            if record.get(column):
+                university['contact'][field] = str(record[column])
+        if university['established_year'] is None:
+            problems.append(('established_year', 'Required for a new university'))
+
+    def parse_program(self, record, program, problems):
+        from programs.models import Program
+
+        level, type_name = record.get('level') or None, record.get('type') or None
+        if type_name:
+            key = (level.lower() if level else None, str(type_name).lower())
+            program['type_id'] = self.types.get(key)
+            if program['type_id'] is None:
+                problems.append(('type', f'Unknown program type {type_name!r}' + (f' for level {level!r}' if level else
+                                 ' (or the name exists at several levels; add a level column)')))
+        elif program['type_id'] is None:
+            problems.append(('type', 'Required for a new program'))
+        for column, field in PROGRAM_COLUMNS.items():
+            if column not in record or record[column] in (None, ''):
+                continue
+            if field == 'is_active':
+                program[field] = self.boolean(record, column, problems)
+            elif field == 'delivery_type':
+                program[field] = self.choice(record, column, Program, field, problems)
+            else:
+                program[field] = self.text(record, column, Program._meta.get_field(field).max_length, problems)
+
+    def parse_fee(self, record, problems):
+        from programs.models import TuitionFee
+
+        if not any(record.get(column) not in (None, '') for column in FEE_COLUMNS):
+            return None
+        amount = self.decimal(record, 'fee_amount', problems, required=True)
+        max_amount = self.decimal(record, 'fee_max_amount', problems)
+        if amount is not None and max_amount is not None and max_amount < amount:
+            problems.append(('fee_max_amount', 'Lower than fee_amount'))
+        currency = str(record.get('fee_currency') or 'AED').upper()
+        if len(currency) != 3 or not currency.isalpha():
+            problems.append(('fee_currency', f'Not a three-letter currency code: {currency!r}'))
+        per = self.choice(record, 'fee_per', TuitionFee, 'per', problems) if record.get('fee_per') else 'year'
+        return {'amount': amount, 'max_amount': max_amount, 'currency': currency, 'per': per}
+
+    def parse_intake(self, record, problems):
+        if not any(record.get(column) not in (None, '') for column in INTAKE_COLUMNS):
+            return None
+        name = self.text(record, 'intake_name', 100, problems, required=True)
+        start = self.date(record, 'intake_start', problems, required=True)
+        end = self.date(record, 'intake_end', problems, required=True)
+        deadline = self.date(record, 'intake_deadline', problems)
+        if start and end and end < start:
+            problems.append(('intake_end', 'Before intake_start'))
+        return {'name': name, 'start_date': start, 'end_date': end, 'application_deadline': deadline}
+
+    def flush(self, batch):
+        """Upsert one batch; a database error fails every row of the batch.
+
+        Counts and the fee/intake bookkeeping only change once the batch is
+        written; a rejected batch also puts back the university and program
+        state its rows had merged in, as if they had never been read.
+        """
+        try:
+            with transaction.atomic():
+                written = self.write(batch)
+        except DatabaseError as error:
+            self.result.errors.extend((row.number, '', f'Batch rejected by the database: {error}') for row in batch)
+            self.restore(self.universities, self.previous_universities)
+            self.restore(self.programs, self.previous_programs)
+        else:
+            for counter, count in written['counts'].items():
+                setattr(self.result, counter, getattr(self.result, counter) + count)
+            self.replaced_fees.update(written['replaced_fees'])
+            self.replaced_intakes.update(written['replaced_intakes'])
+            self.result.imported += len(batch)
+        self.previous_universities, self.previous_programs = {}, {}
+
+    @staticmethod
+    def restore(state, previous):
+        for key, values in previous.items():
+            if values is None:
+                del state[key]
+            else:
+                state[key] = values
+
+    def write(self, batch):
+        """Write one batch; returns its counts and fee/intake bookkeeping for flush() to apply"""
+        from programs.models import AcademicIntake, Program, TuitionFee
+        from universities.models import ContactInfo, University
+
+        counts = {}
+        # Last row wins for repeated universities and programs
+        universities = {row.university['name']: row.university for row in batch}
+        programs = {(row.university['name'], row.program['name']): row.program for row in batch}
+
+        ContactInfo.objects.bulk_create(
+            [ContactInfo(id=values['contact_info_id'], **values['contact']) for values in universities.values()],
+            update_conflicts=True, unique_fields=['id'], update_fields=list(CONTACT_COLUMNS.values()),
+        )
+        University.objects.bulk_create(
+            [University(id=values['id'], name=name, slug=values['slug'],
+                        **{field: values[field] for field in UNIVERSITY_FIELDS})
+             for name, values in universities.items()],
+            update_conflicts=True, unique_fields=['name'], update_fields=UNIVERSITY_FIELDS,
+        )
+        # Conflicting rows keep their id, which bulk_create doesn't report; re-read them
+        university_ids = dict(University.objects.filter(name__in=list(universities)).values_list('name', 'id'))
+        for name, values in universities.items():
+            values['id'] = university_ids[name]
+        counts['universities_created'] = sum(values['created'] for values in universities.values())
+        counts['universities_updated'] = len(universities) - counts['universities_created']
+        for values in universities.values():
+            values['created'] = False
+
+        Program.objects.bulk_create(
+            [Program(id=values['id'], university_id=university_ids[university_name], name=name, slug=values['slug'],
+                     **{field: values[field] for field in PROGRAM_FIELDS})
+             for (university_name, name), values in programs.items()],
+            update_conflicts=True, unique_fields=['university', 'name'], update_fields=PROGRAM_FIELDS,
+        )
+        program_ids = {
+            (university_id, name): pk for pk, university_id, name in Program.objects.filter(
+                university_id__in=set(university_ids.values()), name__in={name for _, name in programs},
+            ).values_list('pk', 'university_id', 'name')
+        }
+        for (university_name, name), values in programs.items():
+            values['id'] = program_ids[(university_ids[university_name], name)]
+        counts['programs_created'] = sum(values['created'] for values in programs.values())
+        counts['programs_updated'] = len(programs) - counts['programs_created']
+        for values in programs.values():
+            values['created'] = False
+
+        fees, intakes = self.children(batch, 'fee', self.replaced_fees), self.children(batch, 'intake', self.replaced_intakes)
+        if fees['replace']:
+            TuitionFee.objects.filter(program_id__in=fees['replace']).delete()
+        if intakes['replace']:
+            AcademicIntake.objects.filter(program_id__in=intakes['replace']).delete()
+        TuitionFee.objects.bulk_create([TuitionFee(program_id=pk, **values) for pk, values in fees['rows']])
+        AcademicIntake.objects.bulk_create([AcademicIntake(program_id=pk, **values) for pk, values in intakes['rows']])
+        counts['fees'], counts['intakes'] = len(fees['rows']), len(intakes['rows'])
+        return {'counts': counts, 'replaced_fees': fees['replaced'], 'replaced_intakes': intakes['replaced']}
+
+    def children(self, batch, attribute, replaced):
+        """New fee or intake rows of a batch, plus programs whose old ones must go.
+
+        replaced maps each program already handled during this import to the
+        rows it got, so repeats in later batches aren't inserted twice. It is
+        left alone; the entries this batch adds are returned as 'replaced'.
+        """
+        rows, replace, added = [], [], {}
+        for row in batch:
+            values = getattr(row, attribute)
+            if values is None:
+                continue
+            program_id = row.program['id']
+            if program_id not in added:
+                added[program_id] = set(replaced.get(program_id, ()))
+                if program_id not in replaced:
+                    replace.append(program_id)
+            key = tuple(sorted(values.items()))
+            if key not in added[program_id]:
+                added[program_id].add(key)
+                rows.append((program_id, values))
+        return {'rows': rows, 'replace': replace, 'replaced': added}
+
+    @staticmethod
+    def unique_slug(base, taken):
+        slug, suffix = base[:240], 2
+        while slug in taken:
+            slug = f'{base[:240]}-{suffix}'
+            suffix += 1
+        taken.add(slug)
+        return slug
+
+    @staticmethod
+    def text(record, column, max_length, problems, required=False):
+        value = record.get(column)
+        value = '' if value is None else str(value)
+        if required and not value:
+            problems.append((column, 'Required'))
+        elif max_length and len(value) > max_length:
+            problems.append((column, f'Longer than {max_length} characters'))
+        return value
+
+    @staticmethod
+    def boolean(record, column, problems):
+        value = str(record[column]).lower()
+        if value in TRUE_VALUES:
+            return True
+        if value in FALSE_VALUES:
+            return False
+        problems.append((column, f'Not a yes/no value: {record[column]!r}'))
+        return False
+
+    @staticmethod
+    def integer(record, column, problems, minimum=None, maximum=None):
+        try:
+            value = int(str(record[column]))
+        except ValueError:
+            problems.append((column, f'Not a whole number: {record[column]!r}'))
+            return None
+        if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+            problems.append((column, f'Out of range: {value}'))
+        return value
+
+    @staticmethod
+    def decimal(record, column, problems, required=False):
+        value = record.get(column)
+        if value in (None, ''):
+            if required:
+                problems.append((column, 'Required'))
+            return None
+        try:
+            amount = Decimal(str(value).replace(',', ''))
+        except InvalidOperation:
+            problems.append((column, f'Not a number: {value!r}'))
+            return None
+        if amount < 0 or amount >= 10 ** 8:
+            problems.append((column, f'Out of range: {amount}'))
+        return amount.quantize(Decimal('0.01'))
+
+    @staticmethod
+    def date(record, column, problems, required=False):
+        value = record.get(column)
+        if value in (None, ''):
+            if required:
+                problems.append((column, 'Required'))
+            return None
+        try:
+            parsed = parse_date(str(value))
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            problems.append((column, f'Not a YYYY-MM-DD date: {value!r}'))
+        return parsed
+
+    @staticmethod
+    def choice(record, column, model, field, problems):
+        value = str(record[column]).lower()
+        choices = {key: key for key, _ in model._meta.get_field(field).choices}
+        choices.update({str(label).lower(): key for key, label in model._meta.get_field(field).choices})
+        if value not in choices:
+            problems.append((column, f"Must be one of {', '.join(key for key, _ in model._meta.get_field(field).choices)}"))
+            return model._meta.get_field(field).default
+        return choices[value]
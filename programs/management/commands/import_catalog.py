@@ -0,0 +1,75 @@
+"""
+Django management command to import universities and programs in bulk.
+
+Reads a partner catalog (CSV, JSON Lines or a JSON array; one row per
+program, see programs.importers for the columns), validates every row and
+upserts universities, programs, tuition fees and intakes in batches. Rows
+that fail are listed in an error report; the rest are imported.
+
+Usage:
+    python manage.py import_catalog partners.csv
+    python manage.py import_catalog catalog.jsonl --errors catalog-errors.csv
+    python manage.py import_catalog catalog.json --dry-run
+    cat catalog.csv | python manage.py import_catalog - --format csv
+"""
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from programs.importers import FORMATS, CatalogImporter, detect_format, iter_records, write_error_report
+
+
+class Command(BaseCommand):
+    help = 'Validate and upsert universities, programs, fees and intakes from a CSV or JSON catalog'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Catalog file, or - for standard input')
+        parser.add_argument('--format', choices=FORMATS, help='Input format (default: from the file extension)')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per upsert batch (default: 2000)')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate and write inside a transaction that is rolled back',
+        )
+        parser.add_argument('--errors', metavar='PATH', help='Write the per-row error report (CSV) to PATH')
+        parser.add_argument(
+            '--show-errors',
+            type=int,
+            default=20,
+            help='Errors to print when no --errors file is given (default: 20)',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            fmt = options['format'] or detect_format(path)
+        except ValueError as error:
+            raise CommandError(f'{error} (or pass --format)')
+
+        importer = CatalogImporter(batch_size=options['batch_size'], dry_run=options['dry_run'])
+        try:
+            if path == '-':
+                result = importer.run(iter_records(sys.stdin, fmt))
+            else:
+                with open(path, encoding='utf-8-sig', newline='') as stream:
+                    result = importer.run(iter_records(stream, fmt))
+        except OSError as error:
+            raise CommandError(f'Cannot read {path}: {error}')
+        except ValueError as error:
+            # Malformed JSON array or CSV structure; nothing was committed
+            raise CommandError(f'Cannot parse {path}: {error}')
+
+        prefix = 'Dry run (rolled back): ' if result.dry_run else ''
+        style = self.style.WARNING if result.errors else self.style.SUCCESS
+        self.stdout.write(style(prefix + result.summary()))
+
+        if options['errors']:
+            with open(options['errors'], 'w', newline='') as report:
+                write_error_report(result.errors, report)
+            self.stdout.write(f"{len(result.errors)} error(s) written to {options['errors']}.")
+        else:
+            for number, column, message in result.errors[:options['show_errors']]:
+                self.stdout.write(f'  row {number}' + (f' [{column}]' if column else '') + f': {message}')
+            hidden = len(result.errors) - options['show_errors']
+            if hidden > 0:
+                self.stdout.write(f'  ... and {hidden} more (use --errors to write them all).')
@@ -0,0 +1,121 @@
+import io
+from decimal import Decimal
+from unittest import mock
+
+from django.db import IntegrityError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Country, Emirate
+from programs.importers import CatalogImporter, iter_json_array, iter_records
+from programs.models import AcademicIntake, Program, ProgramLevel, ProgramType, TuitionFee
+from students.models import Student
+from universities.models import University
+
+CATALOG_CSV = """university,university_short_name,emirate,established_year,email,program,level,type,fee_amount,fee_currency,intake_name,intake_start,intake_end
+Gulf University,GU,Dubai,1998,admissions@gulf.test,BSc Computing,Bachelor's,BSc,45000,aed,Fall 2030,2030-09-01,2031-06-30
+Gulf University,GU,Dubai,1998,admissions@gulf.test,MBA,Master's,MBA,"60,000",AED,Fall 2030,2030-09-01,2031-06-30
+Gulf University,GU,Dubai,1998,admissions@gulf.test,MBA,Master's,MBA,60000,AED,Spring 2031,2031-01-15,2031-06-30
+Nowhere University,,Atlantis,,,BSc Computing,Bachelor's,BSc,-1,AED,,,
+"""
+
+
+def run_import(text, fmt='csv', **options):
+    return CatalogImporter(**options).run(iter_records(io.StringIO(text), fmt))
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class CatalogImporterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        uae = Country.objects.create(name='United Arab Emirates', country_code='ARE')
+        Emirate.objects.create(name='Dubai', country=uae)
+        bachelor = ProgramLevel.objects.create(name="Bachelor's")
+        master = ProgramLevel.objects.create(name="Master's")
+        ProgramType.objects.create(name='BSc', level=bachelor, duration=4, entry_requirements='Grade 12')
+        ProgramType.objects.create(name='MBA', level=master, duration=2, entry_requirements='Bachelor degree')
+
+    def test_imports_valid_rows_and_reports_invalid_ones(self):
+        result = run_import(CATALOG_CSV, batch_size=2)
+
+        self.assertEqual((result.rows, result.imported, result.failed_rows), (4, 3, 1))
+        university = University.objects.get(name='Gulf University')
+        self.assertEqual(university.location_emirate.name, 'Dubai')
+        self.assertEqual(university.contact_info.email, 'admissions@gulf.test')
+        self.assertEqual(university.slug, 'gulf-university')
+        mba = Program.objects.get(university=university, name='MBA')
+        self.assertEqual(mba.slug, 'mba-gu')
+        # Rows repeating a program add its fees/intakes once each
+        self.assertEqual(list(mba.tuition_fees.values_list('amount', flat=True)), [Decimal('60000.00')])
+        self.assertEqual(sorted(mba.intakes.values_list('name', flat=True)), ['Fall 2030', 'Spring 2031'])
+        self.assertEqual(
+            {column for number, column, _ in result.errors if number == 5},
+            {'emirate', 'established_year', 'fee_amount'},
+        )
+
+    def test_reimport_updates_present_columns_and_replaces_fees(self):
+        run_import(CATALOG_CSV)
+        university_id = University.objects.get(name='Gulf University').pk
+        result = run_import(
+            '{"university": "Gulf University", "program": "MBA", "description": "Updated", "fee_amount": 65000}\n',
+            fmt='jsonl',
+        )
+
+        self.assertEqual((result.universities_updated, result.programs_updated, result.errors), (1, 1, []))
+        mba = Program.objects.get(university_id=university_id, name='MBA')
+        self.assertEqual(mba.description, 'Updated')
+        self.assertEqual(mba.type.name, 'MBA')
+        self.assertEqual(University.objects.get(pk=university_id).short_name, 'GU')
+        self.assertEqual(list(mba.tuition_fees.values_list('amount', flat=True)), [Decimal('65000.00')])
+        # No intake columns, so the intakes stay
+        self.assertEqual(mba.intakes.count(), 2)
+
+    def test_rejected_batch_leaves_no_trace(self):
+        insert_fees = TuitionFee.objects.bulk_create
+        calls = []
+
+        def fail_second_batch(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise IntegrityError('simulated failure')
+            return insert_fees(*args, **kwargs)
+
+        rows = CATALOG_CSV.splitlines()[:3] + [CATALOG_CSV.splitlines()[2]]
+        with mock.patch.object(TuitionFee.objects, 'bulk_create', side_effect=fail_second_batch):
+            result = run_import('\n'.join(rows) + '\n', batch_size=1)
+
+        self.assertEqual((result.imported, [number for number, _, _ in result.errors]), (2, [3]))
+        self.assertEqual(
+            (result.universities_created, result.universities_updated, result.programs_created,
+             result.programs_updated, result.fees),
+            (1, 1, 2, 0, 2),
+        )
+        # The retried program gets its fee although the rejected batch had the same one
+        mba = Program.objects.get(name='MBA')
+        self.assertEqual(list(mba.tuition_fees.values_list('amount', flat=True)), [Decimal('60000.00')])
+
+    def test_dry_run_saves_nothing(self):
+        result = run_import(CATALOG_CSV, dry_run=True)
+
+        self.assertEqual(result.imported, 3)
+        self.assertFalse(University.objects.exists())
+        self.assertFalse(TuitionFee.objects.exists() or AcademicIntake.objects.exists())
+
+    def test_json_array_is_read_in_chunks(self):
+        text = '[{"a": "x, ]"}, {"b": [1, 2]} ,\n {"c": {"d": null}}]'
+        self.assertEqual(
+            list(iter_json_array(io.StringIO(text), chunk_size=3)),
+            [{'a': 'x, ]'}, {'b': [1, 2]}, {'c': {'d': None}}],
+        )
+
+    def test_admin_upload(self):
+        staff = Student.objects.create_superuser('staff', 'staff@example.test', 'password')
+        self.client.force_login(staff)
+        upload = SimpleUploadedFile('catalog.csv', CATALOG_CSV.encode())
+
+        response = self.client.post(reverse('admin:programs_program_import'), {'catalog': upload})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Unknown emirate')
+        self.assertEqual(Program.objects.count(), 2)
@@ -1,9 +1,16 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = 'programs'
 
+# Async variants run natively under ASGI (uvicorn); see CATALOG_ASYNC_VIEWS
+if settings.CATALOG_ASYNC_VIEWS:
+    list_view, detail_view = views.AsyncProgramListView, views.AsyncProgramDetailView
+else:
+    list_view, detail_view = views.ProgramListView, views.ProgramDetailView
+
 urlpatterns = [
-    path('', views.ProgramListView.as_view(), name='list'),
-    path('<slug:slug>/', views.ProgramDetailView.as_view(), name='detail'),
+    path('', list_view.as_view(), name='list'),
+    path('<slug:slug>/', detail_view.as_view(), name='detail'),
 ]
@@ -1,9 +1,32 @@
+from django.http import Http404
+from django.template.response import TemplateResponse
+from django.utils import timezone
+from django.views import View
 from django.views.generic import ListView, DetailView
 from .models import Program
 
 from django.contrib.auth.mixins import LoginRequiredMixin
+from core.async_views import AsyncLoginRequiredMixin, apaginate
 from students.models import StudentUniversityVisit
 
+
+def program_list_queryset():
+    return Program.objects.filter(is_active=True).select_related('university', 'type__level')
+
+
+def program_detail_queryset():
+    # Everything the detail page follows from the program, in one query
+    return Program.objects.select_related(
+        'type', 'university__location_emirate__country', 'university__country',
+    )
+
+
+def next_intake_queryset(program):
+    return program.intakes.filter(
+        start_date__gte=timezone.now().date()
+    ).order_by('start_date')
+
+
 class ProgramListView(ListView):
     model = Program
     template_name = 'programs/program_list.html'
@@ -11,7 +34,7 @@ class ProgramListView(ListView):
     paginate_by = 20
     
     def get_queryset(self):
-        return Program.objects.filter(is_active=True).select_related('university', 'type__level')
+        return program_list_queryset()
 
 class ProgramDetailView(LoginRequiredMixin, DetailView):
     model = Program
@@ -19,15 +42,51 @@ class ProgramDetailView(LoginRequiredMixin, DetailView):
     context_object_name = 'program'
     slug_field = 'slug'
     slug_url_kwarg = 'slug'
+
+    def get_queryset(self):
+        return program_detail_queryset()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        from django.utils import timezone
-        context['next_intake'] = self.object.intakes.filter(
-            start_date__gte=timezone.now().date()
-        ).order_by('start_date').first()
+        program = self.object
+        # One query each; the template used to re-run these on every use
+        context.update({
+            'next_intake': next_intake_queryset(program).first(),
+            'intake': program.intakes.first(),
+            'tuition_fee': program.tuition_fees.first(),
+            'english_requirement': program.english_requirements.first(),
+        })
         return context
 
-    def get(self, request, *args, **kwargs):
-        self.object = self.get_object()
-        context = self.get_context_data(object=self.object)
-        return self.render_to_response(context)
+
+class AsyncProgramListView(View):
+    """Async ProgramListView for ASGI deployments (see CATALOG_ASYNC_VIEWS)"""
+    template_name = ProgramListView.template_name
+    paginate_by = ProgramListView.paginate_by
+
+    async def get(self, request, *args, **kwargs):
+        context = await apaginate(request, program_list_queryset(), self.paginate_by)
+        context['programs'] = context['object_list']
+        context['view'] = self
+        return TemplateResponse(request, self.template_name, context)
+
+
+class AsyncProgramDetailView(AsyncLoginRequiredMixin, View):
+    """Async ProgramDetailView for ASGI deployments (see CATALOG_ASYNC_VIEWS)"""
+    template_name = ProgramDetailView.template_name
+
+    async def get(self, request, slug, *args, **kwargs):
+        try:
+            program = await program_detail_queryset().aget(slug=slug)
+        except Program.DoesNotExist:
+            raise Http404('No program found matching the query')
+        context = {
+            'object': program,
+            'program': program,
+            'view': self,
+            'next_intake': await next_intake_queryset(program).afirst(),
+            'intake': await program.intakes.afirst(),
+            'tuition_fee': await program.tuition_fees.afirst(),
+            'english_requirement': await program.english_requirements.afirst(),
+        }
+        return TemplateResponse(request, self.template_name, context)
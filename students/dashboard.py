@@ -0,0 +1,78 @@
+"""
+Student dashboard data service.
+
+Collects everything the dashboard renders in a fixed number of queries,
+independent of how many applications, logs, documents or scores a student has.
+"""
+from django.db.models import BooleanField, Count, ExpressionWrapper, Q
+from django.utils import timezone
+
+from core.cache import STUDENT, cached
+
+# Documents listed in the dashboard sidebar
+DASHBOARD_DOCUMENT_LIMIT = 5
+# Also bounds how long catalog renames or score expiry take to show up
+DASHBOARD_CACHE_TIMEOUT = 300
+
+
+def get_application_status_counts(student):
+    """Return total and per-status application counts in one query"""
+    from applications.models import Application
+
+    statuses = [value for value, _ in Application._meta.get_field('status').choices]
+    return Application.objects.filter(student=student).aggregate(
+        total=Count('pk'),
+        **{status: Count('pk', filter=Q(status=status)) for status in statuses},
+    )
+
+
+def get_dashboard_applications(student):
+    """Applications with their university and program; the timeline preview uses log_count"""
+    from applications.models import Application
+
+    return list(Application.objects.filter(student=student).select_related('university', 'program'))
+
+
+def get_test_scores(student, today=None):
+    """Return (active, expired) test scores from a single annotated query"""
+    today = today or timezone.now().date()
+    scores = student.test_scores.annotate(
+        is_expired=ExpressionWrapper(Q(expiry_date__lt=today), output_field=BooleanField()),
+    )
+    active, expired = [], []
+    for score in scores:
+        (expired if score.is_expired else active).append(score)
+    return active, expired
+
+
+def get_dashboard_documents(student):
+    """Return (recent documents, total count), counting only when the list is full"""
+    documents = list(student.documents.all()[:DASHBOARD_DOCUMENT_LIMIT])
+    if len(documents) < DASHBOARD_DOCUMENT_LIMIT:
+        return documents, len(documents)
+    return documents, student.documents.count()
+
+
+def get_dashboard_data(student):
+    """Build the dashboard context for a student, cached until their data changes"""
+    return cached(
+        'dashboard', student.pk, compute=lambda: build_dashboard_data(student),
+        timeout=DASHBOARD_CACHE_TIMEOUT, group=STUDENT, scope=student.pk,
+    )
+
+
+def build_dashboard_data(student):
+    """Build the dashboard context for a student"""
+    status_counts = get_application_status_counts(student)
+    documents, document_count = get_dashboard_documents(student)
+    active_scores, expired_scores = get_test_scores(student)
+
+    return {
+        'applications': get_dashboard_applications(student),
+        'status_counts': status_counts,
+        'pending_count': status_counts['pending'],
+        'documents': documents,
+        'document_count': document_count,
+        'test_scores': active_scores,
+        'expired_test_scores': expired_scores,
+    }
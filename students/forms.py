@@ -1,5 +1,6 @@
 from django import forms
 from .models import Student, StudentDocument, StudentTestScore
+from .usernames import base_username, next_free_username, save_with_unique_username
 
 class StudentRegisterForm(forms.ModelForm):
     password = forms.CharField(
@@ -34,6 +35,12 @@ class StudentRegisterForm(forms.ModelForm):
             }),
         }
 
+    def clean_email(self):
+        email = self.cleaned_data.get('email', '')
+        if email and Student.objects.filter_by_email(email).exists():
+            raise forms.ValidationError("An account with this email already exists.")
+        return email
+
     def clean(self):
         cleaned_data = super().clean()
         password = cleaned_data.get("password")
@@ -48,29 +55,15 @@ class StudentRegisterForm(forms.ModelForm):
         user = super().save(commit=False)
         user.set_password(self.cleaned_data["password"])
         
-        # Auto-generate username
-        import random
-        import string
-        
-        first_name = self.cleaned_data.get('first_name', '').lower()
-        last_name = self.cleaned_data.get('last_name', '').lower()
-        
-        # Sanitize names to keep only alphanumeric characters
-        first_name = "".join(c for c in first_name if c.isalnum())
-        last_name = "".join(c for c in last_name if c.isalnum())
-        
-        base_username = f"{first_name}.{last_name}"
-        username = base_username
-        
-        # Ensure uniqueness
-        while Student.objects.filter(username=username).exists():
-            random_suffix = ''.join(random.choices(string.digits, k=4))
-            username = f"{base_username}{random_suffix}"
-            
-        user.username = username
+        # Auto-generate a unique username from first.last
+        first_name = self.cleaned_data.get('first_name', '')
+        last_name = self.cleaned_data.get('last_name', '')
         
         if commit:
-            user.save()
+            save_with_unique_username(user, first_name, last_name)
+            self._save_m2m()
+        else:
+            user.username = next_free_username(base_username(first_name, last_name))
         return user
 
 class StudentProfileForm(forms.ModelForm):
@@ -92,6 +85,12 @@ class StudentProfileForm(forms.ModelForm):
             'profile_picture': forms.FileInput(attrs={'class': 'w-full px-4 py-3 rounded-lg border border-[#e7e2da] dark:border-[#3a2d1b] bg-background-light dark:bg-background-dark text-[#181510] dark:text-white focus:border-primary focus:ring-1 focus:ring-primary outline-none transition-all'}),
         }
 
+    def clean_email(self):
+        email = self.cleaned_data.get('email', '')
+        if email and Student.objects.filter_by_email(email).exclude(pk=self.instance.pk).exists():
+            raise forms.ValidationError("An account with this email already exists.")
+        return email
+
 class MultipleDocumentUploadForm(forms.Form):
     passport = forms.FileField(
         label="Passport Copy",
@@ -2,10 +2,18 @@
 Django management command to clean up expired test scores.
 Run this command periodically (e.g., daily via cron) to remove expired test scores.
 
+Rows are deleted in primary-key ordered batches so each transaction stays short,
+and uploaded report files are removed from storage after their batch commits.
+
 Usage:
     python manage.py cleanup_expired_scores
+    python manage.py cleanup_expired_scores --batch-size 500 --sleep 0.2
 """
-from django.core.management.base import BaseCommand
+import time
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from django.utils import timezone
 from students.models import StudentTestScore
 
@@ -19,12 +27,28 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be deleted without actually deleting',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of scores deleted per transaction (default: 1000)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.0,
+            help='Seconds to pause between batches to reduce load (default: 0)',
+        )
 
     def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
         today = timezone.now().date()
         dry_run = options['dry_run']
+        batch_size = options['batch_size']
 
-        # Find all expired test scores
+        # Find all expired test scores (served by the expiry_date index)
         expired_scores = StudentTestScore.objects.filter(
             expiry_date__lt=today
         )
@@ -41,16 +65,54 @@ class Command(BaseCommand):
                     f'DRY RUN: Would delete {count} expired test score(s):'
                 )
             )
-            for score in expired_scores:
+            rows = expired_scores.order_by('pk').values_list(
+                'student__username', 'test_type', 'expiry_date'
+            ).iterator(chunk_size=batch_size)
+            for username, test_type, expiry_date in rows:
                 self.stdout.write(
-                    f'  - {score.student.username}: {score.test_type} '
-                    f'(expired on {score.expiry_date})'
+                    f'  - {username}: {test_type} '
+                    f'(expired on {expiry_date})'
                 )
-        else:
-            # Delete expired scores
-            deleted_count, _ = expired_scores.delete()
+            return
+
+        deleted_count = 0
+        files_removed = 0
+        last_pk = None
+        started = time.monotonic()
+
+        while True:
+            batch = expired_scores.order_by('pk')
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            rows = list(batch.values_list('pk', 'report_file')[:batch_size])
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+
+            with transaction.atomic():
+                deleted, _ = StudentTestScore.objects.filter(
+                    pk__in=[pk for pk, _ in rows]
+                ).delete()
+            deleted_count += deleted
+
+            for _, report_file in rows:
+                if report_file and default_storage.exists(report_file):
+                    default_storage.delete(report_file)
+                    files_removed += 1
+
+            elapsed = time.monotonic() - started
             self.stdout.write(
-                self.style.SUCCESS(
-                    f'Successfully deleted {deleted_count} expired test score(s).'
-                )
+                f'  {deleted_count}/{count} deleted '
+                f'({deleted_count / elapsed if elapsed else 0:.0f} rows/s)'
             )
+
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully deleted {deleted_count} expired test score(s) '
+                f'and {files_removed} report file(s) in {elapsed:.1f}s.'
+            )
+        )
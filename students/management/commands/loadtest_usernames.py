@@ -0,0 +1,85 @@
+"""
+Django management command to load-test username allocation under contention.
+
+Registers many students with the same first and last name from parallel
+threads (each with its own database connection) and checks that every signup
+got a distinct username. Use a PostgreSQL database; SQLite serialises writers.
+
+Usage:
+    python manage.py loadtest_usernames --count 5000 --workers 32
+    python manage.py loadtest_usernames --cleanup
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from students.models import Student
+from students.usernames import save_with_unique_username
+
+LOADTEST_EMAIL_DOMAIN = 'loadtest.trikoned.test'
+
+
+class Command(BaseCommand):
+    help = 'Register many same-named students in parallel and verify username uniqueness'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=2000, help='Students to register (default: 2000)')
+        parser.add_argument('--workers', type=int, default=16, help='Parallel threads (default: 16)')
+        parser.add_argument('--first-name', default='Mohammed')
+        parser.add_argument('--last-name', default='Ali')
+        parser.add_argument(
+            '--cleanup',
+            action='store_true',
+            help='Delete students created by previous runs and exit',
+        )
+
+    def handle(self, *args, **options):
+        load_test_students = Student.objects.filter(email__endswith=f'@{LOADTEST_EMAIL_DOMAIN}')
+        if options['cleanup']:
+            deleted, _ = load_test_students.delete()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} load-test row(s).'))
+            return
+
+        run_id = int(time.time())
+        attempts = []
+        errors = []
+        lock = threading.Lock()
+
+        def register(index):
+            try:
+                student = Student(
+                    first_name=options['first_name'],
+                    last_name=options['last_name'],
+                    email=f'{run_id}.{index}@{LOADTEST_EMAIL_DOMAIN}',
+                )
+                student.set_unusable_password()
+                used = save_with_unique_username(student, student.first_name, student.last_name)
+                with lock:
+                    attempts.append(used)
+            except Exception as exc:
+                with lock:
+                    errors.append(repr(exc))
+            finally:
+                connections.close_all()
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            list(pool.map(register, range(options['count'])))
+        elapsed = time.monotonic() - started
+
+        created = load_test_students.filter(email__startswith=f'{run_id}.')
+        usernames = created.values_list('username', flat=True)
+        distinct = created.values('username').distinct().count()
+        retries = sum(attempts) - len(attempts)
+
+        self.stdout.write(f'Registered: {len(attempts)} in {elapsed:.1f}s ({len(attempts) / elapsed:.0f}/s)')
+        self.stdout.write(f'Insert retries: {retries} (max attempts for one signup: {max(attempts, default=0)})')
+        self.stdout.write(f'Distinct usernames: {distinct} of {usernames.count()}')
+        if errors:
+            self.stdout.write(self.style.ERROR(f'{len(errors)} signup(s) failed, first error: {errors[0]}'))
+        if errors or distinct != len(attempts):
+            raise CommandError('Username allocation load test failed.')
+        self.stdout.write(self.style.SUCCESS('All signups received unique usernames.'))
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.8 on 2026-10-19 13:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0002_alter_studentuniversityvisit_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentdocument',
+            name='sha256',
+            field=models.CharField(blank=True, help_text='SHA-256 of the file content, used for deduplication', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='studentdocument',
+            index=models.Index(fields=['student', 'sha256'], name='students_st_student_3dbc50_idx'),
+        ),
+    ]
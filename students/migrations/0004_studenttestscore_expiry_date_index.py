@@ -0,0 +1,17 @@
+# Generated by Django 4.2.8 on 2026-10-19 13:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0003_studentdocument_sha256'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studenttestscore',
+            index=models.Index(fields=['expiry_date'], name='students_st_expiry__5d7a1f_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.8 on 2026-10-19 13:20
+
+from django.db import migrations, models
+import django.db.models.functions.text
+import students.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0004_studenttestscore_expiry_date_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='student',
+            managers=[
+                ('objects', students.models.StudentManager()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='student',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), condition=models.Q(('email', ''), _negated=True), name='students_student_email_ci_unique'),
+        ),
+    ]
@@ -3,7 +3,15 @@ Students App Models
 """
 import uuid
 from django.db import models
-from django.contrib.auth.models import AbstractUser
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.contrib.auth.models import AbstractUser, UserManager
+
+
+class StudentManager(UserManager):
+    def filter_by_email(self, email):
+        """Case-insensitive email match served by the unique lower(email) index"""
+        return self.alias(email_lower=Lower('email')).filter(email_lower=email.lower()).exclude(email='')
 
 
 class Student(AbstractUser):
@@ -24,8 +32,18 @@ class Student(AbstractUser):
     verification_token = models.CharField(max_length=100, blank=True)
     profile_picture = models.ImageField(upload_to='student_profiles/', blank=True, null=True)
     
+    objects = StudentManager()
+    
     class Meta:
         ordering = ['last_name', 'first_name']
+        constraints = [
+            # Blank emails are allowed (e.g. superusers), so the constraint is partial
+            models.UniqueConstraint(
+                Lower('email'),
+                condition=~Q(email=''),
+                name='students_student_email_ci_unique',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name}" if self.first_name else self.username
@@ -45,9 +63,11 @@ class StudentDocument(models.Model):
     file_url = models.FileField(upload_to='documents/%Y/%m/')
     uploaded_at = models.DateTimeField(auto_now_add=True)
     file_name = models.CharField(max_length=255, blank=True)
+    sha256 = models.CharField(max_length=64, blank=True, help_text="SHA-256 of the file content, used for deduplication")
     
     class Meta:
         ordering = ['-uploaded_at']
+        indexes = [models.Index(fields=['student', 'sha256'])]
     
     def __str__(self):
         return f"{self.student.username} - {self.doc_type}"
@@ -103,6 +123,7 @@ class StudentTestScore(models.Model):
 
     class Meta:
         ordering = ['-test_date']
+        indexes = [models.Index(fields=['expiry_date'])]
 
     def save(self, *args, **kwargs):
         if self.test_date and self.validity_years:
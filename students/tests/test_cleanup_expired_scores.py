@@ -0,0 +1,62 @@
+import datetime
+import io
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+
+from core.tests.fixtures import FixtureTestCase
+from students.models import StudentTestScore
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class CleanupExpiredScoresTests(FixtureTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        student = cls.fixture.student
+        cls.expired = [cls.fixture.scores[0]] + [
+            StudentTestScore.objects.create(student=student, test_type='PTE', test_date=datetime.date(2001, 1, day))
+            for day in range(1, 5)
+        ]
+        cls.valid = cls.fixture.scores[1]
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def cleanup(self, *args):
+        out = io.StringIO()
+        call_command('cleanup_expired_scores', *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_lists_without_deleting(self):
+        output = self.cleanup('--dry-run', '--batch-size', '2')
+        self.assertIn('DRY RUN: Would delete 5 expired test score(s):', output)
+        self.assertIn(f'  - {self.fixture.student.username}: IELTS (expired on 2002-01-01)', output)
+        self.assertEqual(StudentTestScore.objects.count(), 6)
+
+    def test_deletes_in_batches_with_their_report_files(self):
+        report = default_storage.save('test_reports/pte.pdf', ContentFile(b'%PDF-1.4 report'))
+        StudentTestScore.objects.filter(pk=self.expired[2].pk).update(report_file=report)
+
+        output = self.cleanup('--batch-size', '2')
+        self.assertEqual(output.count('deleted ('), 3)
+        self.assertIn('  5/5 deleted', output)
+        self.assertIn('Successfully deleted 5 expired test score(s) and 1 report file(s)', output)
+        self.assertEqual(list(StudentTestScore.objects.values_list('pk', flat=True)), [self.valid.pk])
+        self.assertFalse(default_storage.exists(report))
+
+        self.assertIn('No expired test scores found.', self.cleanup())
+
+    def test_batch_size_must_be_positive(self):
+        for batch_size in ('0', '-5'):
+            with self.assertRaisesMessage(CommandError, '--batch-size must be at least 1'):
+                self.cleanup('--batch-size', batch_size)
+        self.assertEqual(StudentTestScore.objects.count(), 6)
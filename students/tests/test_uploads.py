@@ -0,0 +1,29 @@
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from core.tests.fixtures import CachedFixtureTestCase
+from students.dashboard import get_dashboard_data
+from students.uploads import save_student_documents
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class DocumentUploadTests(CachedFixtureTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def test_dashboard_shows_bulk_created_documents(self):
+        student = self.fixture.student
+        before = get_dashboard_data(student)['document_count']
+        with self.captureOnCommitCallbacks(execute=True):
+            created = save_student_documents(
+                student, others=[SimpleUploadedFile('offer.pdf', b'%PDF-1.4 offer letter')],
+            )
+        self.assertEqual(len(created), 1)
+        self.assertEqual(get_dashboard_data(student)['document_count'], before + 1)
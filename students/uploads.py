@@ -0,0 +1,198 @@
+"""
+Student document upload pipeline.
+
+Uploads are streamed chunk by chunk to a temporary file while a SHA-256 digest
+is computed, so size and type limits are enforced before the full body is held
+in memory. Saving then deduplicates identical files per student, creates all
+rows with a single bulk_create and removes replaced files in the background.
+"""
+import hashlib
+import os
+from functools import partial
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+from django.db import transaction
+from django.template.defaultfilters import filesizeformat
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from core.background import run_in_background
+from core.cache import STUDENT, invalidate_group
+from .models import StudentDocument
+
+def get_max_upload_size():
+    return getattr(settings, 'DOCUMENT_UPLOAD_MAX_SIZE', 10 * 1024 * 1024)
+
+
+def get_allowed_extensions():
+    return getattr(settings, 'DOCUMENT_UPLOAD_ALLOWED_EXTENSIONS', ['.pdf', '.jpg', '.jpeg', '.png'])
+
+
+class DocumentUploadHandler(TemporaryFileUploadHandler):
+    """Stream uploads to disk, hashing and size-checking every chunk.
+
+    Rejected files are skipped without buffering the rest of their body and
+    recorded on ``request.rejected_uploads`` as (field_name, message) pairs.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        if request is not None and not hasattr(request, 'rejected_uploads'):
+            request.rejected_uploads = []
+
+    def _reject(self, message):
+        if self.request is not None:
+            self.request.rejected_uploads.append((self.field_name, message))
+        # MultiPartParser closes ``handler.file`` on SkipFile, so drop it here
+        if hasattr(self, 'file'):
+            self.file.close()
+            del self.file
+        raise SkipFile(message)
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        self.field_name = field_name
+        if hasattr(self, 'file'):
+            # The previous file was already handed to the parser
+            del self.file
+        self.hasher = hashlib.sha256()
+        self.received = 0
+
+        extension = os.path.splitext(file_name or '')[1].lower()
+        if extension not in get_allowed_extensions():
+            self._reject(
+                f"{file_name}: file type not allowed. Allowed types: {', '.join(get_allowed_extensions())}."
+            )
+        if content_length and content_length > get_max_upload_size():
+            self._reject(f"{file_name}: file is larger than {filesizeformat(get_max_upload_size())}.")
+
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > get_max_upload_size():
+            self._reject(f"{self.file_name}: file is larger than {filesizeformat(get_max_upload_size())}.")
+        self.hasher.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        uploaded.sha256 = self.hasher.hexdigest()
+        return uploaded
+
+
+class DocumentUploadMixin:
+    """Install DocumentUploadHandler for a view's POST body.
+
+    Upload handlers must be swapped before anything reads request.POST, and
+    CsrfViewMiddleware does exactly that, so CSRF checking is deferred to the
+    view itself (the pattern recommended by the Django docs).
+    """
+
+    @method_decorator(csrf_exempt)
+    def dispatch(self, request, *args, **kwargs):
+        request.upload_handlers = [DocumentUploadHandler(request)]
+        return csrf_protect(super().dispatch)(request, *args, **kwargs)
+
+    def add_upload_errors(self, form):
+        """Copy rejected uploads onto the form; return True if any were rejected"""
+        rejected = getattr(self.request, 'rejected_uploads', [])
+        for field_name, message in rejected:
+            form.add_error(field_name if field_name in form.fields else None, message)
+        return bool(rejected)
+
+
+def file_sha256(uploaded_file):
+    """Return the SHA-256 of an uploaded file, reusing the handler's digest"""
+    digest = getattr(uploaded_file, 'sha256', None)
+    if digest:
+        return digest
+    hasher = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        hasher.update(chunk)
+    uploaded_file.seek(0)
+    return hasher.hexdigest()
+
+
+def delete_stored_files(names):
+    """Delete files from default storage, ignoring ones already gone"""
+    for name in names:
+        if name and default_storage.exists(name):
+            default_storage.delete(name)
+
+
+def save_student_documents(student, replacements=None, others=()):
+    """Persist uploaded documents for a student.
+
+    ``replacements`` maps a replaceable doc type (passport, transcript) to an
+    uploaded file; the previous documents of that type are removed. ``others``
+    are appended as 'other' documents. Files whose content the student has
+    already uploaded reuse the stored copy instead of being written again.
+
+    Returns the list of newly created StudentDocument rows.
+    """
+    replacements = {doc_type: f for doc_type, f in (replacements or {}).items() if f}
+    pending = [(doc_type, f, file_sha256(f)) for doc_type, f in replacements.items()]
+    pending += [('other', f, file_sha256(f)) for f in others if f]
+    if not pending:
+        return []
+
+    with transaction.atomic():
+        existing = list(
+            StudentDocument.objects.filter(student=student)
+            .values_list('id', 'doc_type', 'sha256', 'file_url')
+        )
+        stored_by_hash = {sha: name for _, _, sha, name in existing if sha}
+        kept_types_by_hash = {}
+        for _, doc_type, sha, _ in existing:
+            if sha:
+                kept_types_by_hash.setdefault(sha, set()).add(doc_type)
+
+        replaced_ids = []
+        new_documents = []
+        seen = set()
+        for doc_type, uploaded, sha in pending:
+            if (doc_type, sha) in seen:
+                continue
+            seen.add((doc_type, sha))
+
+            if doc_type in replacements:
+                old = [(pk, row_sha) for pk, row_type, row_sha, _ in existing if row_type == doc_type]
+                if old and all(row_sha == sha for _, row_sha in old):
+                    # Re-upload of the current file: nothing to do
+                    continue
+                replaced_ids += [pk for pk, _ in old]
+            elif doc_type in kept_types_by_hash.get(sha, ()):
+                continue
+
+            document = StudentDocument(
+                student=student,
+                doc_type=doc_type,
+                file_name=uploaded.name,
+                sha256=sha,
+            )
+            if sha in stored_by_hash:
+                document.file_url.name = stored_by_hash[sha]
+            else:
+                document.file_url.save(uploaded.name, uploaded, save=False)
+                stored_by_hash[sha] = document.file_url.name
+            new_documents.append(document)
+
+        replaced_names = {name for pk, _, _, name in existing if pk in replaced_ids}
+        if replaced_ids:
+            StudentDocument.objects.filter(pk__in=replaced_ids).delete()
+        StudentDocument.objects.bulk_create(new_documents)
+        # bulk_create sends no post_save, so the cache signals miss these rows
+        if new_documents:
+            transaction.on_commit(partial(invalidate_group, STUDENT, student.pk))
+
+        # Only delete files that no remaining row points at
+        still_referenced = set(
+            StudentDocument.objects.filter(file_url__in=replaced_names).values_list('file_url', flat=True)
+        ) if replaced_names else set()
+        orphaned = replaced_names - still_referenced
+        if orphaned:
+            transaction.on_commit(lambda: run_in_background(delete_stored_files, sorted(orphaned)))
+
+    return new_documents
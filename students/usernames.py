@@ -0,0 +1,73 @@
+"""
+Username allocation for new students.
+
+Usernames are derived from the student's name (``first.last``). When that base
+is taken, the next free numeric suffix comes from one indexed prefix query
+instead of probing random suffixes one by one, and signups racing for the same
+name are resolved by retrying the insert when it hits the unique constraint.
+"""
+import random
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models import BigIntegerField, Count, Max, Q
+from django.db.models.functions import Cast, Substr
+
+from .models import Student
+
+MAX_ATTEMPTS = 20
+# Suffixes are at most this many digits, which keeps the Cast within BIGINT
+MAX_SUFFIX_DIGITS = 12
+
+
+def base_username(first_name, last_name):
+    """Build the ``first.last`` base from the alphanumeric parts of a name"""
+    first_name = "".join(c for c in (first_name or '').lower() if c.isalnum())
+    last_name = "".join(c for c in (last_name or '').lower() if c.isalnum())
+    if not first_name and not last_name:
+        return 'student'
+    # Leave room for a suffix within the 150 character username limit
+    return f"{first_name}.{last_name}"[:150 - MAX_SUFFIX_DIGITS]
+
+
+def next_free_username(base, spread=0):
+    """Return base, or base followed by the next unused numeric suffix.
+
+    A single aggregate over the ``username LIKE 'base%'`` index range tells
+    whether the bare base is taken and what the highest numeric suffix is.
+    ``spread`` adds a random offset so concurrent retries don't all pick the
+    same suffix again.
+    """
+    pattern = rf'^{re.escape(base)}[0-9]{{1,{MAX_SUFFIX_DIGITS}}}$'
+    stats = Student.objects.filter(username__startswith=base).aggregate(
+        base_taken=Count('pk', filter=Q(username=base)),
+        max_suffix=Max(
+            Cast(Substr('username', len(base) + 1), BigIntegerField()),
+            filter=Q(username__regex=pattern),
+        ),
+    )
+    if not stats['base_taken'] and not spread:
+        return base
+    suffix = (stats['max_suffix'] or 0) + 1
+    if spread:
+        suffix += random.randrange(spread)
+    return f"{base}{suffix}"
+
+
+def save_with_unique_username(user, first_name, last_name):
+    """Assign a unique username to an unsaved student and insert it.
+
+    Returns the number of insert attempts that were needed.
+    """
+    base = base_username(first_name, last_name)
+    for attempt in range(MAX_ATTEMPTS):
+        user.username = next_free_username(base, spread=attempt * 10)
+        try:
+            with transaction.atomic():
+                user.save()
+            return attempt + 1
+        except IntegrityError:
+            # Only retry when another signup took this username first
+            if not Student.objects.filter(username=user.username).exists():
+                raise
+    raise IntegrityError(f"Could not allocate a unique username for base '{base}'")
@@ -5,13 +5,35 @@ from django.shortcuts import redirect
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 from django.contrib import messages
-from .models import Student, StudentDocument, StudentTestScore
+from django.conf import settings
+from .models import Student, StudentTestScore
 from .forms import StudentRegisterForm, MultipleDocumentUploadForm, StudentProfileForm, StudentTestScoreForm
+from .uploads import DocumentUploadMixin, save_student_documents
+from .dashboard import get_dashboard_data
+from core.throttling import check_login_allowed, record_login_failure, record_login_success
 
 class StudentLoginView(LoginView):
     template_name = 'students/login.html'
     redirect_authenticated_user = True
-    
+    throttled_message = 'Too many login attempts. Please wait a few minutes and try again.'
+
+    def post(self, request, *args, **kwargs):
+        # Reject throttled attempts before the form authenticates (and hashes)
+        if not check_login_allowed(request, request.POST.get('username')):
+            context = self.get_context_data(form=self.form_class(request), throttled_message=self.throttled_message)
+            response = self.render_to_response(context, status=429)
+            response['Retry-After'] = str(settings.LOGIN_THROTTLE_WINDOW)
+            return response
+        return super().post(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        record_login_success(self.request, self.request.POST.get('username'))
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        record_login_failure(self.request, self.request.POST.get('username'))
+        return super().form_invalid(form)
+
     def get_success_url(self):
         return reverse_lazy('students:dashboard')
 
@@ -31,24 +53,7 @@ class StudentDashboardView(LoginRequiredMixin, TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        from applications.models import Application
-        from django.utils import timezone
-        
-        user_applications = Application.objects.filter(student=self.request.user).select_related('university', 'program').prefetch_related('logs')
-        context['applications'] = user_applications
-        context['pending_count'] = user_applications.filter(status='pending').count()
-        context['documents'] = self.request.user.documents.all()
-        
-        # Get test scores and check for expired ones
-        test_scores = self.request.user.test_scores.all()
-        today = timezone.now().date()
-        
-        # Filter expired scores
-        expired_scores = [score for score in test_scores if score.expiry_date and score.expiry_date < today]
-        active_scores = [score for score in test_scores if not score.expiry_date or score.expiry_date >= today]
-        
-        context['test_scores'] = active_scores
-        context['expired_test_scores'] = expired_scores
+        context.update(get_dashboard_data(self.request.user))
         
         # Check if profile is complete
         user = self.request.user
@@ -69,7 +74,7 @@ class StudentProfileView(LoginRequiredMixin, UpdateView):
     def get_object(self):
         return self.request.user
 
-class StudentDocumentUploadView(LoginRequiredMixin, FormView):
+class StudentDocumentUploadView(DocumentUploadMixin, LoginRequiredMixin, FormView):
     form_class = MultipleDocumentUploadForm
     template_name = 'students/document_upload.html'
     success_url = reverse_lazy('students:dashboard')
@@ -83,42 +88,18 @@ class StudentDocumentUploadView(LoginRequiredMixin, FormView):
         return context
 
     def form_valid(self, form):
-        student = self.request.user
-        
-        # Save/Replace Passport
-        if 'passport' in form.cleaned_data and form.cleaned_data['passport']:
-            passport_file = form.cleaned_data['passport']
-            # Delete old passport if exists
-            StudentDocument.objects.filter(student=student, doc_type='passport').delete()
-            StudentDocument.objects.create(
-                student=student,
-                doc_type='passport',
-                file_url=passport_file,
-                file_name=passport_file.name
-            )
-        
-        # Save/Replace Transcript
-        if 'transcript' in form.cleaned_data and form.cleaned_data['transcript']:
-            transcript_file = form.cleaned_data['transcript']
-            # Delete old transcript if exists
-            StudentDocument.objects.filter(student=student, doc_type='transcript').delete()
-            StudentDocument.objects.create(
-                student=student,
-                doc_type='transcript',
-                file_url=transcript_file,
-                file_name=transcript_file.name
-            )
-        
-        # Save Other Documents (append, don't replace)
-        files = self.request.FILES.getlist('other_documents')
-        for f in files:
-            StudentDocument.objects.create(
-                student=student,
-                doc_type='other',
-                file_url=f,
-                file_name=f.name
-            )
-            
+        if self.add_upload_errors(form):
+            return self.form_invalid(form)
+
+        # Passport and transcript replace the existing file, others are appended
+        save_student_documents(
+            self.request.user,
+            replacements={
+                'passport': form.cleaned_data.get('passport'),
+                'transcript': form.cleaned_data.get('transcript'),
+            },
+            others=self.request.FILES.getlist('other_documents'),
+        )
         return super().form_valid(form)
 
 
@@ -173,11 +154,13 @@ class TestScoreDeleteView(LoginRequiredMixin, DeleteView):
     """View to delete a test score"""
     model = StudentTestScore
     success_url = reverse_lazy('students:test_scores')
+    # The list page posts a form (confirmed in JavaScript); there is no confirm page
+    http_method_names = ['post']
     
     def get_queryset(self):
         return StudentTestScore.objects.filter(student=self.request.user)
     
-    def delete(self, request, *args, **kwargs):
+    def form_valid(self, form):
         messages.success(self.request, 'Test score deleted successfully!')
-        return super().delete(request, *args, **kwargs)
+        return super().form_valid(form)
 
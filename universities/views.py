@@ -1,91 +1,166 @@
+from asgiref.sync import sync_to_async
+from django.views import View
 from django.views.generic import ListView, DetailView
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404
+from django.template.response import TemplateResponse
+from core.async_views import AsyncLoginRequiredMixin, apaginate
+from core.cache import REFERENCE, cached
 from students.models import StudentUniversityVisit
 from .models import University
 import string
 
 
+def university_list_queryset():
+    return University.objects.select_related(
+        'location_emirate', 'location_emirate__country', 'country', 'contact_info'
+    ).prefetch_related('programs')
+
+
+def filter_universities(queryset, params, country=None, emirate=None):
+    """Apply the list page filters in params.
+
+    country and emirate are the objects the ``country``/``emirate`` names in
+    params resolved to, or None when no such name exists.
+    """
+    from django.db.models import Q
+
+    # Search
+    search = params.get('search', '')
+    if search:
+        queryset = queryset.filter(name__icontains=search)
+
+    # Filter by country - the name is resolved to an ID by the caller
+    if params.get('country', ''):
+        if country is None:
+            return queryset.none()
+        queryset = queryset.filter(
+            Q(location_emirate__country_id=country.id) | Q(country_id=country.id)
+        )
+
+    # Filter by emirate - the name is resolved to an ID by the caller
+    if params.get('emirate', ''):
+        if emirate is None:
+            return queryset.none()
+        queryset = queryset.filter(location_emirate_id=emirate.id)
+
+    # Filter by type
+    uni_type = params.get('type', '')
+    if uni_type:
+        queryset = queryset.filter(university_type=uni_type)
+
+    # Filter by partner status
+    partner = params.get('partner', '')
+    if partner:
+        queryset = queryset.filter(is_partner=True)
+
+    # A-Z filter
+    letter = params.get('letter', '')
+    if letter:
+        queryset = queryset.filter(name__istartswith=letter)
+
+    return queryset.order_by('name')
+
+
+def get_filter_choices():
+    """Cached countries and emirates for the filter dropdowns"""
+    from core.models import Country, Emirate
+
+    return {
+        'countries': cached(
+            'universities', 'countries', compute=lambda: list(Country.objects.all()), group=REFERENCE,
+        ),
+        'emirates': cached(
+            'universities', 'emirates', compute=lambda: list(Emirate.objects.select_related('country')), group=REFERENCE,
+        ),
+    }
+
+
+def university_detail_queryset():
+    return University.objects.select_related('location_emirate', 'contact_info').prefetch_related(
+        'programs', 'programs__type', 'scholarships', 'accepted_curricula__curriculum',
+        'enrollment_stats', 'visa_sponsorships'
+    )
+
+
 class UniversityListView(ListView):
     """University listing with A-Z navigation and filters"""
     model = University
     template_name = 'universities/university_list.html'
     context_object_name = 'universities'
     paginate_by = 12
-    
+
+    def get_by_name(self, model, name):
+        if not name:
+            return None
+        try:
+            return model.objects.get(name__iexact=name)
+        except model.DoesNotExist:
+            return None
+
     def get_queryset(self):
-        from django.db.models import Q
         from core.models import Country, Emirate
-        
-        queryset = University.objects.select_related('location_emirate', 'location_emirate__country', 'country', 'contact_info').prefetch_related('programs')
-        
-        # Search
-        search = self.request.GET.get('search', '')
-        if search:
-            queryset = queryset.filter(name__icontains=search)
-        
-        # Filter by country - convert name to ID for filtering
-        country_name = self.request.GET.get('country', '')
-        if country_name:
-            try:
-                country = Country.objects.get(name__iexact=country_name)
-                queryset = queryset.filter(
-                    Q(location_emirate__country_id=country.id) | Q(country_id=country.id)
-                )
-            except Country.DoesNotExist:
-                queryset = queryset.none()
-        
-        # Filter by emirate - convert name to ID for filtering
-        emirate_name = self.request.GET.get('emirate', '')
-        if emirate_name:
-            try:
-                emirate = Emirate.objects.get(name__iexact=emirate_name)
-                queryset = queryset.filter(location_emirate_id=emirate.id)
-            except Emirate.DoesNotExist:
-                queryset = queryset.none()
-        
-        # Filter by type
-        uni_type = self.request.GET.get('type', '')
-        if uni_type:
-            queryset = queryset.filter(university_type=uni_type)
-        
-        # Filter by partner status
-        partner = self.request.GET.get('partner', '')
-        if partner:
-            queryset = queryset.filter(is_partner=True)
-        
-        # A-Z filter
-        letter = self.request.GET.get('letter', '')
-        if letter:
-            queryset = queryset.filter(name__istartswith=letter)
-        
-        return queryset.order_by('name')
-    
+
+        params = self.request.GET
+        self.country = self.get_by_name(Country, params.get('country', ''))
+        emirate = self.get_by_name(Emirate, params.get('emirate', ''))
+        return filter_universities(university_list_queryset(), params, self.country, emirate)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        from core.models import Emirate, Country
-        
+        from core.models import Emirate
+
         # Get all countries and emirates
-        context['countries'] = Country.objects.all()
-        context['emirates'] = Emirate.objects.select_related('country').all()
-        
+        context.update(get_filter_choices())
+
         # Get selected country name from URL
-        selected_country_name = self.request.GET.get('country', '')
-        context['selected_country'] = selected_country_name
-        
-        # Filter emirates by selected country (convert name to ID)
-        if selected_country_name:
-            try:
-                country = Country.objects.get(name__iexact=selected_country_name)
-                context['filtered_emirates'] = Emirate.objects.filter(country_id=country.id)
-            except Country.DoesNotExist:
-                context['filtered_emirates'] = Emirate.objects.none()
+        context['selected_country'] = self.request.GET.get('country', '')
+
+        # Filter emirates by selected country (resolved in get_queryset)
+        if self.country is not None:
+            context['filtered_emirates'] = Emirate.objects.filter(country_id=self.country.id)
         else:
             context['filtered_emirates'] = Emirate.objects.none()
-        
+
         context['alphabet'] = string.ascii_uppercase
         context['current_letter'] = self.request.GET.get('letter', '')
         return context
 
+
+class AsyncUniversityListView(View):
+    """Async UniversityListView for ASGI deployments (see CATALOG_ASYNC_VIEWS)"""
+    template_name = UniversityListView.template_name
+    paginate_by = UniversityListView.paginate_by
+
+    async def aget_by_name(self, model, name):
+        if not name:
+            return None
+        try:
+            return await model.objects.aget(name__iexact=name)
+        except model.DoesNotExist:
+            return None
+
+    async def get(self, request, *args, **kwargs):
+        from core.models import Country, Emirate
+
+        params = request.GET
+        country = await self.aget_by_name(Country, params.get('country', ''))
+        emirate = await self.aget_by_name(Emirate, params.get('emirate', ''))
+        queryset = filter_universities(university_list_queryset(), params, country, emirate)
+
+        context = await apaginate(request, queryset, self.paginate_by)
+        context['universities'] = context['object_list']
+        context.update(await sync_to_async(get_filter_choices)())
+        context['selected_country'] = params.get('country', '')
+        if country is not None:
+            context['filtered_emirates'] = [e async for e in Emirate.objects.filter(country_id=country.id)]
+        else:
+            context['filtered_emirates'] = []
+        context['alphabet'] = string.ascii_uppercase
+        context['current_letter'] = params.get('letter', '')
+        context['view'] = self
+        return TemplateResponse(request, self.template_name, context)
+
 class UniversityDetailView(LoginRequiredMixin, DetailView):
     """University detail page"""
     model = University
@@ -114,10 +189,7 @@ class UniversityDetailView(LoginRequiredMixin, DetailView):
         return self.render_to_response(context)
     
     def get_queryset(self):
-        return University.objects.select_related('location_emirate', 'contact_info').prefetch_related(
-            'programs', 'programs__type', 'scholarships', 'accepted_curricula__curriculum',
-            'enrollment_stats', 'visa_sponsorships'
-        )
+        return university_detail_queryset()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -158,3 +230,53 @@ class UniversityDetailView(LoginRequiredMixin, DetailView):
         
         return context
 
+
+class AsyncUniversityDetailView(AsyncLoginRequiredMixin, View):
+    """Async UniversityDetailView for ASGI deployments (see CATALOG_ASYNC_VIEWS)"""
+    template_name = UniversityDetailView.template_name
+
+    async def get(self, request, slug, *args, **kwargs):
+        from programs.models import ProgramLevel
+
+        try:
+            university = await university_detail_queryset().aget(slug=slug)
+        except University.DoesNotExist:
+            raise Http404('No university found matching the query')
+
+        # Count the visit unless this is a tab switch or reload on the same page
+        referer = request.META.get('HTTP_REFERER', '')
+        if not referer or request.path not in referer:
+            visit, created = await StudentUniversityVisit.objects.aget_or_create(
+                student=request.user,
+                university=university
+            )
+            if not created:
+                visit.visit_count += 1
+                await visit.asave()
+
+        context = {
+            'object': university,
+            'university': university,
+            'view': self,
+            'active_tab': request.GET.get('tab', 'overview'),
+        }
+        # enrollment_stats is prefetched, so these don't query; first() orders by pk
+        enrollment_stats = list(university.enrollment_stats.all())
+        context['latest_stats'] = min(enrollment_stats, key=lambda stat: stat.pk, default=None)
+        context['enrollment_history'] = enrollment_stats[:4]
+
+        if context['active_tab'] == 'programs':
+            available_levels = ProgramLevel.objects.filter(
+                program_types__programs__university=university,
+                program_types__programs__is_active=True
+            ).distinct().order_by('name')
+            context['available_levels'] = [level async for level in available_levels]
+
+            selected_level = request.GET.get('level', '')
+            context['selected_level'] = selected_level
+            programs = university.programs.filter(is_active=True).select_related('type', 'type__level')
+            if selected_level:
+                programs = programs.filter(type__level__name__iexact=selected_level)
+            context['filtered_programs'] = [program async for program in programs]
+
+        return TemplateResponse(request, self.template_name, context)